@@ -0,0 +1,150 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RateLimiter:
+    """
+    초당 요청 수와 분당 문자 수를 함께 제한하는 토큰 버킷
+
+    토큰은 스레드 잠금 안에서 미리 예약하고 대기는 잠금 밖에서 하므로
+    asyncio.run이 호출마다 새 이벤트 루프를 만들어도 같은 제한기를 계속 쓸 수 있습니다.
+    """
+
+    def __init__(self, requests_per_second=None, chars_per_minute=None):
+        self.requests_per_second = requests_per_second
+        self.chars_per_minute = chars_per_minute
+        self._request_tokens = float(requests_per_second or 0)
+        self._char_tokens = float(chars_per_minute or 0)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    async def acquire(self, chars):
+        """요청 하나(문자 chars개)를 보낼 수 있을 때까지 대기"""
+        wait = self.reserve(chars)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def reserve(self, chars):
+        """
+        요청 하나(문자 chars개)의 토큰을 예약하고 보내기 전에 기다려야 할 시간(초) 반환
+
+        토큰이 모자라면 음수로 빌려 쓰므로 뒤에 예약한 요청일수록 더 오래 기다립니다.
+        """
+        with self._lock:
+            self._refill()
+            wait = 0.0
+            if self.requests_per_second:
+                self._request_tokens -= 1
+                if self._request_tokens < 0:
+                    wait = -self._request_tokens / self.requests_per_second
+            if self.chars_per_minute:
+                # 한 요청이 버킷 크기보다 크면 버킷이 가득 찼을 때 보냄
+                self._char_tokens -= min(chars, self.chars_per_minute)
+                if self._char_tokens < 0:
+                    wait = max(wait, -self._char_tokens * 60.0 / self.chars_per_minute)
+            return wait
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        if self.requests_per_second:
+            self._request_tokens = min(float(self.requests_per_second),
+                                       self._request_tokens + elapsed * self.requests_per_second)
+        if self.chars_per_minute:
+            self._char_tokens = min(float(self.chars_per_minute),
+                                    self._char_tokens + elapsed * self.chars_per_minute / 60.0)
+
+
+class AsyncTranslationEngine:
+    """
+    asyncio 기반 동시 번역 엔진
+
+    캡처(들)의 문단을 작은 배치로 나눠 동시에 요청하되 동시 요청 수와 속도를 제한하고,
+    배치가 도착하는 즉시 문단별 번역을 콜백으로 흘려보냅니다.
+    전체 지연은 왕복 시간의 합이 아니라 가장 느린 요청 하나에 가까워집니다.
+    """
+
+    def __init__(self, translate_worker, max_in_flight=4, batch_segments=16,
+                 requests_per_second=10.0, chars_per_minute=None):
+        self.translate_worker = translate_worker
+        self.max_in_flight = max_in_flight
+        self.batch_segments = batch_segments  # 점진적 표시를 위해 배치당 문단 수 제한
+        self.rate_limiter = RateLimiter(requests_per_second, chars_per_minute)
+        self.executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix='translate')
+
+    def translate(self, ocr_models, target_language, source_language=None, on_result=None):
+        """동기 호출용: 한 캡처를 번역하고 ocr_models 순서의 결과 목록 반환"""
+        return self.translate_captures([(ocr_models, target_language, source_language)], on_result)[0]
+
+    def translate_captures(self, captures, on_result=None):
+        """
+        여러 캡처를 동시에 번역 (동기 호출용)
+
+        Args:
+            captures (list): (OCRText 목록, 목표 언어, 원본 언어) 튜플 목록
+            on_result (callable): (캡처 인덱스, 문단 인덱스, 결과) - 문단 번역이 도착할 때마다 호출
+
+        Returns:
+            list: 캡처별 결과 목록
+        """
+        return asyncio.run(self.translate_captures_async(captures, on_result))
+
+    async def translate_captures_async(self, captures, on_result=None):
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        all_results = [[None] * len(ocr_models) for ocr_models, _, _ in captures]
+
+        async def consume(capture_index, ocr_models, target_language, source_language):
+            async for index, result in self.translate_stream(ocr_models, target_language, source_language, semaphore):
+                all_results[capture_index][index] = result
+                if on_result is not None:
+                    on_result(capture_index, index, result)
+
+        await asyncio.gather(*[
+            consume(i, ocr_models, target_language, source_language)
+            for i, (ocr_models, target_language, source_language) in enumerate(captures)
+        ])
+        return all_results
+
+    async def translate_stream(self, ocr_models, target_language, source_language=None, semaphore=None):
+        """
+        문단 번역을 도착 순서대로 내보내는 비동기 제너레이터
+
+        Yields:
+            tuple: (문단 인덱스, 결과 딕셔너리) - 성공 시 OCRText.translated_text도 채워짐
+        """
+        worker = self.translate_worker
+        semaphore = semaphore or asyncio.Semaphore(self.max_in_flight)
+        texts = [ocr_model.text for ocr_model in ocr_models]
+
+        # 캐시 적중은 요청 없이 바로 내보냄
+        results, pending = worker.lookup_cached(texts, target_language, source_language)
+        for index, result in enumerate(results):
+            if result is not None:
+                ocr_models[index].translated_text = result['translated_text']
+                yield index, result
+
+        async def run_batch(batch):
+            async with semaphore:
+                await self.rate_limiter.acquire(sum(len(text) for text in batch))
+                loop = asyncio.get_running_loop()
+                translated = await loop.run_in_executor(
+                    self.executor, worker.translate_segments, batch, target_language, source_language
+                )
+                return batch, translated
+
+        batches = worker.make_batches(list(pending), max_segments=self.batch_segments)
+        for next_done in asyncio.as_completed([run_batch(batch) for batch in batches]):
+            batch, translated = await next_done
+            worker.store_translations(translated, target_language, source_language)
+            for text, result in zip(batch, translated):
+                for index in pending[text]:
+                    result_for_index = dict(result, original_text=texts[index])
+                    if result_for_index['success']:
+                        ocr_models[index].translated_text = result_for_index['translated_text']
+                    yield index, result_for_index
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
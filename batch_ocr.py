@@ -0,0 +1,236 @@
+"""
+화면 없이 스크린샷 폴더를 일괄 OCR/번역하는 명령줄 도구
+
+디렉터리(하위 폴더 포함), glob 패턴, 파일 경로를 입력으로 받아 OCR 엔진과 TranslateWorker에
+스레드/프로세스 풀로 통과시키고 이미지마다 한 줄씩 JSONL 결과(상자, 원문, 번역, 단계별 시간)를 씁니다.
+출력 파일은 체크포인트를 겸하므로 중단 후 다시 실행하면 성공한 이미지는 건너뜁니다.
+
+사용법 (저장소 루트에서):
+    python batch_ocr.py screenshots/ --languages ja en --target ko --output results.jsonl --workers 4
+    python batch_ocr.py "archive/**/*.png" --pool process --workers 8 --batch-size 16 --output results.jsonl
+"""
+import argparse
+import contextlib
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+# 전처리 인코딩에 QImage를 사용하므로 화면 없이 동작하도록 offscreen 플랫폼 사용
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from dotenv import load_dotenv
+
+from http_client import HttpClient
+from image_preprocess import PREPROCESS_STEPS, ImagePreprocessor
+from ocr_backends import OCRBatchError, create_backend
+from ocr_worker import OCRWorker
+from translate_worker import TranslateWorker, choose_source_language
+from translation_cache import TranslationCache
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp', '.gif', '.tif', '.tiff')
+
+# 작업 스레드/프로세스가 공유하는 워커 (프로세스 풀은 프로세스마다 _init_workers로 생성)
+_ocr_worker = None
+_translate_worker = None
+_settings = None
+
+
+def find_images(inputs):
+    """디렉터리/glob/파일 경로 목록을 정렬된 이미지 경로 목록으로 확장 (중복 제거)"""
+    paths = set()
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            for root, _, files in os.walk(pattern):
+                paths.update(os.path.join(root, name) for name in files
+                             if name.lower().endswith(IMAGE_EXTENSIONS))
+        elif os.path.isfile(pattern):
+            paths.add(pattern)
+        else:
+            paths.update(path for path in glob.glob(pattern, recursive=True)
+                         if path.lower().endswith(IMAGE_EXTENSIONS))
+    return sorted(os.path.normpath(path) for path in paths)
+
+
+def load_checkpoint(path):
+    """기존 JSONL 출력에서 성공한 이미지 경로 집합 읽기 (중간에 끊긴 마지막 줄은 무시)"""
+    done = set()
+    if not path or not os.path.exists(path):
+        return done
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('success'):
+                done.add(record['path'])
+    return done
+
+
+def _init_workers(settings, quiet=False):
+    """OCR/번역 워커 생성 (스레드 풀은 한 번, 프로세스 풀은 프로세스마다 호출)"""
+    global _ocr_worker, _translate_worker, _settings
+    if quiet:
+        # 앱 코드의 print 출력이 JSONL 출력(stdout)에 섞이지 않도록 stderr로 보냄
+        sys.stdout = sys.stderr
+    load_dotenv('key.env')
+    preprocessor = False    # --preprocess가 없으면 OCR_PREPROCESS 환경 변수와 상관없이 끔
+    if settings['preprocess']:
+        preprocessor = ImagePreprocessor(settings['preprocess'], target_text_height=settings['target_text_height'])
+    _ocr_worker = OCRWorker(settings['languages'], backend=create_backend(settings['backend']),
+                            preprocessor=preprocessor)
+    _translate_worker = None
+    if settings['target']:
+        _translate_worker = TranslateWorker(os.getenv("CLOUD_LOCAL_KEY"), TranslationCache(),
+                                            HttpClient(pool_size=settings['workers']))
+    _settings = settings
+
+
+def _read_frame(path):
+    import cv2
+
+    frame = cv2.imread(path, cv2.IMREAD_COLOR)
+    if frame is None:
+        raise ValueError(f"이미지를 읽을 수 없습니다: {path}")
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+
+def process_paths(paths):
+    """
+    이미지 묶음을 OCR(요청 하나로 묶음) 후 이미지별로 번역
+
+    Returns:
+        list: 이미지별 JSONL 기록 딕셔너리
+    """
+    settings = _settings
+    languages = settings['languages']
+    errors = [None] * len(paths)
+    start = time.perf_counter()
+    try:
+        if _ocr_worker.preprocessor is None:
+            contents = []
+            for path in paths:
+                with open(path, 'rb') as f:
+                    contents.append(f.read())
+            read_time = time.perf_counter() - start
+            all_results = _ocr_worker.process_images(contents, languages, raise_errors=True)
+        else:
+            frames = [_read_frame(path) for path in paths]
+            read_time = time.perf_counter() - start
+            all_results = _ocr_worker.process_frames(frames, languages, raise_errors=True)
+    except OCRBatchError as e:
+        # 일부 이미지만 실패: 실패한 이미지는 success=False로 기록해 다음 실행에서 다시 시도
+        all_results, errors = e.results, e.errors
+    except Exception as e:
+        # 묶음 전체 실패: 기록만 남기고 다음 실행에서 다시 시도
+        return [{'path': path, 'success': False, 'error': str(e)} for path in paths]
+    ocr_time = time.perf_counter() - start - read_time
+
+    records = []
+    source_language = choose_source_language(languages, settings['target']) if settings['target'] else None
+    for path, results, error in zip(paths, all_results, errors):
+        translate_start = time.perf_counter()
+        failed = 0
+        if error is None and _translate_worker is not None and len(results):
+            translations = _translate_worker.translate_batch(results, settings['target'], source_language)
+            failed = sum(1 for translation in translations if not translation['success'])
+        if error is None and failed:
+            error = f"번역 실패 {failed}개"
+        records.append({
+            'path': path,
+            'success': error is None,
+            'error': error,
+            'results': results.to_dict(),
+            'timings': {
+                'read_ms': round(read_time * 1000.0 / len(paths), 2),
+                'ocr_ms': round(ocr_time * 1000.0, 2),     # 묶음 전체 요청 시간
+                'ocr_batch_images': len(paths),
+                'translate_ms': round((time.perf_counter() - translate_start) * 1000.0, 2),
+            },
+        })
+    return records
+
+
+def run(args):
+    paths = find_images(args.inputs)
+    done = set() if args.restart else load_checkpoint(args.output)
+    pending = [path for path in paths if path not in done]
+    print(f"이미지 {len(paths)}개 중 {len(paths) - len(pending)}개는 이미 처리됨, {len(pending)}개 처리 시작",
+          file=sys.stderr)
+    if not pending:
+        return 0
+
+    settings = {
+        'languages': args.languages,
+        'target': args.target,
+        'backend': args.backend,
+        'preprocess': args.preprocess.split(',') if args.preprocess else None,
+        'target_text_height': args.target_text_height,
+        'workers': args.workers,
+    }
+    to_stdout = args.output is None
+    chunks = [pending[i:i + args.batch_size] for i in range(0, len(pending), args.batch_size)]
+    if args.pool == 'process':
+        # Qt/gRPC와 fork 충돌을 피하기 위해 spawn으로 작업 프로세스 생성
+        executor = ProcessPoolExecutor(max_workers=args.workers, mp_context=multiprocessing.get_context('spawn'),
+                                       initializer=_init_workers, initargs=(settings, to_stdout))
+    else:
+        _init_workers(settings)
+        executor = ThreadPoolExecutor(max_workers=args.workers)
+
+    output = (open(args.output, 'w' if args.restart else 'a', encoding='utf-8')
+              if not to_stdout else contextlib.nullcontext(sys.stdout))
+    # stdout에 JSONL을 쓸 때는 앱 코드의 print 출력을 stderr로 보냄
+    log = contextlib.redirect_stdout(sys.stderr) if to_stdout else contextlib.nullcontext()
+    processed = failed = 0
+    started = time.perf_counter()
+    with output as out, log, executor:
+        try:
+            futures = [executor.submit(process_paths, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                for record in future.result():
+                    # 한 줄씩 바로 기록하므로 중단되어도 이미 쓴 결과는 체크포인트로 남음
+                    out.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    processed += 1
+                    failed += not record['success']
+                out.flush()
+                print(f"[{processed}/{len(pending)}] 실패 {failed}", file=sys.stderr)
+        except KeyboardInterrupt:
+            executor.shutdown(wait=False, cancel_futures=True)
+            print("중단됨: 다시 실행하면 남은 이미지부터 이어서 처리합니다.", file=sys.stderr)
+            return 130
+    elapsed = time.perf_counter() - started
+    print(f"완료: {processed}개 ({failed}개 실패), {elapsed:.1f}초, "
+          f"{processed / elapsed if elapsed else 0.0:.2f} 이미지/초", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="스크린샷 폴더 일괄 OCR/번역 (JSONL 출력, 이어서 처리 지원)")
+    parser.add_argument('inputs', nargs='+', help='이미지 디렉터리, glob 패턴 또는 파일')
+    parser.add_argument('--output', '-o', help='JSONL 출력 파일 (체크포인트 겸용, 생략하면 stdout)')
+    parser.add_argument('--restart', action='store_true', help='체크포인트를 무시하고 출력 파일을 새로 씀')
+    parser.add_argument('--languages', nargs='+', default=['en'], help='OCR 언어 힌트')
+    parser.add_argument('--target', help='번역 목표 언어 (생략하면 OCR만 수행)')
+    parser.add_argument('--backend', default=None, help='OCR 엔진 (vision, easyocr; 기본값: OCR_BACKEND)')
+    parser.add_argument('--pool', choices=('thread', 'process'), default='thread', help='작업 풀 종류')
+    parser.add_argument('--workers', type=int, default=4, help='동시에 처리할 묶음 수')
+    parser.add_argument('--batch-size', type=int, default=8, help='OCR 요청 하나에 묶을 이미지 수')
+    parser.add_argument('--preprocess', help=f"OCR 전처리 단계 (쉼표 구분: {','.join(PREPROCESS_STEPS)})")
+    parser.add_argument('--target-text-height', type=int, default=32, help='전처리 축소 목표 텍스트 줄 높이 (px)')
+    args = parser.parse_args(argv)
+    args.workers = max(1, args.workers)
+    args.batch_size = max(1, args.batch_size)
+    return args
+
+
+def main(argv=None):
+    return run(parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
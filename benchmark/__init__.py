@@ -0,0 +1 @@
+"""로컬 모의 서버와 합성 화면을 사용하는 성능 벤치마크"""
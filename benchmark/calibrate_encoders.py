@@ -0,0 +1,193 @@
+"""
+업로드 인코더 보정
+
+합성 화면 코퍼스에서 후보 인코더별 크기, 인코딩 시간, OCR 정확도를 측정해 JSON으로 저장합니다.
+AdaptiveEncoder(CAPTURE_ENCODER=adaptive)는 --ocr로 보정한 encoder_calibration.json만 사용하므로
+adaptive를 쓰려면 먼저 --ocr 보정을 실행해야 합니다 (없으면 png:1 사용).
+
+정확도는 무손실 원본 대비 유지율(0~1)입니다.
+- --ocr 엔진을 지정하면: 인코딩 이미지의 단어 재현율 / 원본 이미지의 단어 재현율
+  (원본 인식이 실패했거나 단어를 하나도 찾지 못한 화면은 비교 기준이 없어 제외하고,
+  인코딩 이미지 인식이 실패하면 보정을 중단)
+- 지정하지 않으면: 텍스트 영역 안에서 원본과 복원 이미지의 글자 마스크(적응형 이진화) IoU
+  (API 키나 OCR 모델 없이 빠르게 측정하는 근사치, 후보 비교용이며 AdaptiveEncoder는 사용하지 않음,
+  기본 저장 위치 encoder_calibration_iou.json)
+
+사용법 (저장소 루트에서):
+    python -m benchmark.calibrate_encoders --captures 40
+    python -m benchmark.calibrate_encoders --ocr vision --captures 20
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+import cv2
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QImage
+from PySide6.QtWidgets import QApplication
+
+from benchmark.corpus import SCENES, generate_corpus
+from frame_buffer import array_to_qimage, qimage_to_array, to_rgb_qimage
+from image_encoders import DEFAULT_CALIBRATION_FILE, create_encoder
+
+# 글자 마스크 IoU 결과는 AdaptiveEncoder가 읽는 파일과 따로 저장
+IOU_CALIBRATION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "encoder_calibration_iou.json")
+from image_preprocess import detect_text_regions
+
+DEFAULT_CANDIDATES = (
+    'png:1', 'png:6', 'webp:lossless', 'webp:95', 'webp:85', 'webp:75', 'webp:60',
+    'jpeg:95', 'jpeg:85', 'jpeg:75', 'jpeg:60', 'jpeg:40',
+)
+
+
+def decode(data):
+    """인코딩된 bytes를 (H, W, 3) RGB 배열로 복원"""
+    return qimage_to_array(to_rgb_qimage(QImage.fromData(data))).copy()
+
+
+def text_mask(array):
+    gray = cv2.cvtColor(array, cv2.COLOR_RGB2GRAY)
+    return cv2.adaptiveThreshold(gray, 1, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY_INV, 31, 15)
+
+
+def region_mask(array):
+    """텍스트 후보 영역 마스크 (배경 잡음이 점수에 영향을 주지 않도록 이 영역만 비교)"""
+    mask = np.zeros(array.shape[:2], dtype=bool)
+    for x1, y1, x2, y2 in detect_text_regions(cv2.cvtColor(array, cv2.COLOR_RGB2GRAY)).tolist():
+        mask[y1:y2, x1:x2] = True
+    return mask
+
+
+def mask_iou(reference, decoded, regions):
+    a = reference.astype(bool) & regions
+    b = decoded.astype(bool) & regions
+    union = np.count_nonzero(a | b)
+    return np.count_nonzero(a & b) / union if union else 1.0
+
+
+def word_recall(lines, ocr_results):
+    """그려 넣은 단어 중 OCR 결과에 나온 비율 (대소문자 무시, 중복 고려)"""
+    expected = Counter(word.lower() for line in lines for word in line.split())
+    found = Counter(word.lower() for obj in ocr_results for word in re.findall(r"\w+", obj.text))
+    total = sum(expected.values())
+    return sum((expected & found).values()) / total if total else 1.0
+
+
+def calibrate(args):
+    app = QApplication.instance() or QApplication(sys.argv)
+    scenes = SCENES if args.scene == 'all' else (args.scene,)
+    corpus = generate_corpus(scenes, args.captures, args.width, args.height, args.seed)
+    encoders = [create_encoder(spec) for spec in args.candidates]
+
+    ocr_worker = None
+    baseline = []
+    if args.ocr:
+        from ocr_backends import create_backend
+        from ocr_worker import OCRWorker
+        ocr_worker = OCRWorker(args.languages, backend=create_backend(args.ocr))
+        # 기준: 무손실 PNG로 보낸 원본의 단어 재현율
+        lossless = create_encoder('png:1')
+        kept = []
+        for image in corpus:
+            try:
+                recall = word_recall(image.lines, ocr_worker.process_image(
+                    lossless.encode(array_to_qimage(image.array)), args.languages, raise_errors=True))
+            except Exception as e:
+                print(f"{image.name} 원본 인식 실패로 제외: {e}")
+                continue
+            if not recall:
+                print(f"{image.name} 원본에서 단어를 찾지 못해 제외")
+                continue
+            kept.append(image)
+            baseline.append(recall)
+        if not kept:
+            ocr_worker.close()
+            raise RuntimeError(f"{args.ocr} 엔진이 원본 화면을 하나도 인식하지 못했습니다.")
+        corpus = kept
+        metric = f"word_recall:{args.ocr}"
+    else:
+        references = [(text_mask(image.array), region_mask(image.array)) for image in corpus]
+        metric = "text_mask_iou"
+
+    results = {}
+    for encoder in encoders:
+        sizes, times, scores = [], [], []
+        for i, image in enumerate(corpus):
+            qimage = array_to_qimage(image.array)
+            start = time.perf_counter()
+            data = encoder.encode(qimage)
+            times.append(time.perf_counter() - start)
+            sizes.append(len(data))
+            if ocr_worker is not None:
+                recall = word_recall(image.lines, ocr_worker.process_image(data, args.languages, raise_errors=True))
+                scores.append(min(1.0, recall / baseline[i]))
+            else:
+                reference, regions = references[i]
+                scores.append(mask_iou(reference, text_mask(decode(data)), regions))
+        results[encoder.spec] = {
+            'accuracy': round(float(np.mean(scores)), 4),
+            'min_accuracy': round(float(np.min(scores)), 4),
+            'mean_bytes': int(np.mean(sizes)),
+            'encode_ms_p50': round(float(np.percentile(times, 50)) * 1000.0, 2),
+        }
+
+    if ocr_worker is not None:
+        ocr_worker.close()
+    return {
+        'metric': metric,
+        'corpus': {'scene': args.scene, 'captures': len(corpus), 'size': [args.width, args.height], 'seed': args.seed},
+        'results': results,
+    }
+
+
+def print_report(report, target_accuracy):
+    print(f"지표: {report['metric']}  코퍼스: {report['corpus']['captures']}장 "
+          f"({report['corpus']['size'][0]}x{report['corpus']['size'][1]}, {report['corpus']['scene']})")
+    print(f"{'인코더':<16}{'정확도':>10}{'최저':>10}{'평균 KB':>10}{'인코딩 ms':>12}")
+    ranked = sorted(report['results'].items(), key=lambda item: item[1]['mean_bytes'])
+    for spec, stats in ranked:
+        mark = '' if stats['accuracy'] >= target_accuracy else '  (목표 미달)'
+        print(f"{spec:<16}{stats['accuracy']:>10.4f}{stats['min_accuracy']:>10.4f}"
+              f"{stats['mean_bytes'] / 1024:>10.1f}{stats['encode_ms_p50']:>12.1f}{mark}")
+    eligible = [spec for spec, stats in ranked if stats['accuracy'] >= target_accuracy]
+    print(f"정확도 {target_accuracy} 이상에서 가장 작은 인코더: {eligible[0] if eligible else '없음'}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="코퍼스 기반 업로드 인코더 보정")
+    parser.add_argument('--captures', type=int, default=40, help='측정할 합성 화면 수')
+    parser.add_argument('--scene', choices=SCENES + ('all',), default='all', help='합성 화면 유형')
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--candidates', nargs='+', default=list(DEFAULT_CANDIDATES), help='후보 인코더 설정')
+    parser.add_argument('--ocr', help='정확도 측정에 쓸 OCR 엔진 (vision, easyocr). 생략하면 글자 마스크 IoU')
+    parser.add_argument('--languages', nargs='+', default=['en'], help='OCR 언어 힌트')
+    parser.add_argument('--target-accuracy', type=float, default=0.98, help='보고서에 표시할 목표 정확도')
+    parser.add_argument('--output', help='보정 결과 JSON 경로 (기본: --ocr이면 AdaptiveEncoder 보정 파일, '
+                                         '아니면 encoder_calibration_iou.json)')
+    args = parser.parse_args(argv)
+    if not args.output:
+        args.output = DEFAULT_CALIBRATION_FILE if args.ocr else IOU_CALIBRATION_FILE
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = calibrate(args)
+    print_report(report, args.target_accuracy)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+벤치마크용 합성 화면 이미지
+
+메뉴, 대화상자, 표, 자막처럼 번역기가 실제로 캡처하는 화면 유형을
+시드 기반으로 재현 가능하게 생성합니다. 각 이미지에는 그려 넣은 텍스트 줄이 함께 기록됩니다.
+"""
+import random
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+WORDS = (
+    "start options quit load save settings audio video language network account profile "
+    "continue cancel apply confirm back next level score health inventory quest map help "
+    "file edit view window tools search replace open close print export import total price"
+).split()
+
+SCENES = ('menu', 'dialog', 'spreadsheet', 'subtitles')
+
+
+class CorpusImage:
+    """합성 화면 한 장 (RGB 배열 + 그려 넣은 텍스트 줄)"""
+
+    def __init__(self, name, array, lines):
+        self.name = name
+        self.array = array    # (H, W, 3) uint8
+        self.lines = lines    # 그려 넣은 텍스트 목록
+
+    def __repr__(self):
+        return f"CorpusImage(name={self.name!r}, size={self.array.shape[1]}x{self.array.shape[0]}, lines={len(self.lines)})"
+
+
+def _font(size):
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:  # Pillow 10.1 미만은 크기 지정 불가
+        return ImageFont.load_default()
+
+
+def _phrase(rng, min_words=1, max_words=4):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))).capitalize()
+
+
+def _draw_menu(draw, rng, width, height):
+    lines = []
+    font = _font(max(14, height // 20))
+    x = width // 10
+    for i in range(rng.randint(4, 8)):
+        text = _phrase(rng, 1, 2)
+        y = height // 8 + i * (height // 10)
+        draw.rectangle([x - 10, y - 6, x + width // 3, y + height // 16], fill=(40, 40, 60))
+        draw.text((x, y), text, fill=(230, 230, 230), font=font)
+        lines.append(text)
+    return lines
+
+
+def _draw_dialog(draw, rng, width, height):
+    lines = []
+    font = _font(max(12, height // 28))
+    box = [width // 6, height // 4, width * 5 // 6, height * 3 // 4]
+    draw.rectangle(box, fill=(245, 245, 245), outline=(90, 90, 90), width=2)
+    title = _phrase(rng, 2, 3)
+    draw.text((box[0] + 16, box[1] + 12), title, fill=(0, 0, 0), font=font)
+    lines.append(title)
+    for i in range(rng.randint(2, 4)):
+        text = _phrase(rng, 4, 8)
+        draw.text((box[0] + 16, box[1] + 50 + i * (font.size + 10)), text, fill=(30, 30, 30), font=font)
+        lines.append(text)
+    for i, label in enumerate(('OK', 'Cancel')):
+        bx = box[2] - (i + 1) * 110
+        draw.rectangle([bx, box[3] - 50, bx + 90, box[3] - 18], fill=(220, 220, 230), outline=(120, 120, 120))
+        draw.text((bx + 20, box[3] - 44), label, fill=(0, 0, 0), font=font)
+        lines.append(label)
+    return lines
+
+
+def _draw_spreadsheet(draw, rng, width, height):
+    lines = []
+    font = _font(max(10, height // 40))
+    rows, cols = rng.randint(10, 18), rng.randint(4, 7)
+    cell_w, cell_h = width // cols, height // rows
+    for r in range(rows):
+        for c in range(cols):
+            x, y = c * cell_w, r * cell_h
+            draw.rectangle([x, y, x + cell_w, y + cell_h], outline=(200, 200, 200))
+            text = _phrase(rng, 1, 1) if r == 0 or c == 0 else f"{rng.uniform(0, 9999):.2f}"
+            draw.text((x + 4, y + 4), text, fill=(0, 0, 0), font=font)
+            lines.append(text)
+    return lines
+
+
+def _draw_subtitles(draw, rng, width, height):
+    lines = []
+    font = _font(max(16, height // 18))
+    # 영상 프레임을 흉내 낸 배경 노이즈는 generate_scene에서 추가
+    for i in range(rng.randint(1, 2)):
+        text = _phrase(rng, 4, 7)
+        y = height - (i + 1) * (font.size + 16) - 20
+        text_width = draw.textlength(text, font=font)
+        x = (width - text_width) / 2
+        draw.rectangle([x - 8, y - 4, x + text_width + 8, y + font.size + 8], fill=(0, 0, 0))
+        draw.text((x, y), text, fill=(255, 255, 255), font=font)
+        lines.append(text)
+    return lines
+
+
+# 유형별 배경색 (자막은 노이즈 배경)
+BACKGROUNDS = {
+    'menu': (20, 20, 30),
+    'dialog': (70, 90, 120),
+    'spreadsheet': (255, 255, 255),
+}
+
+DRAWERS = {
+    'menu': _draw_menu,
+    'dialog': _draw_dialog,
+    'spreadsheet': _draw_spreadsheet,
+    'subtitles': _draw_subtitles,
+}
+
+
+def generate_scene(scene, width=1280, height=720, seed=0):
+    """지정한 유형의 합성 화면 한 장 생성"""
+    if scene not in DRAWERS:
+        raise ValueError(f"알 수 없는 화면 유형: {scene} (사용 가능: {', '.join(SCENES)})")
+    rng = random.Random(f"{scene}:{seed}")
+
+    if scene == 'subtitles':
+        # 부드러운 그라데이션 + 노이즈로 영상 프레임 흉내
+        noise = np.random.default_rng(seed).integers(0, 40, (height, width, 3), dtype=np.uint8)
+        gradient = np.linspace(40, 160, width, dtype=np.uint8)[None, :, None]
+        base = Image.fromarray((noise + gradient).astype(np.uint8), 'RGB')
+    else:
+        base = Image.new('RGB', (width, height), BACKGROUNDS[scene])
+
+    lines = DRAWERS[scene](ImageDraw.Draw(base), rng, width, height)
+    return CorpusImage(f"{scene}-{seed}", np.asarray(base), lines)
+
+
+def generate_corpus(scenes=SCENES, count=20, width=1280, height=720, seed=0):
+    """여러 유형을 번갈아 가며 count장의 합성 화면 생성"""
+    return [
+        generate_scene(scenes[i % len(scenes)], width, height, seed + i)
+        for i in range(count)
+    ]
@@ -0,0 +1,245 @@
+"""
+Google Vision / Translation API를 대신하는 로컬 모의 서버
+
+실제 엔드포인트나 API 키 없이 OCRWorker와 TranslateWorker의 성능을 측정하기 위해
+지연, 지터, 오류율을 설정할 수 있는 gRPC ImageAnnotator와 HTTP 번역 v2 서버를 제공합니다.
+"""
+import io
+import json
+import random
+import threading
+import time
+from concurrent import futures
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import grpc
+from google.cloud import vision
+from PIL import Image
+
+VISION_SERVICE = 'google.cloud.vision.v1.ImageAnnotator'
+TRANSLATE_PATH = '/language/translate/v2'
+
+
+class LatencyProfile:
+    """모의 서버 응답 지연/오류 설정"""
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """설정된 지연(+지터)만큼 대기"""
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        delay = max(0.0, self.latency_ms + jitter) / 1000.0
+        if delay:
+            time.sleep(delay)
+
+    def should_fail(self):
+        with self._lock:
+            return self.error_rate > 0 and self._random.random() < self.error_rate
+
+
+def build_text_annotation(width, height, paragraph_count=8, words_per_paragraph=4):
+    """이미지 크기에 맞춰 격자 형태의 문단을 배치한 모의 full_text_annotation 생성"""
+    TextAnnotation = vision.TextAnnotation
+    space = TextAnnotation.TextProperty(
+        detected_break=TextAnnotation.DetectedBreak(type_=TextAnnotation.DetectedBreak.BreakType.SPACE))
+    line_break = TextAnnotation.TextProperty(
+        detected_break=TextAnnotation.DetectedBreak(type_=TextAnnotation.DetectedBreak.BreakType.LINE_BREAK))
+
+    def poly(x1, y1, x2, y2):
+        return vision.BoundingPoly(vertices=[
+            vision.Vertex(x=x1, y=y1), vision.Vertex(x=x2, y=y1),
+            vision.Vertex(x=x2, y=y2), vision.Vertex(x=x1, y=y2)
+        ])
+
+    row_height = max(1, height // max(1, paragraph_count))
+    paragraphs = []
+    for p in range(paragraph_count):
+        y1 = p * row_height + row_height // 4
+        y2 = min(height, y1 + row_height // 2)
+        word_width = max(1, width // (words_per_paragraph + 1))
+        words = []
+        for w in range(words_per_paragraph):
+            text = f"mock{p}w{w}"
+            x1 = w * word_width + word_width // 4
+            x2 = x1 + word_width // 2
+            symbols = [vision.Symbol(text=ch, confidence=0.97) for ch in text]
+            symbols[-1].property = line_break if w == words_per_paragraph - 1 else space
+            words.append(vision.Word(symbols=symbols, bounding_box=poly(x1, y1, x2, y2), confidence=0.97))
+        paragraphs.append(vision.Paragraph(
+            words=words,
+            bounding_box=poly(words[0].bounding_box.vertices[0].x, y1, words[-1].bounding_box.vertices[1].x, y2),
+            confidence=0.97
+        ))
+
+    block = vision.Block(paragraphs=paragraphs, bounding_box=poly(0, 0, width, height), confidence=0.97)
+    page = vision.Page(width=width, height=height, blocks=[block], confidence=0.97)
+    full_text = "\n".join(" ".join("".join(s.text for s in w.symbols) for w in p.words) for p in paragraphs)
+    return TextAnnotation(pages=[page], text=full_text)
+
+
+class MockVisionServer:
+    """gRPC ImageAnnotator 모의 서버 (BatchAnnotateImages만 구현)"""
+
+    def __init__(self, profile=None, paragraph_count=8, words_per_paragraph=4, max_workers=8):
+        self.profile = profile or LatencyProfile()
+        self.paragraph_count = paragraph_count
+        self.words_per_paragraph = words_per_paragraph
+        self.request_count = 0
+        self.image_count = 0
+        self.received_bytes = 0
+        self._lock = threading.Lock()
+
+        self._server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+        handler = grpc.method_handlers_generic_handler(VISION_SERVICE, {
+            'BatchAnnotateImages': grpc.unary_unary_rpc_method_handler(
+                self._batch_annotate_images,
+                request_deserializer=vision.BatchAnnotateImagesRequest.deserialize,
+                response_serializer=vision.BatchAnnotateImagesResponse.serialize
+            )
+        })
+        self._server.add_generic_rpc_handlers((handler,))
+        self.port = self._server.add_insecure_port('127.0.0.1:0')
+
+    @property
+    def address(self):
+        return f'127.0.0.1:{self.port}'
+
+    def start(self):
+        self._server.start()
+        return self
+
+    def stop(self):
+        self._server.stop(grace=None)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def create_client(self):
+        """이 서버에 연결된 ImageAnnotatorClient 생성 (VisionClientPool의 client_factory로 사용)"""
+        from google.cloud.vision_v1.services.image_annotator.transports.grpc import ImageAnnotatorGrpcTransport
+
+        channel = grpc.insecure_channel(self.address)
+        return vision.ImageAnnotatorClient(transport=ImageAnnotatorGrpcTransport(channel=channel))
+
+    def _batch_annotate_images(self, request, context):
+        with self._lock:
+            self.request_count += 1
+            self.image_count += len(request.requests)
+            self.received_bytes += sum(len(r.image.content) for r in request.requests)
+
+        self.profile.wait()
+        if self.profile.should_fail():
+            context.abort(grpc.StatusCode.UNAVAILABLE, 'mock vision unavailable')
+
+        responses = []
+        for image_request in request.requests:
+            width, height = Image.open(io.BytesIO(image_request.image.content)).size
+            annotation = build_text_annotation(width, height, self.paragraph_count, self.words_per_paragraph)
+            responses.append(vision.AnnotateImageResponse(full_text_annotation=annotation))
+        return vision.BatchAnnotateImagesResponse(responses=responses)
+
+
+class MockTranslateServer:
+    """번역 API v2 모의 HTTP 서버 (q 여러 개, 세그먼트 제한, 언어 목록 지원)"""
+
+    MAX_SEGMENTS = 128
+
+    def __init__(self, profile=None, handshake_ms=0.0):
+        self.profile = profile or LatencyProfile()
+        self.handshake_ms = handshake_ms    # 새 연결마다 추가되는 지연 (DNS/TCP/TLS 핸드셰이크 흉내)
+        self.request_count = 0
+        self.segment_count = 0
+        self.connection_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """TranslateWorker의 base_url로 사용할 주소"""
+        return f'http://127.0.0.1:{self._server.server_port}{TRANSLATE_PATH}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _translate(self, form):
+        queries = form.get('q', [])
+        target = form.get('target', ['en'])[0]
+        with self._lock:
+            self.request_count += 1
+            self.segment_count += len(queries)
+
+        self.profile.wait()
+        if self.profile.should_fail():
+            return 503, {'error': {'code': 503, 'message': 'mock translate unavailable'}}
+        if len(queries) > self.MAX_SEGMENTS:
+            return 400, {'error': {'code': 400, 'message': 'Too many text segments'}}
+        return 200, {'data': {'translations': [
+            {'translatedText': f'[{target}] {q}', 'detectedSourceLanguage': 'en'} for q in queries
+        ]}}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive 연결 유지
+
+            def setup(self):
+                with server._lock:
+                    server.connection_count += 1
+                if server.handshake_ms:
+                    time.sleep(server.handshake_ms / 1000.0)
+                super().setup()
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                form = parse_qs(self.rfile.read(length).decode('utf-8'))
+                self._send(*server._translate(form))
+
+            def do_GET(self):
+                path = urlparse(self.path).path
+                if path.endswith('/languages'):
+                    self._send(200, {'data': {'languages': [{'language': code} for code in ('en', 'ko', 'ja', 'zh-CN', 'es')]}})
+                else:
+                    self._send(404, {'error': {'code': 404, 'message': 'not found'}})
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def _send(self, status, payload):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=UTF-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,306 @@
+"""
+캡처 → 인코딩 → OCR → 번역 → 표시 전체 경로의 지연 시간 벤치마크
+
+로컬 모의 Vision/번역 서버를 띄우고 합성 화면 이미지를 실제 앱 코드(OCRWorker,
+TranslateWorker, ImageViewer)에 통과시켜 단계별 p50/p95/p99와 초당 처리 캡처 수를 보고합니다.
+
+사용법 (저장소 루트에서):
+    python -m benchmark.run_benchmark --network wan --captures 40 --concurrency 4
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+
+# 화면 없이 실행할 수 있도록 기본은 offscreen 플랫폼 사용
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from benchmark.corpus import SCENES, generate_corpus
+from benchmark.mock_servers import LatencyProfile, MockTranslateServer, MockVisionServer
+from frame_buffer import array_to_qimage
+from frame_diff import compute_fingerprint
+from http_client import HttpClient
+from image_encoders import create_encoder, encoded_size
+from image_preprocess import PREPROCESS_STEPS, ImagePreprocessor
+from ocr_layout import DEFAULT_GRANULARITY, GRANULARITIES
+from ocr_backends import VISION_FEATURES, GoogleVisionBackend, VisionClientPool
+from ocr_text import OCRResultSet
+from ocr_worker import OCRWorker
+from translate_worker import TranslateWorker
+
+STAGES = ('capture', 'encode', 'ocr', 'translate', 'render', 'total')
+
+# 네트워크 조건 프리셋: (Vision 지연, 번역 지연, 지터, 오류율) - 밀리초
+NETWORK_PROFILES = {
+    'local': (0, 0, 0, 0.0),
+    'lan': (20, 10, 5, 0.0),
+    'wan': (120, 60, 40, 0.0),
+    'flaky': (120, 60, 60, 0.05),
+}
+
+
+class StageTimer:
+    """단계별 소요 시간 기록 (스레드마다 별도 인스턴스 사용)"""
+
+    def __init__(self):
+        self.samples = {stage: [] for stage in STAGES}
+
+    @contextlib.contextmanager
+    def measure(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples[stage].append(time.perf_counter() - start)
+
+    def merge(self, other):
+        for stage, values in other.samples.items():
+            self.samples[stage].extend(values)
+
+
+def summarize(samples):
+    """단계별 p50/p95/p99/평균 (밀리초)"""
+    summary = {}
+    for stage, values in samples.items():
+        if not values:
+            continue
+        values_ms = np.array(values) * 1000.0
+        summary[stage] = {
+            'count': len(values),
+            'p50': float(np.percentile(values_ms, 50)),
+            'p95': float(np.percentile(values_ms, 95)),
+            'p99': float(np.percentile(values_ms, 99)),
+            'mean': float(values_ms.mean()),
+        }
+    return summary
+
+
+def process_batch(images, ocr_worker, translate_worker, language_list, target_language):
+    """
+    캡처 묶음의 캡처/인코딩/OCR/번역 단계를 실행 (표시는 메인 스레드에서)
+
+    OCR은 묶음 전체를 요청 하나로 보내므로 각 캡처의 인코딩/OCR 시간은 묶음 전체의 시간입니다.
+    """
+    timer = StageTimer()
+    start = time.perf_counter()
+
+    with timer.measure('capture'):
+        # grabWindow 이후 capture_screen이 하는 작업: QImage 생성 + 지문 계산
+        qimages = [array_to_qimage(image.array) for image in images]
+        for qimage in qimages:
+            compute_fingerprint(qimage)
+
+    with timer.measure('encode'):
+        if ocr_worker.preprocessor is None:
+            prepared = [None] * len(images)
+            contents = [ocr_worker.encoder.encode(qimage) for qimage in qimages]
+        else:
+            # 전처리(축소/회색조/이진화/자르기) 후 인코딩 (텍스트가 없으면 OCR 생략)
+            prepared = [ocr_worker.preprocessor.prepare(image.array) for image in images]
+            contents = [item.encode(ocr_worker.encoder) if item is not None else b'' for item in prepared]
+
+    with timer.measure('ocr'):
+        pending = [content for content in contents if encoded_size(content)]
+        recognized = iter(ocr_worker.process_images(pending, language_list) if pending else [])
+        all_results = [next(recognized) if encoded_size(content) else OCRResultSet() for content in contents]
+        all_results = [item.transform.apply(results) if item is not None else results
+                       for item, results in zip(prepared, all_results)]
+
+    outputs = []
+    for qimage, ocr_results, content in zip(qimages, all_results, contents):
+        capture_timer = StageTimer()
+        for stage in ('capture', 'encode', 'ocr'):
+            capture_timer.samples[stage] = list(timer.samples[stage])
+        with capture_timer.measure('translate'):
+            translations = translate_worker.translate_multiple(ocr_results, language_list, target_language)
+        outputs.append((capture_timer, start, qimage, ocr_results, translations, encoded_size(content)))
+    return outputs
+
+
+def run(args):
+    vision_latency, translate_latency, jitter, error_rate = NETWORK_PROFILES[args.network]
+    vision_profile = LatencyProfile(
+        args.vision_latency if args.vision_latency is not None else vision_latency,
+        args.jitter if args.jitter is not None else jitter,
+        args.error_rate if args.error_rate is not None else error_rate,
+        seed=args.seed
+    )
+    translate_profile = LatencyProfile(
+        args.translate_latency if args.translate_latency is not None else translate_latency,
+        vision_profile.jitter_ms, vision_profile.error_rate, seed=args.seed + 1
+    )
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    scenes = SCENES if args.scene == 'all' else (args.scene,)
+    corpus = generate_corpus(scenes, args.captures, args.width, args.height, args.seed)
+
+    # 새 번역 연결에는 TCP/TLS 핸드셰이크 왕복 2번에 해당하는 지연을 더함
+    translate_server = MockTranslateServer(translate_profile, handshake_ms=2 * translate_profile.latency_ms)
+    with MockVisionServer(vision_profile) as vision_server, translate_server:
+        pool = VisionClientPool(size=args.concurrency, client_factory=vision_server.create_client)
+        preprocessor = False    # --preprocess가 없으면 OCR_PREPROCESS 환경 변수와 상관없이 끔
+        if args.preprocess:
+            preprocessor = ImagePreprocessor(args.preprocess.split(','), target_text_height=args.target_text_height)
+        encoder = create_encoder(args.encoder)
+        ocr_worker = OCRWorker(args.languages, backend=GoogleVisionBackend(pool, args.granularity, args.feature),
+                               sentence_grouping=args.group_sentences, preprocessor=preprocessor, encoder=encoder)
+        http_client = HttpClient(pool_size=args.concurrency, max_retries=args.max_retries, backoff_base=0.05)
+        translate_worker = TranslateWorker('benchmark', http_client=http_client, base_url=translate_server.url)
+        if not args.no_warm:
+            # 앱 시작 후 ConnectionWarmer가 하는 준비: OCR 채널 연결 + 동시 요청 수만큼 번역 연결
+            # (앱은 채널 연결을 백그라운드에서 기다리므로 여기서는 연결될 때까지 직접 기다림)
+            ocr_worker.change_language(args.languages)
+            pool.warm()
+            translate_worker.warm(args.concurrency)
+
+        viewer = None
+        if not args.no_render:
+            from image_viewer import ImageViewer
+            viewer = ImageViewer(array_to_qimage(corpus[0].array), [])
+            viewer.show()
+
+        timer = StageTimer()
+        uploaded_bytes = 0
+        failed_translations = 0
+        segments = 0
+        first_capture = None
+
+        # OCRWorker가 요청마다 결과를 출력하므로 기본적으로 출력을 숨김
+        log = io.StringIO()
+        output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(log)
+        started = time.perf_counter()
+        with output, ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            futures = [
+                executor.submit(process_batch, corpus[i:i + args.ocr_batch], ocr_worker, translate_worker,
+                                args.languages, args.target)
+                for i in range(0, len(corpus), args.ocr_batch)
+            ]
+            for future in as_completed(futures):
+                for capture_timer, capture_start, qimage, ocr_results, translations, size in future.result():
+                    if future is futures[0] and first_capture is None:
+                        first_capture = time.perf_counter() - capture_start
+                    if viewer is not None:
+                        # Qt 위젯은 메인 스레드에서만 갱신
+                        with capture_timer.measure('render'):
+                            viewer.set_results(qimage, ocr_results)
+                            viewer.image_canvas.repaint()
+                    capture_timer.samples['total'].append(time.perf_counter() - capture_start)
+                    timer.merge(capture_timer)
+                    uploaded_bytes += size
+                    segments += len(ocr_results)
+                    failed_translations += sum(1 for result in translations if not result['success'])
+        elapsed = time.perf_counter() - started
+
+        if viewer is not None:
+            viewer.close()
+        http_client.close()
+
+        return {
+            'config': {
+                'network': args.network,
+                'scene': args.scene,
+                'captures': args.captures,
+                'concurrency': args.concurrency,
+                'ocr_batch': args.ocr_batch,
+                'feature': args.feature,
+                'size': [args.width, args.height],
+                'encoder': encoder.spec,
+                'encoder_selected': getattr(encoder, 'encoder', encoder).spec,   # adaptive가 고른 인코더
+                'granularity': args.granularity,
+                'group_sentences': args.group_sentences,
+                'preprocess': args.preprocess,
+                'warm': not args.no_warm,
+                'vision_latency_ms': vision_profile.latency_ms,
+                'translate_latency_ms': translate_profile.latency_ms,
+                'jitter_ms': vision_profile.jitter_ms,
+                'error_rate': vision_profile.error_rate,
+            },
+            'stages': summarize(timer.samples),
+            'throughput_captures_per_sec': len(corpus) / elapsed if elapsed else 0.0,
+            'elapsed_sec': elapsed,
+            'mean_upload_bytes': uploaded_bytes / len(corpus),
+            'first_capture_ms': first_capture * 1000.0,
+            'failed_translations': failed_translations,
+            'mean_segments': segments / len(corpus),
+            'vision_requests': vision_server.request_count,
+            'vision_images': vision_server.image_count,
+            'translate_requests': translate_server.request_count,
+            'translate_connections': translate_server.connection_count,
+        }
+
+
+def print_report(report):
+    config = report['config']
+    print(f"네트워크: {config['network']}  화면: {config['scene']}  캡처: {config['captures']}  "
+          f"동시 실행: {config['concurrency']}  OCR 묶음: {config['ocr_batch']}  크기: {config['size'][0]}x{config['size'][1]}  "
+          f"인코더: {config['encoder_selected']}  단위: {config['granularity']}"
+          f"{' (문장 묶기)' if config['group_sentences'] else ''}"
+          f"{'  전처리: ' + config['preprocess'] if config['preprocess'] else ''}")
+    print(f"{'단계':<10}{'p50':>10}{'p95':>10}{'p99':>10}{'평균':>10}  (ms)")
+    for stage in STAGES:
+        stats = report['stages'].get(stage)
+        if stats:
+            print(f"{stage:<10}{stats['p50']:>10.1f}{stats['p95']:>10.1f}{stats['p99']:>10.1f}{stats['mean']:>10.1f}")
+    print(f"첫 캡처: {report['first_capture_ms']:.1f} ms ({'연결 준비함' if config['warm'] else '준비 없음'})  "
+          f"전체 p50: {report['stages']['total']['p50']:.1f} ms")
+    print(f"처리량: {report['throughput_captures_per_sec']:.2f} 캡처/초  "
+          f"(총 {report['elapsed_sec']:.2f}초, 평균 업로드 {report['mean_upload_bytes'] / 1024:.1f} KB)")
+    print(f"요청 수: Vision {report['vision_requests']} (이미지 {report['vision_images']}), "
+          f"번역 {report['translate_requests']} (연결 {report['translate_connections']})  "
+          f"번역 실패: {report['failed_translations']}  캡처당 번역 조각: {report['mean_segments']:.1f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="모의 서버를 사용한 캡처-번역 지연 시간 벤치마크")
+    parser.add_argument('--captures', type=int, default=20, help='처리할 캡처 수')
+    parser.add_argument('--scene', choices=SCENES + ('all',), default='all', help='합성 화면 유형')
+    parser.add_argument('--network', choices=sorted(NETWORK_PROFILES), default='lan', help='네트워크 조건 프리셋')
+    parser.add_argument('--vision-latency', type=float, help='Vision 응답 지연 (ms, 프리셋 덮어쓰기)')
+    parser.add_argument('--translate-latency', type=float, help='번역 응답 지연 (ms, 프리셋 덮어쓰기)')
+    parser.add_argument('--jitter', type=float, help='응답 지연 지터 (ms, 프리셋 덮어쓰기)')
+    parser.add_argument('--error-rate', type=float, help='모의 서버 오류율 0~1 (프리셋 덮어쓰기)')
+    parser.add_argument('--concurrency', type=int, default=1, help='동시에 처리할 캡처 수')
+    parser.add_argument('--ocr-batch', type=int, default=1,
+                        help='Vision 요청 하나에 묶을 캡처 수 (batch_annotate_images, 최대 16장씩 분할)')
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--encoder', default='jpeg:95',
+                        help='업로드 인코더 (jpeg:Q, png:N, webp:Q, webp:lossless, adaptive[:정확도])')
+    parser.add_argument('--languages', nargs='+', default=['en'], help='OCR 언어 힌트')
+    parser.add_argument('--target', default='ko', help='번역 목표 언어')
+    parser.add_argument('--granularity', choices=GRANULARITIES, default=DEFAULT_GRANULARITY, help='OCR 결과 단위')
+    parser.add_argument('--feature', choices=VISION_FEATURES, default='text', help='Vision 인식 기능')
+    parser.add_argument('--group-sentences', action='store_true', help='줄을 문장 단위로 묶어 번역')
+    parser.add_argument('--preprocess', help=f"OCR 전처리 단계 (쉼표 구분: {','.join(PREPROCESS_STEPS)})")
+    parser.add_argument('--target-text-height', type=int, default=32, help='전처리 축소 목표 텍스트 줄 높이 (px)')
+    parser.add_argument('--max-retries', type=int, default=2, help='번역 요청 재시도 횟수')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-warm', action='store_true', help='OCR/번역 연결을 미리 준비하지 않음 (콜드 스타트)')
+    parser.add_argument('--no-render', action='store_true', help='표시 단계 생략')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+    parser.add_argument('--verbose', action='store_true', help='앱 코드의 출력 표시')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    args.ocr_batch = max(1, args.ocr_batch)
+    report = run(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+앱 시작 시간 벤치마크
+
+1. 모듈별 import 시간: 새 인터프리터에서 모듈 하나만 불러오는 데 걸린 시간 (-X importtime 누적값)
+   - 시작 경로: main.py가 첫 화면 전에 불러오는 모듈
+   - 지연 로드: 첫 화면 뒤(start_services) 또는 OCR 스레드에서 불러오는 모듈
+   - 시작 경로 모듈을 모두 불러온 뒤 지연 로드 모듈이 이미 불려 있으면 함께 보고
+2. 앱 시작: main.py를 STARTUP_BENCHMARK=1로 여러 번 실행해 단계별 시간(ms, main.py 실행 시작 기준)을 수집
+   - imports_ms: 모듈 import 완료, windows_ms: 윈도우 생성/표시 요청
+   - first_frame_ms: 컨트롤 위젯 첫 그리기, services_ms: OCR/번역 파이프라인 준비
+   - warm_ms: 백그라운드 준비(OCR 엔진, 글꼴) 완료
+   인터프리터 자체 시작 시간(interpreter_ms)은 따로 측정해 함께 보고합니다.
+
+사용법 (저장소 루트에서):
+    python -m benchmark.startup_benchmark --runs 5
+    python -m benchmark.startup_benchmark --imports-only
+"""
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP_MODULES = (
+    'PySide6.QtWidgets', 'capture_frame', 'capture_regions', 'control_widget', 'image_encoders',
+    'live_scheduler', 'metrics', 'translation_cache', 'translation_overlay', 'overlay_renderer',
+)
+DEFERRED_MODULES = (
+    'pipeline', 'translate_worker', 'http_client', 'async_translator', 'ocr_worker', 'ocr_backends',
+    'google.cloud.vision', 'image_viewer', 'font_manager', 'PIL.ImageFont',
+)
+STARTUP_STAGES = ('imports_ms', 'windows_ms', 'first_frame_ms', 'services_ms', 'warm_ms')
+
+
+def import_time_ms(module):
+    """새 인터프리터에서 module을 불러오는 누적 시간 (ms, 실패하면 None)"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=REPO_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    pattern = re.compile(r'import time:\s+\d+ \|\s+(\d+) \| ' + re.escape(module) + r'\s*$')
+    for line in reversed(result.stderr.splitlines()):
+        match = pattern.match(line)
+        if match:
+            return int(match.group(1)) / 1000.0
+    return None
+
+
+def leaked_modules():
+    """시작 경로 모듈을 모두 불러왔을 때 함께 불려 온 지연 로드 모듈 목록 (실패하면 None)"""
+    code = (f"import sys\n"
+            f"for module in {STARTUP_MODULES!r}:\n"
+            f"    try:\n"
+            f"        __import__(module)\n"
+            f"    except Exception:\n"
+            f"        pass\n"
+            f"print(sorted(set({DEFERRED_MODULES!r}) & set(sys.modules)))")
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    result = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return ast.literal_eval(result.stdout.strip().splitlines()[-1])
+
+
+def interpreter_ms(runs):
+    """빈 인터프리터 시작/종료 시간 중앙값 (ms)"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+        samples.append((time.perf_counter() - start) * 1000.0)
+    return float(np.median(samples))
+
+
+def run_app(timeout, platform):
+    """main.py를 한 번 실행해 STARTUP_TIMINGS 결과 반환 (실패하면 오류 메시지 문자열)"""
+    env = dict(os.environ, STARTUP_BENCHMARK='1')
+    if platform:
+        env['QT_QPA_PLATFORM'] = platform
+    try:
+        result = subprocess.run([sys.executable, 'main.py'], cwd=REPO_ROOT, env=env,
+                                capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return f"{timeout}초 안에 시작하지 않았습니다"
+    for line in result.stdout.splitlines():
+        if line.startswith('STARTUP_TIMINGS '):
+            return json.loads(line[len('STARTUP_TIMINGS '):])
+    return (result.stderr.strip().splitlines() or [f"종료 코드 {result.returncode}"])[-1]
+
+
+def measure(args):
+    report = {'imports': {}, 'startup': None}
+    for group, modules in (('startup', STARTUP_MODULES), ('deferred', DEFERRED_MODULES)):
+        report['imports'][group] = {module: import_time_ms(module) for module in modules}
+    report['imports']['leaked'] = leaked_modules()
+
+    if args.imports_only:
+        return report
+
+    runs = []
+    error = None
+    for _ in range(args.runs):
+        timings = run_app(args.timeout, args.platform)
+        if isinstance(timings, str):
+            error = timings
+            break
+        runs.append(timings)
+    report['startup'] = {
+        'runs': len(runs),
+        'error': error,
+        'interpreter_ms': interpreter_ms(max(3, args.runs)),
+        'stages': {
+            stage: {'p50': float(np.median(values)), 'max': float(np.max(values))}
+            for stage in STARTUP_STAGES
+            for values in [[run[stage] for run in runs if stage in run]] if values
+        },
+    }
+    return report
+
+
+def print_report(report):
+    for group, title in (('startup', '시작 경로 모듈'), ('deferred', '지연 로드 모듈')):
+        print(f"{title} (새 인터프리터에서 단독 import, ms)")
+        for module, value in report['imports'][group].items():
+            print(f"  {module:<22}{'불러올 수 없음' if value is None else f'{value:>8.1f}'}")
+    leaked = report['imports']['leaked']
+    if leaked:
+        print(f"경고: 시작 경로에서 지연 로드 모듈을 불러옴: {', '.join(leaked)}")
+
+    startup = report['startup']
+    if startup is None:
+        return
+    print(f"앱 시작 ({startup['runs']}회, main.py 실행 시작 기준 ms, "
+          f"인터프리터 시작 {startup['interpreter_ms']:.1f} ms 별도)")
+    for stage, stats in startup['stages'].items():
+        print(f"  {stage:<16}p50 {stats['p50']:>8.1f}   최대 {stats['max']:>8.1f}")
+    if startup['error']:
+        print(f"  실행 실패: {startup['error']}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="앱 시작 시간 벤치마크 (import 시간, 첫 화면까지 시간)")
+    parser.add_argument('--runs', type=int, default=5, help='main.py 실행 횟수')
+    parser.add_argument('--timeout', type=float, default=60.0, help='실행 한 번의 최대 대기 시간 (초)')
+    parser.add_argument('--platform', default='offscreen',
+                        help="QT_QPA_PLATFORM (실제 화면에서 측정하려면 '' 지정)")
+    parser.add_argument('--imports-only', action='store_true', help='모듈 import 시간만 측정')
+    parser.add_argument('--json', help='결과를 저장할 JSON 파일 경로')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = measure(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
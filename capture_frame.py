@@ -4,7 +4,12 @@ from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QPainter, QPen, QColor, QScreen
 import tempfile
 import os
-from PIL import Image
+
+from frame_buffer import to_rgb_qimage
+from image_encoders import create_encoder, encoded_size
+from frame_diff import compute_fingerprint
+from metrics import CaptureTrace
+from translation_overlay import TranslationOverlay
 
 
 class MainFrame(QMainWindow):
@@ -13,6 +18,9 @@ class MainFrame(QMainWindow):
     # 시그널 정의
     deactivate_requested = Signal()
     
+    # 캡처에서 제외하는 빨간색 태두리 두께
+    BORDER_THICKNESS = 3
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Main Frame")
@@ -61,10 +69,20 @@ class MainFrame(QMainWindow):
         button_layout.addStretch()  # 나머지 공간을 아래로 밀어냄
         layout.addLayout(button_layout)
         
+        # 캡처 영역 위에 번역문을 그리는 오버레이 (마우스 이벤트는 통과)
+        self.translation_overlay = TranslationOverlay(self, fade_ms=int(os.getenv("OVERLAY_FADE_MS", "400")))
+        self.translation_overlay.raise_()
+        self.fit_overlay()
+        self.translation_overlay.show()
+        
         # 내부 상태
         self.is_interactive = False
         self.capture_count = 0
-        self.temp_files = []  # 생성된 임시 파일들 추적
+        self.temp_files = []  # 생성된 임시 파일들 추적 (디버그 덤프)
+        
+        # 캡처 설정 (업로드 인코더: CAPTURE_ENCODER, 디버그 덤프 여부)
+        self.encoder = create_encoder()
+        self.debug_dump = os.getenv("CAPTURE_DEBUG_DUMP") == "1"
         
         # 크기 조절 관련 상태
         self.resizing = False
@@ -106,6 +124,31 @@ class MainFrame(QMainWindow):
             # 우하단
             painter.fillRect(rect.width() - handle_size, rect.height() - handle_size, handle_size, handle_size, handle_color)
 
+    def fit_overlay(self):
+        """오버레이를 캡처 영역(태두리 안쪽)에 맞춤"""
+        border = self.BORDER_THICKNESS
+        self.translation_overlay.setGeometry(self.rect().adjusted(border, border, -border, -border))
+    
+    def resizeEvent(self, event):
+        """창 크기가 바뀌면 오버레이를 캡처 영역에 맞춤 (생성 도중의 이벤트는 무시)"""
+        super().resizeEvent(event)
+        if hasattr(self, 'translation_overlay'):
+            self.fit_overlay()
+    
+    def moveEvent(self, event):
+        """창이 움직이면 이전 결과 위치가 맞지 않으므로 오버레이 비우기"""
+        super().moveEvent(event)
+        if hasattr(self, 'translation_overlay'):
+            self.translation_overlay.clear()
+    
+    def show_translations(self, ocr_results, image_size, live=False):
+        """OCR/번역 결과를 캡처 영역 위 오버레이로 표시 (실시간 모드에서는 사라진 상자를 서서히 지움)"""
+        self.translation_overlay.set_results(ocr_results, image_size, fade=live)
+    
+    def update_translations(self, ocr_results):
+        """번역이 도착한 결과만 오버레이에 반영"""
+        self.translation_overlay.update_results(ocr_results)
+    
     def set_frame_color(self, QColor):
         self.frame_color = QColor
         print(QColor)
@@ -161,7 +204,10 @@ class MainFrame(QMainWindow):
         return None
         
     def capture_screen(self):
-        """빨간색 태두리 영역을 캡처하여 임시 JPG 파일로 저장"""
+        """빨간색 태두리 영역을 캡처하여 메모리 버퍼로 반환 (디버그 덤프 시에만 파일 저장)"""
+        
+        # 단계별 소요 시간 기록 (파이프라인과 화면 표시까지 이어서 사용)
+        trace = CaptureTrace(self.capture_count + 1)
         
         try:
             # 현재 화면 가져오기
@@ -172,7 +218,7 @@ class MainFrame(QMainWindow):
             window_geometry = self.geometry()
             
             # 빨간색 태두리 영역 계산 (태두리 두께 3픽셀 고려)
-            border_thickness = 3
+            border_thickness = self.BORDER_THICKNESS
             capture_rect = window_geometry.adjusted(
                 border_thickness, 
                 border_thickness, 
@@ -180,47 +226,53 @@ class MainFrame(QMainWindow):
                 -border_thickness
             )
             
-            # 화면 캡처
-            screenshot = screen.grabWindow(0, 
-                                        capture_rect.x(), 
-                                        capture_rect.y(), 
-                                        capture_rect.width(), 
-                                        capture_rect.height())
-            
-            # QPixmap을 임시 PNG로 저장한 후 PIL로 읽기 (색상 보존)
-            temp_png = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-            temp_png_path = temp_png.name
-            temp_png.close()
-            
-            # QPixmap을 PNG로 저장
-            screenshot.save(temp_png_path, "PNG")
+            # 오버레이가 찍히지 않도록 캡처하는 동안 숨김 (번역문을 다시 인식하는 것 방지)
+            overlay_visible = self.translation_overlay.isVisible() and bool(self.translation_overlay.boxes)
+            if overlay_visible:
+                self.translation_overlay.hide()
+                app.processEvents()
             
-            # PIL로 PNG 읽기
-            pil_image = Image.open(temp_png_path)
-            
-            # RGB로 변환 (색상 보존)
-            rgb_image = pil_image.convert("RGB")
+            # 화면 캡처
+            with trace.span('grab'):
+                try:
+                    screenshot = screen.grabWindow(0, 
+                                                capture_rect.x(), 
+                                                capture_rect.y(), 
+                                                capture_rect.width(), 
+                                                capture_rect.height())
+                finally:
+                    if overlay_visible:
+                        self.translation_overlay.show()
             
-            # 임시 PNG 파일 삭제
-            os.unlink(temp_png_path)
+            # QPixmap -> RGB QImage (메모리에서 변환, 파일 왕복 없음)
+            with trace.span('convert'):
+                image = to_rgb_qimage(screenshot.toImage())
             
-            # 임시 JPG 파일 생성
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.jpg')
-            temp_file_path = temp_file.name
-            temp_file.close()
+            # 변경 감지용 지문 (축소 회색조 격자 + dHash)
+            with trace.span('fingerprint'):
+                fingerprint = compute_fingerprint(image)
             
-            # JPG로 저장
-            rgb_image.save(temp_file_path, 'JPEG', quality=95)
+            # OCR 업로드용으로 메모리에서 한 번만 인코딩
+            with trace.span('encode') as span:
+                image_bytes = self.encoder.encode(image)
+                span['bytes'] = encoded_size(image_bytes)
             
-            # 임시 파일 목록에 추가
-            self.temp_files.append(temp_file_path)
+            # 디버그 덤프가 켜져 있을 때만 디스크에 기록
+            temp_file_path = None
+            if self.debug_dump:
+                temp_file_path = self.dump_capture(image_bytes)
             
             self.capture_count += 1
             
             return {
                 'success': True,
                 'message': f"캡처 완료! ({self.capture_count}번째)",
+                'image': image,
+                'image_bytes': image_bytes,
+                'image_format': self.encoder.name,
+                'fingerprint': fingerprint,
                 'temp_file_path': temp_file_path,
+                'trace': trace,
                 'capture_rect': {
                     'x': capture_rect.x(),
                     'y': capture_rect.y(),
@@ -233,9 +285,21 @@ class MainFrame(QMainWindow):
             return {
                 'success': False,
                 'message': f"캡처 실패: {str(e)}",
+                'image': None,
+                'image_bytes': None,
                 'temp_file_path': None
             }
     
+    def dump_capture(self, image_bytes):
+        """디버그용: 인코딩된 캡처 이미지를 임시 파일로 저장"""
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=self.encoder.suffix)
+        temp_file.write(image_bytes)
+        temp_file.close()
+        
+        # 임시 파일 목록에 추가
+        self.temp_files.append(temp_file.name)
+        return temp_file.name
+    
     def cleanup_temp_files(self):
         """생성된 임시 파일들 정리"""
         for temp_file_path in self.temp_files:
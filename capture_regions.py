@@ -0,0 +1,286 @@
+"""
+여러 개의 이름 있는 캡처 영역 (자막 줄, 채팅창, 툴팁 등)
+
+모든 영역을 감싸는 사각형을 grabWindow 한 번으로 캡처한 뒤 메모리에서 영역별로 잘라
+세로로 이어 붙인 모자이크 한 장으로 OCR 요청 한 번에 보냅니다.
+모자이크 배치는 캡처마다 같으므로 증분 OCR과 변경 감지도 그대로 동작하고,
+갱신 주기가 지나지 않은 영역은 이전 픽셀을 그대로 넣어 다시 인식하지 않습니다.
+"""
+import json
+import time
+
+import numpy as np
+from PySide6.QtCore import QRect, Qt
+from PySide6.QtGui import QColor, QPainter, QPen
+from PySide6.QtWidgets import QApplication, QWidget
+
+from frame_buffer import array_to_qimage, qimage_to_array, to_rgb_qimage
+from frame_diff import compute_fingerprint
+from image_encoders import create_encoder, encoded_size
+from metrics import CaptureTrace
+from ocr_text import OCRResultSet
+from translation_overlay import TranslationOverlay
+
+MOSAIC_GAP = 16                     # 모자이크에서 영역 사이 여백 (픽셀, OCR이 영역을 섞지 않도록)
+MOSAIC_BACKGROUND = 255
+
+
+class CaptureRegion:
+    """이름 있는 캡처 영역 하나 (화면 좌표, 언어, 갱신 주기)"""
+
+    def __init__(self, name, x, y, width, height, language_list=None, target_language=None, refresh_ms=0):
+        if width <= 0 or height <= 0:
+            raise ValueError(f"캡처 영역 '{name}'의 크기가 올바르지 않습니다: {width}x{height}")
+        self.name = name
+        self.x = int(x)
+        self.y = int(y)
+        self.width = int(width)
+        self.height = int(height)
+        self.language_list = list(language_list) if language_list else None   # None이면 선택된 언어 사용
+        self.target_language = target_language   # None이면 선택된 번역 언어 사용
+        self.refresh_ms = int(refresh_ms or 0)    # 0이면 캡처마다 갱신
+
+    def __repr__(self):
+        return f"CaptureRegion({self.name!r}, {self.x}, {self.y}, {self.width}x{self.height})"
+
+
+def load_regions(path):
+    """
+    JSON 파일에서 캡처 영역 목록 읽기
+
+    [{"name": "subtitle", "x": 0, "y": 900, "width": 1920, "height": 120,
+      "languages": ["ja"], "target": "ko", "refresh_ms": 500}, ...]
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    regions = [
+        CaptureRegion(entry['name'], entry['x'], entry['y'], entry['width'], entry['height'],
+                      entry.get('languages'), entry.get('target'), entry.get('refresh_ms', 0))
+        for entry in entries
+    ]
+    names = [region.name for region in regions]
+    if len(set(names)) != len(names):
+        raise ValueError(f"캡처 영역 이름이 중복되었습니다: {names}")
+    if not regions:
+        raise ValueError(f"캡처 영역이 없습니다: {path}")
+    return regions
+
+
+def bounding_rect(regions):
+    """모든 영역을 감싸는 (x, y, width, height)"""
+    x1 = min(region.x for region in regions)
+    y1 = min(region.y for region in regions)
+    x2 = max(region.x + region.width for region in regions)
+    y2 = max(region.y + region.height for region in regions)
+    return x1, y1, x2 - x1, y2 - y1
+
+
+class RegionLayout:
+    """
+    캡처 이미지(감싸는 사각형) 안의 영역 위치와 모자이크 배치, 좌표 변환
+
+    좌표는 모두 캡처 이미지 픽셀 기준입니다 (HiDPI에서는 scale = 장치 픽셀 비율).
+    """
+
+    def __init__(self, regions, bounds, scale=1.0, gap=MOSAIC_GAP):
+        self.regions = list(regions)
+        self.bounds = bounds
+        self.scale = scale
+        bx, by, bw, bh = bounds
+        self.image_size = (round(bw * scale), round(bh * scale))
+
+        # 캡처 이미지 안 영역 위치 (x, y, width, height)
+        self.area = np.array([
+            [round((r.x - bx) * scale), round((r.y - by) * scale), round(r.width * scale), round(r.height * scale)]
+            for r in self.regions
+        ], dtype=np.int64)
+        # 반올림으로 캡처 이미지 밖으로 나가지 않도록 자름
+        self.area[:, 2] = np.minimum(self.area[:, 2], self.image_size[0] - self.area[:, 0])
+        self.area[:, 3] = np.minimum(self.area[:, 3], self.image_size[1] - self.area[:, 1])
+        # 모자이크에서 각 영역이 시작하는 y (위에서부터 gap을 두고 쌓음)
+        heights = self.area[:, 3]
+        self.mosaic_y = np.concatenate([[0], np.cumsum(heights + gap)[:-1]])
+        self.mosaic_size = (int(self.area[:, 2].max()), int(self.mosaic_y[-1] + heights[-1]))
+
+    def build_mosaic(self, slices):
+        """영역별 (h, w, 3) 이미지를 세로로 이어 붙인 모자이크"""
+        width, height = self.mosaic_size
+        mosaic = np.full((height, width, 3), MOSAIC_BACKGROUND, dtype=np.uint8)
+        for (_, _, w, h), top, image in zip(self.area.tolist(), self.mosaic_y.tolist(), slices):
+            mosaic[top:top + h, :w] = image
+        return mosaic
+
+    def region_indices(self, results):
+        """(N,) 모자이크 좌표 결과가 속한 영역 인덱스 (영역 사이 여백이면 -1)"""
+        results = OCRResultSet.from_objects(results)
+        if not len(results):
+            return np.zeros(0, dtype=np.int64)
+        centers = results.centroids()
+        index = np.searchsorted(self.mosaic_y, centers[:, 1], side='right') - 1
+        index = np.clip(index, 0, len(self.regions) - 1)
+        inside = ((centers[:, 1] < self.mosaic_y[index] + self.area[index, 3])
+                  & (centers[:, 0] < self.area[index, 2]))
+        return np.where(inside, index, -1)
+
+    def to_capture(self, results):
+        """모자이크 좌표 결과를 캡처 이미지(감싸는 사각형) 좌표로 옮긴 OCRResultSet (여백의 결과는 제외)"""
+        results = OCRResultSet.from_objects(results)
+        index = self.region_indices(results)
+        keep = index >= 0
+        mapped = results[keep]
+        index = index[keep]
+        shift = self.area[index, :2] - np.stack([np.zeros_like(index), self.mosaic_y[index]], axis=1)
+        mapped.boxes = (mapped.boxes + shift[:, None, :]).astype(np.int32)
+        return mapped
+
+    def translation_groups(self, results, language_list, target_language):
+        """
+        번역 언어별로 결과 행을 묶음 (같은 번역 언어를 쓰는 영역은 한 번의 일괄 번역)
+
+        Returns:
+            list: [(원문 언어 목록, 번역 언어, 행 인덱스 목록), ...]
+        """
+        groups = {}
+        for row, region_index in enumerate(self.region_indices(results).tolist()):
+            if region_index < 0:
+                continue    # 영역 사이 여백의 결과는 표시하지 않으므로 번역하지 않음
+            region = self.regions[region_index]
+            languages = tuple(region.language_list or language_list)
+            target = region.target_language or target_language
+            groups.setdefault((languages, target), []).append(row)
+        return [(list(languages), target, rows) for (languages, target), rows in groups.items()]
+
+
+class RegionFrame(QWidget):
+    """
+    여러 캡처 영역을 표시하고 한 번에 캡처하는 투명 창 (MainFrame의 다중 영역 버전)
+
+    창은 모든 영역을 감싸는 사각형을 덮고 영역 테두리와 번역 오버레이를 그립니다.
+    capture_screen()은 MainFrame과 같은 형식의 결과에 'regions'(RegionLayout)를 더해 반환하며
+    'image'/'image_bytes'는 OCR용 모자이크입니다.
+    """
+
+    OUTLINE_COLOR = QColor(255, 0, 0, 160)
+    MARGIN = 4      # 영역 테두리를 영역 바깥에 그리기 위한 창 여백
+
+    def __init__(self, regions, encoder=None):
+        super().__init__()
+        self.setWindowTitle("Capture Regions")
+        self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint
+                            | Qt.WindowType.Tool | Qt.WindowType.WindowTransparentForInput)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+
+        self.regions = list(regions)
+        self.bounds = bounding_rect(self.regions)
+        margin = self.MARGIN
+        self.setGeometry(QRect(*self.bounds).adjusted(-margin, -margin, margin, margin))
+        self.layout_cache = None          # 장치 픽셀 비율별 RegionLayout
+        self.encoder = encoder or create_encoder()
+        self.capture_count = 0
+        self._slices = {}                 # 영역 이름 -> 마지막으로 갱신한 픽셀
+        self._refreshed_at = {}           # 영역 이름 -> 마지막 갱신 시각
+
+        self.translation_overlay = TranslationOverlay(self)
+        self.translation_overlay.setGeometry(self.rect().adjusted(margin, margin, -margin, -margin))
+        self.translation_overlay.show()
+
+    def ocr_languages(self, language_list):
+        """OCR 언어 힌트: 선택된 언어 + 영역별 언어 (순서 유지, 중복 제거)"""
+        languages = list(language_list)
+        for region in self.regions:
+            for language in region.language_list or ():
+                if language not in languages:
+                    languages.append(language)
+        return languages
+
+    def layout_for(self, image):
+        scale = image.width() / float(self.bounds[2])
+        if self.layout_cache is None or self.layout_cache.scale != scale:
+            self.layout_cache = RegionLayout(self.regions, self.bounds, scale)
+        return self.layout_cache
+
+    def capture_screen(self):
+        """감싸는 사각형을 한 번 캡처해 영역별로 잘라 모자이크 생성 (갱신 주기가 안 된 영역은 이전 픽셀)"""
+        trace = CaptureTrace(self.capture_count + 1)
+        try:
+            app = QApplication.instance()
+            x, y, width, height = self.bounds
+
+            # 번역 오버레이가 찍히지 않도록 캡처하는 동안 숨김
+            overlay_visible = self.isVisible() and bool(self.translation_overlay.boxes)
+            if overlay_visible:
+                self.hide()
+                app.processEvents()
+            with trace.span('grab'):
+                try:
+                    screenshot = app.primaryScreen().grabWindow(0, x, y, width, height)
+                finally:
+                    if overlay_visible:
+                        self.show()
+
+            with trace.span('convert'):
+                image = to_rgb_qimage(screenshot.toImage())
+                layout = self.layout_for(image)
+                frame = qimage_to_array(image)
+                now = time.monotonic()
+                slices = []
+                for region, (ax, ay, aw, ah) in zip(self.regions, layout.area.tolist()):
+                    previous = self._slices.get(region.name)
+                    due = (region.refresh_ms <= 0 or previous is None or previous.shape[:2] != (ah, aw)
+                           or (now - self._refreshed_at[region.name]) * 1000 >= region.refresh_ms)
+                    if due:
+                        previous = self._slices[region.name] = frame[ay:ay + ah, ax:ax + aw].copy()
+                        self._refreshed_at[region.name] = now
+                    slices.append(previous)
+                mosaic = array_to_qimage(layout.build_mosaic(slices))
+
+            with trace.span('fingerprint'):
+                fingerprint = compute_fingerprint(mosaic)
+
+            with trace.span('encode') as span:
+                image_bytes = self.encoder.encode(mosaic)
+                span['bytes'] = encoded_size(image_bytes)
+
+            self.capture_count += 1
+            return {
+                'success': True,
+                'message': f"영역 {len(self.regions)}개 캡처 완료! ({self.capture_count}번째)",
+                'image': mosaic,
+                'image_bytes': image_bytes,
+                'image_format': self.encoder.name,
+                'fingerprint': fingerprint,
+                'temp_file_path': None,
+                'trace': trace,
+                'regions': layout,
+                'capture_rect': {'x': x, 'y': y, 'width': width, 'height': height},
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f"캡처 실패: {str(e)}",
+                'image_bytes': None,
+                'temp_file_path': None
+            }
+
+    def show_translations(self, ocr_results, image_size, live=False):
+        """모자이크 좌표 결과를 영역 위치로 옮겨 오버레이에 표시 (image_size는 모자이크 크기라 사용하지 않음)"""
+        layout = self.layout_cache
+        if layout is None:
+            return
+        self.translation_overlay.set_results(layout.to_capture(ocr_results), layout.image_size, fade=live)
+
+    def update_translations(self, ocr_results):
+        """번역이 도착한 결과만 오버레이에 반영"""
+        if self.layout_cache is not None:
+            self.translation_overlay.update_results(self.layout_cache.to_capture(ocr_results))
+
+    def paintEvent(self, event):
+        # 영역 테두리 (영역 바로 바깥쪽 1픽셀에 그려 캡처에 찍히지 않음)
+        painter = QPainter(self)
+        painter.setPen(QPen(self.OUTLINE_COLOR, 1, Qt.PenStyle.DashLine))
+        left = self.bounds[0] - self.MARGIN
+        top = self.bounds[1] - self.MARGIN
+        for region in self.regions:
+            painter.drawRect(QRect(region.x - left, region.y - top, region.width, region.height).adjusted(-1, -1, 0, 0))
+        painter.end()
@@ -0,0 +1,111 @@
+import threading
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+
+class ConnectionWarmer(QObject):
+    """
+    OCR/번역 서버 연결 미리 준비
+
+    앱이 뜬 직후, 한동안 쓰지 않았을 때(서버나 공유기가 유휴 연결을 끊기 전), 네트워크가 바뀌었을 때
+    OCR 클라이언트(gRPC 채널)와 번역 HTTP 연결을 다시 맺어 두어 첫 캡처도 평소 지연으로 처리되게 합니다.
+
+    - OCR: 파이프라인의 OCR 스레드에서 엔진 준비 (워커/클라이언트 생성), 채널 연결 대기는 별도 스레드에서
+    - 번역: 동시 요청 수만큼 HEAD 요청을 보내 HTTP 연결 풀을 채움 (API 할당량을 쓰지 않음)
+    """
+
+    warmed = Signal(int, float)     # 번역 연결 수, 번역 연결 준비 시간 (ms)
+
+    def __init__(self, pipeline, translate_worker, connections=1, idle_interval_ms=240000,
+                 keepalive_ms=1800000, parent=None):
+        super().__init__(parent)
+        self.pipeline = pipeline
+        self.translate_worker = translate_worker
+        self.connections = max(1, connections)      # 미리 맺을 번역 연결 수 (동시 요청 수)
+        self.idle_interval_ms = idle_interval_ms    # 쓰지 않는 동안 다시 준비하는 간격
+        self.keepalive_ms = keepalive_ms            # 마지막 사용 후 이 시간이 지나면 유지하지 않음
+        self.language_list = []
+        self.last_activity = time.monotonic()
+        self.warm_count = 0
+        self.network_information = None
+
+        self._http_lock = threading.Lock()
+        self._idle_timer = QTimer(self)
+        self._idle_timer.timeout.connect(self._on_idle)
+
+    def start(self, language_list):
+        """유휴 타이머와 네트워크 변경 감지 시작 (준비 자체는 warm()으로 요청)"""
+        self.language_list = list(language_list)
+        self._watch_network()
+        if self.idle_interval_ms > 0:
+            self._idle_timer.start(self.idle_interval_ms)
+
+    def stop(self):
+        self._idle_timer.stop()
+
+    def set_languages(self, language_list):
+        """언어 선택이 바뀌면 해당 언어로 OCR 엔진을 다시 준비"""
+        self.language_list = list(language_list)
+        self.pipeline.warm_languages(self.language_list)
+
+    def touch(self):
+        """캡처를 처리했음을 기록 (GUI 스레드, 유휴 타이머를 처음부터 다시 셈)"""
+        self.last_activity = time.monotonic()
+        if self.idle_interval_ms > 0:
+            self._idle_timer.start(self.idle_interval_ms)
+
+    def warm(self, wait=False):
+        """
+        OCR/번역 연결 준비 요청
+
+        OCR 준비는 OCR 스레드 대기열에 들어가므로 항상 바로 반환합니다.
+        wait=True면 번역 연결 준비는 호출한 스레드에서 끝날 때까지 실행합니다.
+        """
+        self.warm_count += 1
+        self.pipeline.warm_languages(self.language_list)
+        if wait:
+            self._warm_http()
+        else:
+            threading.Thread(target=self._warm_http, daemon=True).start()
+
+    def _warm_http(self):
+        # 이미 준비 중이면 건너뜀 (네트워크 변경 알림이 연달아 와도 한 번만)
+        if not self._http_lock.acquire(blocking=False):
+            return
+        try:
+            start = time.perf_counter()
+            connected = self.translate_worker.warm(self.connections)
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            print(f"번역 연결 준비: {connected}/{self.connections}개, {elapsed_ms:.0f} ms")
+            self.warmed.emit(connected, elapsed_ms)
+        finally:
+            self._http_lock.release()
+
+    def _on_idle(self):
+        # 오래 쓰지 않았으면 연결을 유지하지 않음 (다시 캡처하면 touch()로 재개)
+        if (time.monotonic() - self.last_activity) * 1000.0 > self.keepalive_ms:
+            self._idle_timer.stop()
+            return
+        self.warm()
+
+    def _watch_network(self):
+        from PySide6.QtNetwork import QNetworkInformation
+
+        if self.network_information is not None:
+            return
+        if not QNetworkInformation.loadDefaultBackend():
+            print("네트워크 상태 감지를 사용할 수 없어 네트워크 변경 시 다시 준비하지 않습니다.")
+            return
+        self.network_information = QNetworkInformation.instance()
+        self.network_information.reachabilityChanged.connect(self._on_network_changed)
+        self.network_information.transportMediumChanged.connect(self._on_network_changed)
+
+    def _on_network_changed(self, *_):
+        from PySide6.QtNetwork import QNetworkInformation
+
+        if self.network_information.reachability() != QNetworkInformation.Reachability.Online:
+            return
+        print("네트워크 변경 감지: OCR/번역 연결을 다시 준비합니다.")
+        self.touch()
+        self.warm()
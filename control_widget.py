@@ -14,6 +14,8 @@ class ControlWidget(QMainWindow):
     # 시그널 정의
     capture_requested = Signal(list)  # 언어 리스트를 함께 전달
     toggle_interactive = Signal(bool)
+    live_mode_toggled = Signal(bool)  # 실시간 번역 모드 시작/중지
+    languages_changed = Signal(list)  # 인식 언어 선택 변경
     color_mod_request = Signal(QColor)
     
     def __init__(self):
@@ -40,6 +42,12 @@ class ControlWidget(QMainWindow):
         self.capture_button.clicked.connect(self.on_capture_clicked)
         layout.addWidget(self.capture_button)
         
+        # 실시간 번역 토글 버튼
+        self.live_button = QPushButton("실시간 번역 시작")
+        self.live_button.setCheckable(True)
+        self.live_button.toggled.connect(self.on_live_toggled)
+        layout.addWidget(self.live_button)
+        
         # 상태 토글 버튼
         self.toggle_button = QPushButton("상호작용 활성화")
         self.toggle_button.clicked.connect(self.on_toggle_clicked)
@@ -48,6 +56,19 @@ class ControlWidget(QMainWindow):
         # 상태 표시 레이블
         self.status_label = QLabel("상태: 비활성화")
         layout.addWidget(self.status_label)
+        
+        # 번역 서버 연결 상태 (성능 저하 모드일 때만 표시)
+        self.network_label = QLabel("번역 서버 불안정: 잠시 번역 중단")
+        self.network_label.setStyleSheet("color: #f44336;")
+        self.network_label.hide()
+        layout.addWidget(self.network_label)
+        
+        # 마지막 캡처의 단계별 소요 시간 (HUD)
+        self.metrics_label = QLabel("")
+        self.metrics_label.setWordWrap(True)
+        self.metrics_label.setStyleSheet("color: #9e9e9e; font-size: 10px;")
+        self.metrics_label.hide()
+        layout.addWidget(self.metrics_label)
         layout.addWidget(self._create_spacer(10))
 
         # 상태 레이블
@@ -153,6 +174,11 @@ class ControlWidget(QMainWindow):
         # 현재 선택된 언어 리스트와 함께 캡처 요청
         self.capture_requested.emit(self.get_selected_languages())
         
+    def on_live_toggled(self, checked):
+        """실시간 번역 버튼 토글 처리"""
+        self.live_button.setText("실시간 번역 중지" if checked else "실시간 번역 시작")
+        self.live_mode_toggled.emit(checked)
+        
     def on_toggle_clicked(self):
         """상호작용 토글 버튼 클릭 처리"""
         self.interactive_enabled = not self.interactive_enabled
@@ -189,11 +215,28 @@ class ControlWidget(QMainWindow):
             self.selected_languages = ['ko']
         
         print(f"선택된 언어: {self.selected_languages}")
+        self.languages_changed.emit(self.selected_languages)
     
     def get_selected_languages(self):
         """선택된 언어 목록 반환"""
         return self.selected_languages
     
+    def set_translation_degraded(self, degraded):
+        """번역 서버 성능 저하 모드 표시"""
+        self.network_label.setVisible(degraded)
+    
+    def set_metrics_summary(self, summary):
+        """마지막 캡처의 단계별 소요 시간 표시"""
+        self.metrics_label.setText(summary)
+        self.metrics_label.setVisible(bool(summary))
+    
+    def get_target_language(self):
+        """번역 목표 언어 코드 반환 (예: '한국어(ko)' -> 'ko', 선택 없으면 None)"""
+        text = self.designated_language_dropdown.currentText()
+        if '(' not in text:
+            return None
+        return text[text.rindex('(') + 1:].rstrip(')')
+    
     def close_application(self):
         """애플리케이션 종료"""
         # 임시 파일 정리 후 종료 (메서드가 있는 경우에만)
@@ -0,0 +1,145 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from PIL import ImageFont
+
+# 플랫폼별 글꼴 후보 파일 (앞쪽일수록 우선)
+CJK_FONT_CANDIDATES = {
+    'win32': ('malgun.ttf', 'gulim.ttc', 'batang.ttc', 'msgothic.ttc', 'msyh.ttc', 'simsun.ttc'),
+    'darwin': ('AppleSDGothicNeo.ttc', 'AppleGothic.ttf', 'Hiragino Sans GB.ttc', 'PingFang.ttc',
+               'Arial Unicode.ttf'),
+    'linux': ('NotoSansCJK-Regular.ttc', 'NotoSansCJKkr-Regular.otf', 'NotoSansKR-Regular.ttf',
+              'NanumGothic.ttf', 'wqy-microhei.ttc', 'wqy-zenhei.ttc', 'DroidSansFallbackFull.ttf'),
+}
+LATIN_FONT_CANDIDATES = {
+    'win32': ('segoeui.ttf', 'arial.ttf'),
+    'darwin': ('Helvetica.ttc', 'Arial.ttf'),
+    'linux': ('DejaVuSans.ttf', 'LiberationSans-Regular.ttf', 'NotoSans-Regular.ttf'),
+}
+
+# 한중일 문자 범위 (한글, 히라가나/가타카나, CJK 한자, 전각 기호)
+CJK_RANGES = (
+    (0x1100, 0x11FF), (0x3000, 0x30FF), (0x3130, 0x318F), (0x3400, 0x4DBF),
+    (0x4E00, 0x9FFF), (0xAC00, 0xD7AF), (0xF900, 0xFAFF), (0xFF00, 0xFFEF),
+)
+
+
+def needs_cjk(text):
+    """텍스트에 한중일 문자가 포함되어 있는지 확인"""
+    for ch in text:
+        code = ord(ch)
+        if code >= 0x1100 and any(start <= code <= end for start, end in CJK_RANGES):
+            return True
+    return False
+
+
+def font_directories():
+    """현재 플랫폼의 글꼴 디렉터리 목록"""
+    home = os.path.expanduser('~')
+    if sys.platform.startswith('win'):
+        return [os.path.join(os.environ.get('WINDIR', 'C:/Windows'), 'Fonts'),
+                os.path.join(os.environ.get('LOCALAPPDATA', home), 'Microsoft', 'Windows', 'Fonts')]
+    if sys.platform == 'darwin':
+        return ['/System/Library/Fonts', '/System/Library/Fonts/Supplemental', '/Library/Fonts',
+                os.path.join(home, 'Library', 'Fonts')]
+    return ['/usr/share/fonts', '/usr/local/share/fonts', os.path.join(home, '.local', 'share', 'fonts'),
+            os.path.join(home, '.fonts')]
+
+
+def _platform_key():
+    if sys.platform.startswith('win'):
+        return 'win32'
+    return 'darwin' if sys.platform == 'darwin' else 'linux'
+
+
+class FontManager:
+    """
+    오버레이용 글꼴 관리자
+
+    글꼴 파일은 생성 시 한 번만 찾아 두고, 불러온 글꼴은 (파일, 크기 구간) 단위로 캐시합니다.
+    크기는 size_step 단위로 묶어서 비슷한 크기의 상자들이 같은 글꼴 객체를 공유합니다.
+    OVERLAY_FONT / OVERLAY_CJK_FONT 환경 변수로 글꼴 파일을 직접 지정할 수 있습니다.
+    """
+
+    def __init__(self, size_step=2, min_size=12, max_size=48, max_cached_fonts=64):
+        self.size_step = size_step
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_cached_fonts = max_cached_fonts
+        self._fonts = OrderedDict()   # (경로, 크기) -> FreeTypeFont
+        self._lock = threading.Lock()
+
+        index = self._index_font_files()
+        platform = _platform_key()
+        self.latin_path = os.getenv('OVERLAY_FONT') or self._first_available(LATIN_FONT_CANDIDATES[platform], index)
+        self.cjk_path = (os.getenv('OVERLAY_CJK_FONT') or os.getenv('OVERLAY_FONT')
+                         or self._first_available(CJK_FONT_CANDIDATES[platform], index))
+        # CJK 글꼴은 대부분 라틴 문자도 포함하므로 라틴 글꼴이 없으면 대신 사용
+        self.latin_path = self.latin_path or self.cjk_path
+
+    def _index_font_files(self):
+        """글꼴 디렉터리를 한 번 훑어 파일 이름(소문자) -> 경로 색인 생성"""
+        index = {}
+        for directory in font_directories():
+            if not os.path.isdir(directory):
+                continue
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    if name.lower().endswith(('.ttf', '.ttc', '.otf')):
+                        index.setdefault(name.lower(), os.path.join(root, name))
+        return index
+
+    def _first_available(self, candidates, index):
+        for name in candidates:
+            path = index.get(name.lower())
+            if path:
+                return path
+        return None
+
+    def bucket_size(self, size):
+        """글꼴 크기를 허용 범위로 자르고 size_step 단위로 내림"""
+        size = int(min(max(size, self.min_size), self.max_size))
+        return size - (size - self.min_size) % self.size_step
+
+    def get_font(self, size, text=''):
+        """텍스트에 맞는(한중일 포함 여부) 글꼴을 크기 구간별로 캐시해서 반환"""
+        path = self.cjk_path if self.cjk_path and needs_cjk(text) else self.latin_path
+        key = (path, self.bucket_size(size))
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is not None:
+                self._fonts.move_to_end(key)
+                return font
+
+        font = self._load(*key)
+        with self._lock:
+            self._fonts[key] = font
+            while len(self._fonts) > self.max_cached_fonts:
+                self._fonts.popitem(last=False)
+        return font
+
+    def _load(self, path, size):
+        if path:
+            try:
+                return ImageFont.truetype(path, size)
+            except OSError as e:
+                print(f"글꼴 로드 실패 ({path}): {e}")
+        try:
+            return ImageFont.load_default(size=size)
+        except TypeError:  # Pillow 10.1 미만은 크기 지정 불가
+            return ImageFont.load_default()
+
+
+_shared_font_manager = None
+_shared_font_manager_lock = threading.Lock()
+
+
+def get_font_manager():
+    """프로세스 전체에서 공유하는 글꼴 관리자 (처음 호출할 때 글꼴 탐색)"""
+    global _shared_font_manager
+    with _shared_font_manager_lock:
+        if _shared_font_manager is None:
+            _shared_font_manager = FontManager()
+        return _shared_font_manager
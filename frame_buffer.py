@@ -0,0 +1,52 @@
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice
+from PySide6.QtGui import QImage
+import numpy as np
+
+
+def to_rgb_qimage(qimage):
+    """QImage를 RGB888 형식으로 변환 (이미 RGB888이면 그대로 반환)"""
+    if qimage.format() == QImage.Format.Format_RGB888:
+        return qimage
+    return qimage.convertToFormat(QImage.Format.Format_RGB888)
+
+
+def qimage_to_array(qimage):
+    """
+    RGB888 QImage를 (H, W, 3) NumPy 배열로 변환합니다.
+
+    RGB888 이미지는 복사 없이 QImage 메모리를 그대로 보는 뷰를 반환하므로
+    배열을 사용하는 동안 원본 QImage를 살려두어야 합니다.
+    다른 형식이면 변환 후 복사본을 반환합니다.
+    """
+    is_view = qimage.format() == QImage.Format.Format_RGB888
+    qimage = to_rgb_qimage(qimage)
+
+    width = qimage.width()
+    height = qimage.height()
+    bytes_per_line = qimage.bytesPerLine()
+
+    # 줄 끝 패딩(bytesPerLine)을 고려해 (H, W, 3) 뷰 생성
+    buffer = np.frombuffer(qimage.constBits(), dtype=np.uint8, count=bytes_per_line * height)
+    array = buffer.reshape(height, bytes_per_line)[:, :width * 3].reshape(height, width, 3)
+    return array if is_view else array.copy()
+
+
+def encode_qimage(qimage, image_format="JPEG", quality=95):
+    """QImage를 디스크를 거치지 않고 메모리에서 인코딩하여 bytes로 반환"""
+    byte_array = QByteArray()
+    buffer = QBuffer(byte_array)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    if not qimage.save(buffer, image_format, quality):
+        buffer.close()
+        raise ValueError(f"이미지 인코딩 실패: {image_format}")
+    buffer.close()
+    return byte_array.data()
+
+
+def array_to_qimage(array):
+    """(H, W, 3) uint8 RGB 또는 (H, W) 회색조 배열을 QImage로 변환 (배열 메모리와 분리된 복사본)"""
+    array = np.ascontiguousarray(array)
+    height, width = array.shape[:2]
+    image_format = QImage.Format.Format_Grayscale8 if array.ndim == 2 else QImage.Format.Format_RGB888
+    qimage = QImage(array.data, width, height, array.strides[0], image_format)
+    return qimage.copy()
@@ -0,0 +1,63 @@
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage
+import numpy as np
+
+
+class FrameFingerprint:
+    """축소된 회색조 격자와 차이 해시(dHash)로 이루어진 캡처 지문"""
+
+    def __init__(self, grid, image_size):
+        self.grid = grid                # (N, N) uint8 회색조 격자
+        self.image_size = image_size    # 원본 (width, height)
+        self.hash = difference_hash(grid)
+
+    def __repr__(self):
+        return f"FrameFingerprint(hash={self.hash:016x}, image_size={self.image_size})"
+
+
+def difference_hash(grid, hash_size=8):
+    """격자를 (hash_size+1, hash_size)로 평균 축소해 가로 방향 밝기 차이로 64비트 해시 생성"""
+    height, width = grid.shape
+    rows = np.array_split(np.arange(height), hash_size)
+    cols = np.array_split(np.arange(width), hash_size + 1)
+    small = np.array([[grid[np.ix_(r, c)].mean() for c in cols] for r in rows])
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int(np.packbits(bits).view('>u8')[0])
+
+
+def compute_fingerprint(qimage, grid_size=64):
+    """캡처 QImage를 grid_size x grid_size 회색조 격자로 축소하여 지문 생성"""
+    small = qimage.scaled(
+        grid_size, grid_size,
+        Qt.AspectRatioMode.IgnoreAspectRatio,
+        Qt.TransformationMode.SmoothTransformation
+    ).convertToFormat(QImage.Format.Format_Grayscale8)
+
+    bytes_per_line = small.bytesPerLine()
+    buffer = np.frombuffer(small.constBits(), dtype=np.uint8, count=bytes_per_line * grid_size)
+    grid = buffer.reshape(grid_size, bytes_per_line)[:, :grid_size].copy()
+    return FrameFingerprint(grid, (qimage.width(), qimage.height()))
+
+
+class FrameChangeDetector:
+    """두 캡처 지문을 비교해 영역 변경 여부 판단"""
+
+    def __init__(self, change_threshold=0.0, cell_tolerance=2):
+        self.change_threshold = change_threshold  # 변경된 칸 비율이 이 값 이하면 '변경 없음'
+        self.cell_tolerance = cell_tolerance      # 칸 밝기 차이가 이 값 이하면 노이즈로 무시
+
+    def change_ratio(self, previous, current):
+        """변경된 격자 칸의 비율 (0.0 ~ 1.0, 비교 불가하면 1.0)"""
+        if previous is None or current is None:
+            return 1.0
+        if previous.image_size != current.image_size or previous.grid.shape != current.grid.shape:
+            return 1.0
+        if previous.hash == current.hash and np.array_equal(previous.grid, current.grid):
+            return 0.0
+
+        diff = np.abs(previous.grid.astype(np.int16) - current.grid.astype(np.int16))
+        return float(np.count_nonzero(diff > self.cell_tolerance)) / diff.size
+
+    def is_unchanged(self, previous, current):
+        """변경 비율이 임계값 이하인지 여부"""
+        return self.change_ratio(previous, current) <= self.change_threshold
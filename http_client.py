@@ -0,0 +1,183 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 재시도할 HTTP 상태 코드 (요청 과다, 서버 오류)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """회로 차단기가 열려 있어 요청을 보내지 않음"""
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 쌓이면 일정 시간 요청을 막는 회로 차단기
+
+    closed(정상) → 실패 누적 시 open(차단, 성능 저하 모드)
+    → reset_timeout 후 half_open(시험 요청 1개 허용) → 성공 시 closed
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, on_state_change=None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_state_change = on_state_change  # 콜백: (degraded: bool)
+
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def degraded(self):
+        return self.state != self.CLOSED
+
+    def allow_request(self):
+        """지금 요청을 보내도 되는지 여부"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN:
+                # 반열림 상태에서는 시험 요청 하나만 통과
+                if self._trial_in_flight:
+                    return False
+                self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            was_degraded = self.degraded
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+        if was_degraded:
+            self._notify(False)
+
+    def release(self):
+        """결과를 판단할 수 없는 요청 종료 (반열림 시험 요청 자리만 반환)"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            was_degraded = self.degraded
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+        if not was_degraded and self.degraded:
+            self._notify(True)
+
+    def _notify(self, degraded):
+        if self.on_state_change is not None:
+            try:
+                self.on_state_change(degraded)
+            except Exception as e:
+                print(f"회로 차단기 상태 알림 오류: {e}")
+
+
+class HttpClient:
+    """
+    연결을 재사용하는 HTTP 클라이언트 (keep-alive 세션 + 재시도 + 회로 차단기)
+
+    429/5xx와 연결 오류는 지터가 있는 지수 백오프로 재시도하고,
+    재시도까지 모두 실패한 요청은 회로 차단기에 실패로 기록합니다.
+    """
+
+    def __init__(self, pool_size=10, timeout=(3.05, 10.0), max_retries=3,
+                 backoff_base=0.5, backoff_max=8.0, breaker=None):
+        self.timeout = timeout              # (연결, 읽기) 초 단위
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        """요청 전송 (재시도 후에도 실패하면 마지막 응답 반환 또는 예외 발생)"""
+        if not self.breaker.allow_request():
+            raise CircuitOpenError('번역 서버 연결이 불안정하여 잠시 요청을 중단했습니다.')
+
+        kwargs.setdefault('timeout', self.timeout)
+        response = None
+        error = None
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.request(method, url, **kwargs)
+                error = None
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                response = None
+                error = e
+            except requests.exceptions.RequestException:
+                # 잘못된 요청 등 재시도해도 소용없는 오류 (서버 상태와 무관)
+                self.breaker.release()
+                raise
+
+            if response is not None and response.status_code not in RETRY_STATUS_CODES:
+                self.breaker.record_success()
+                return response
+
+            if attempt < self.max_retries:
+                time.sleep(self._retry_delay(attempt, response))
+
+        self.breaker.record_failure()
+        if response is not None:
+            return response
+        raise error
+
+    def _retry_delay(self, attempt, response):
+        """재시도 대기 시간: Retry-After 헤더 우선, 없으면 full jitter 지수 백오프"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def warm(self, url, connections=1):
+        """
+        HEAD 요청으로 연결 풀에 연결(DNS/TCP/TLS)을 미리 맺어 둠
+
+        응답 코드는 상관없고 재시도나 회로 차단기 기록도 하지 않습니다.
+        connections개를 동시에 보내 동시 요청 수만큼 연결을 채웁니다.
+
+        Returns:
+            int: 연결에 성공한 요청 수
+        """
+        def head(_):
+            try:
+                self.session.head(url, timeout=self.timeout).close()
+                return True
+            except requests.exceptions.RequestException:
+                return False
+
+        if connections <= 1:
+            return int(head(0))
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            return sum(executor.map(head, range(connections)))
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,179 @@
+import json
+import os
+
+from frame_buffer import encode_qimage, qimage_to_array
+
+DEFAULT_ENCODER = "jpeg:95"
+DEFAULT_CALIBRATION_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark",
+                                        "encoder_calibration.json")
+
+
+def encoded_size(data):
+    """인코딩 결과 크기 (bytes 또는 raw 인코더의 배열)"""
+    return getattr(data, 'nbytes', None) or len(data)
+
+
+class ImageEncoder:
+    """OCR 업로드용 이미지 인코더 인터페이스: QImage -> 업로드할 데이터"""
+
+    name = "base"
+    suffix = ".bin"     # 디버그 덤프 파일 확장자
+
+    @property
+    def spec(self):
+        """create_encoder()로 다시 만들 수 있는 설정 문자열"""
+        return self.name
+
+    def encode(self, qimage):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.spec!r})"
+
+
+class JpegEncoder(ImageEncoder):
+    name = "jpeg"
+    suffix = ".jpg"
+
+    def __init__(self, quality=95):
+        self.quality = int(quality)
+
+    @property
+    def spec(self):
+        return f"jpeg:{self.quality}"
+
+    def encode(self, qimage):
+        return encode_qimage(qimage, "JPEG", self.quality)
+
+
+class PngEncoder(ImageEncoder):
+    """무손실 PNG (compression 0~9, 낮을수록 빠르고 큼)"""
+
+    name = "png"
+    suffix = ".png"
+
+    def __init__(self, compression=1):
+        self.compression = int(compression)
+
+    @property
+    def spec(self):
+        return f"png:{self.compression}"
+
+    def encode(self, qimage):
+        # Qt의 PNG quality는 압축 수준의 역수 (압축 = (100 - quality) * 9 / 91)
+        quality = 100 - (self.compression * 91 + 8) // 9
+        return encode_qimage(qimage, "PNG", quality)
+
+
+class WebpEncoder(ImageEncoder):
+    """WebP (lossless=True면 무손실, 아니면 quality 0~99 손실 압축)"""
+
+    name = "webp"
+    suffix = ".webp"
+
+    def __init__(self, quality=80, lossless=False):
+        self.quality = int(quality)
+        self.lossless = lossless
+
+    @property
+    def spec(self):
+        return "webp:lossless" if self.lossless else f"webp:{self.quality}"
+
+    def encode(self, qimage):
+        # Qt WebP 플러그인은 quality 100을 무손실로 처리
+        return encode_qimage(qimage, "WEBP", 100 if self.lossless else min(self.quality, 99))
+
+
+class RawEncoder(ImageEncoder):
+    """인코딩 없이 (H, W, 3) RGB 배열 전달 (EasyOCR 같은 로컬 엔진 전용)"""
+
+    name = "raw"
+    suffix = ".rgb"
+
+    def encode(self, qimage):
+        return qimage_to_array(qimage).copy()
+
+
+class AdaptiveEncoder(ImageEncoder):
+    """
+    보정 결과(benchmark/calibrate_encoders.py)에서 목표 OCR 정확도를 만족하는
+    가장 작은 인코딩을 골라 사용 (보정 파일이 없거나 만족하는 후보가 없으면 fallback 사용)
+
+    OCR 단어 재현율(--ocr로 측정한 word_recall:*)로 보정한 파일만 사용합니다.
+    글자 마스크 IoU 같은 근사 지표는 OCR 정확도가 아니므로 fallback을 사용합니다.
+    저장소에는 보정 파일이 없으므로 먼저 python -m benchmark.calibrate_encoders --ocr vision
+    (또는 easyocr)으로 DEFAULT_CALIBRATION_FILE을 만들어야 합니다.
+
+    max_encode_ms를 주면 인코딩 시간(p50)이 그보다 긴 후보는 제외합니다 (빠른 회선에서 유리).
+    """
+
+    name = "adaptive"
+
+    def __init__(self, target_accuracy=0.98, calibration_file=None, fallback="png:1", max_encode_ms=None):
+        self.target_accuracy = float(target_accuracy)
+        self.max_encode_ms = max_encode_ms
+        self.calibration_file = calibration_file or DEFAULT_CALIBRATION_FILE
+        self.encoder = create_encoder(self.choose(fallback))
+        self.suffix = self.encoder.suffix
+
+    @property
+    def spec(self):
+        return f"adaptive:{self.target_accuracy}"
+
+    def choose(self, fallback):
+        """보정 결과에서 정확도 목표를 만족하는 평균 크기가 가장 작은 인코더 설정"""
+        try:
+            with open(self.calibration_file, 'r', encoding='utf-8') as f:
+                calibration = json.load(f)
+            metric = calibration.get('metric', '')
+            results = calibration['results']
+        except (OSError, ValueError, KeyError, AttributeError) as e:
+            print(f"인코더 보정 파일을 읽을 수 없어 {fallback} 사용: {e} "
+                  f"(python -m benchmark.calibrate_encoders --ocr vision으로 먼저 보정하세요)")
+            return fallback
+        if not metric.startswith('word_recall:'):
+            print(f"인코더 보정 지표가 OCR 정확도가 아니어서({metric or '지표 없음'}) {fallback} 사용 "
+                  f"(python -m benchmark.calibrate_encoders --ocr vision으로 다시 보정하세요)")
+            return fallback
+
+        eligible = [
+            (stats['mean_bytes'], spec) for spec, stats in results.items()
+            if stats['accuracy'] >= self.target_accuracy and not spec.startswith(('raw', 'adaptive'))
+            and (self.max_encode_ms is None or stats.get('encode_ms_p50', 0) <= self.max_encode_ms)
+        ]
+        if not eligible:
+            print(f"정확도 {self.target_accuracy}를 만족하는 인코더가 없어 {fallback} 사용")
+            return fallback
+        return min(eligible)[1]
+
+    def encode(self, qimage):
+        return self.encoder.encode(qimage)
+
+    def __repr__(self):
+        return f"AdaptiveEncoder({self.spec!r} -> {self.encoder.spec!r})"
+
+
+def create_encoder(spec=None):
+    """
+    설정 문자열로 인코더 생성 (기본값: 환경 변수 CAPTURE_ENCODER 또는 'jpeg:95')
+
+    예: 'jpeg:80', 'png', 'png:6', 'webp:75', 'webp:lossless', 'raw', 'adaptive', 'adaptive:0.95'
+    """
+    spec = (spec or os.getenv("CAPTURE_ENCODER", DEFAULT_ENCODER)).strip().lower()
+    name, _, option = spec.partition(':')
+    if name in ('jpeg', 'jpg'):
+        return JpegEncoder(option or 95)
+    if name == 'png':
+        return PngEncoder(option or 1)
+    if name == 'webp':
+        if option == 'lossless':
+            return WebpEncoder(lossless=True)
+        return WebpEncoder(option or 80)
+    if name == 'raw':
+        return RawEncoder()
+    if name == 'adaptive':
+        max_encode_ms = os.getenv("CAPTURE_MAX_ENCODE_MS")
+        return AdaptiveEncoder(option or os.getenv("CAPTURE_TARGET_ACCURACY", "0.98"),
+                               os.getenv("ENCODER_CALIBRATION_FILE") or None,
+                               max_encode_ms=float(max_encode_ms) if max_encode_ms else None)
+    raise ValueError(f"알 수 없는 인코더: {spec} (사용 가능: jpeg, png, webp, raw, adaptive)")
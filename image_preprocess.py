@@ -0,0 +1,173 @@
+import os
+
+import cv2
+import numpy as np
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage
+
+from frame_buffer import array_to_qimage, encode_qimage
+from image_encoders import RawEncoder
+from ocr_text import OCRResultSet
+
+PREPROCESS_STEPS = ('downscale', 'grayscale', 'binarize', 'crop')
+
+
+def detect_text_regions(gray, min_height=6, max_height_ratio=0.5, min_fill=0.2):
+    """
+    회색조 이미지에서 텍스트 줄 후보 영역을 빠르게 찾음
+
+    형태학적 그래디언트(글자 윤곽) → Otsu 이진화 → 가로 방향 닫기로 글자를 줄 단위로 잇고
+    연결 요소의 경계 사각형 중 줄 모양인 것만 남깁니다.
+
+    Returns:
+        np.ndarray: (N, 4) 영역 (x1, y1, x2, y2)
+    """
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
+    gradient = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, kernel)
+    _, binary = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    connected = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1)))
+
+    _, _, stats, _ = cv2.connectedComponentsWithStats(connected, connectivity=8)
+    x, y, w, h, area = stats[1:].T   # 0번은 배경
+    keep = ((h >= min_height) & (h <= gray.shape[0] * max_height_ratio)
+            & (area >= min_fill * w * h))
+    return np.stack([x[keep], y[keep], x[keep] + w[keep], y[keep] + h[keep]], axis=1)
+
+
+def estimate_text_height(regions, min_aspect=1.5):
+    """
+    텍스트 줄 높이 추정 (줄/단어 모양으로 가로가 긴 영역의 높이 중앙값)
+
+    i/j의 점, 구두점, 글자 안쪽 구멍 같은 작은 영역은 줄보다 훨씬 낮아 그대로 중앙값을 내면
+    줄 높이를 크게 낮춰 잡으므로 제외합니다 (가로가 긴 영역이 없으면 전체 사용).
+    """
+    heights = regions[:, 3] - regions[:, 1]
+    line_like = regions[:, 2] - regions[:, 0] >= min_aspect * heights
+    if line_like.any():
+        heights = heights[line_like]
+    return float(np.median(heights))
+
+
+class ImageTransform:
+    """전처리한 이미지 좌표 -> 원본 캡처 좌표 변환 (원본 = 좌표 / scale + offset)"""
+
+    __slots__ = ('scale', 'offset_x', 'offset_y')
+
+    def __init__(self, scale=1.0, offset_x=0, offset_y=0):
+        self.scale = scale
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+
+    def apply(self, results):
+        """OCR 결과 상자를 원본 캡처 좌표로 옮긴 OCRResultSet 반환"""
+        results = OCRResultSet.from_objects(results)
+        if self.scale == 1.0 and not self.offset_x and not self.offset_y:
+            return results
+        mapped = results[:]
+        points = results.boxes / self.scale + np.array([self.offset_x, self.offset_y])
+        mapped.boxes = np.rint(points).astype(np.int32)
+        return mapped
+
+    def __repr__(self):
+        return f"ImageTransform(scale={self.scale:.3f}, offset=({self.offset_x}, {self.offset_y}))"
+
+
+class PreparedImage:
+    """OCR에 보낼 전처리 결과 (이미지 배열 + 원본 좌표 변환)"""
+
+    def __init__(self, array, transform, binary=False):
+        self.array = array              # (H, W, 3) RGB 또는 (H, W) 회색조
+        self.transform = transform
+        self.binary = binary            # 0/255 이진 이미지 여부
+
+    def encode(self, encoder):
+        """업로드용으로 인코딩 (raw 인코더면 배열 그대로, 이진 이미지는 인코더와 관계없이 1비트 PNG)"""
+        if isinstance(encoder, RawEncoder):
+            return self.array
+        qimage = array_to_qimage(self.array)
+        if self.binary:
+            # Qt의 PNG quality는 압축률의 역이므로 기본 압축(-1) 사용
+            qimage = qimage.convertToFormat(QImage.Format.Format_Mono, Qt.ImageConversionFlag.ThresholdDither)
+            return encode_qimage(qimage, "PNG", -1)
+        return encoder.encode(qimage)
+
+
+class ImagePreprocessor:
+    """
+    OCR 전 이미지 전처리 (캡처와 OCR 엔진 사이)
+
+    - downscale: 텍스트 줄 높이가 target_text_height보다 크면(HiDPI 등) 그 높이에 맞게 축소
+    - grayscale: 회색조로 변환
+    - binarize: 적응형 이진화 (1비트 PNG로 보내 매우 작음)
+    - crop: 텍스트 후보 영역을 모두 포함하는 사각형으로 자름 (텍스트가 없으면 OCR 생략)
+
+    OCR 결과 좌표는 PreparedImage.transform으로 원본 캡처 좌표로 되돌립니다.
+    """
+
+    def __init__(self, steps=('downscale', 'crop'), target_text_height=32, min_scale=0.25,
+                 crop_padding=8, block_size=31, threshold_offset=15):
+        unknown = set(steps) - set(PREPROCESS_STEPS)
+        if unknown:
+            raise ValueError(f"알 수 없는 전처리 단계: {', '.join(sorted(unknown))} "
+                             f"(사용 가능: {', '.join(PREPROCESS_STEPS)})")
+        self.steps = frozenset(steps)
+        self.target_text_height = target_text_height
+        self.min_scale = min_scale
+        self.crop_padding = crop_padding
+        self.block_size = block_size | 1    # 적응형 이진화 블록 크기는 홀수
+        self.threshold_offset = threshold_offset
+
+    def prepare(self, frame):
+        """
+        RGB 프레임 (H, W, 3)을 전처리
+
+        Returns:
+            PreparedImage: 전처리 결과 (crop 단계에서 텍스트 후보가 없으면 None)
+        """
+        gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+        image = gray if self.steps & {'grayscale', 'binarize'} else frame
+        offset_x = offset_y = 0
+        scale = 1.0
+
+        if self.steps & {'crop', 'downscale'}:
+            regions = detect_text_regions(gray)
+            if 'crop' in self.steps:
+                if not len(regions):
+                    return None
+                height, width = gray.shape
+                padding = self.crop_padding
+                offset_x = max(0, int(regions[:, 0].min()) - padding)
+                offset_y = max(0, int(regions[:, 1].min()) - padding)
+                x2 = min(width, int(regions[:, 2].max()) + padding)
+                y2 = min(height, int(regions[:, 3].max()) + padding)
+                image = image[offset_y:y2, offset_x:x2]
+            if 'downscale' in self.steps and len(regions):
+                text_height = estimate_text_height(regions)
+                if text_height > self.target_text_height:
+                    scale = max(self.min_scale, self.target_text_height / text_height)
+
+        if scale < 1.0:
+            source_width = image.shape[1]
+            size = (max(1, round(source_width * scale)), max(1, round(image.shape[0] * scale)))
+            image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+            scale = image.shape[1] / source_width    # 정수 크기로 반올림된 실제 배율
+
+        binary = 'binarize' in self.steps
+        if binary:
+            image = cv2.adaptiveThreshold(image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY,
+                                          self.block_size, self.threshold_offset)
+
+        return PreparedImage(np.ascontiguousarray(image), ImageTransform(scale, offset_x, offset_y), binary)
+
+
+def create_preprocessor():
+    """
+    환경 변수로 전처리기 생성 (OCR_PREPROCESS가 비어 있으면 None = 전처리 안 함)
+
+    OCR_PREPROCESS: 쉼표로 구분한 단계 (예: downscale,grayscale,binarize,crop)
+    OCR_TARGET_TEXT_HEIGHT: 축소 후 목표 텍스트 줄 높이 (픽셀, 기본 32)
+    """
+    steps = [step.strip() for step in os.getenv("OCR_PREPROCESS", "").split(',') if step.strip()]
+    if not steps:
+        return None
+    return ImagePreprocessor(steps, target_text_height=int(os.getenv("OCR_TARGET_TEXT_HEIGHT", "32")))
@@ -1,16 +1,47 @@
 from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QScrollArea, QTextEdit, QSplitter
 from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QPixmap, QPainter, QPen, QColor, QFont
-from PIL import Image, ImageDraw, ImageFont
-import os
+from PySide6.QtGui import QPixmap, QPainter, QPen, QColor, QFont, QImage
+
+from overlay_painter import paint_overlay
+from overlay_renderer import layout_overlay
+
+
+class OverlayCanvas(QWidget):
+    """원본 픽스맵 위에 OCR 오버레이를 별도 레이어로 그리는 위젯 (원본 이미지는 다시 인코딩하지 않음)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pixmap = QPixmap()
+        self.items = []
+        self.overlay_visible = True
+
+    def set_image(self, pixmap):
+        self.pixmap = pixmap
+        self.setFixedSize(pixmap.size())
+        self.update()
+
+    def set_items(self, items):
+        self.items = items
+        self.update()
+
+    def set_overlay_visible(self, visible):
+        self.overlay_visible = visible
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.pixmap)
+        if self.overlay_visible:
+            paint_overlay(painter, self.items)
+        painter.end()
 
 
 class ImageViewer(QMainWindow):
     """OCR 결과를 시각적으로 표시하는 이미지 뷰어"""
     
-    def __init__(self, image_path, ocr_results):
+    def __init__(self, image_source, ocr_results):
         super().__init__()
-        self.image_path = image_path
+        self.image_source = image_source  # QImage, 인코딩된 bytes 또는 파일 경로
         self.ocr_results = ocr_results
         self.current_image = None
         
@@ -38,6 +69,12 @@ class ImageViewer(QMainWindow):
         # 이미지 로드 및 표시
         self.load_and_display_image()
     
+    def set_results(self, image_source, ocr_results):
+        """열려 있는 뷰어의 이미지와 OCR 결과 교체 (새 창을 만들지 않음)"""
+        self.image_source = image_source
+        self.ocr_results = ocr_results
+        self.load_and_display_image()
+    
     def setup_image_area(self, parent):
         """이미지 표시 영역 설정"""
         image_widget = QWidget()
@@ -48,11 +85,9 @@ class ImageViewer(QMainWindow):
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
-        # 이미지 라벨
-        self.image_label = QLabel()
-        self.image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.image_label.setStyleSheet("border: 1px solid #ccc;")
-        self.scroll_area.setWidget(self.image_label)
+        # 이미지 + 오버레이 캔버스
+        self.image_canvas = OverlayCanvas()
+        self.scroll_area.setWidget(self.image_canvas)
         
         image_layout.addWidget(self.scroll_area)
         parent.addWidget(image_widget)
@@ -95,99 +130,48 @@ class ImageViewer(QMainWindow):
         parent.addWidget(text_widget)
     
     def load_and_display_image(self):
-        """이미지 로드 및 OCR 결과와 함께 표시"""
+        """이미지 로드 및 OCR 결과와 함께 표시 (파일이나 인코딩을 거치지 않음)"""
         try:
-            # PIL로 이미지 로드
-            pil_image = Image.open(self.image_path)
-            self.current_image = pil_image.copy()
-            
-            # OCR 결과를 이미지에 그리기
-            self.draw_ocr_results(pil_image)
+            self.current_image = self.load_qimage()
             
-            # PIL 이미지를 QPixmap으로 변환
-            pil_image.save("temp_ocr_result.jpg", "JPEG")
-            pixmap = QPixmap("temp_ocr_result.jpg")
-            
-            # 이미지 크기에 맞게 라벨 크기 조정
-            self.image_label.setPixmap(pixmap)
-            self.image_label.setMinimumSize(pixmap.size())
+            # 원본은 픽스맵으로 한 번만 올리고 OCR 결과는 그 위 레이어로 그림
+            self.image_canvas.set_image(QPixmap.fromImage(self.current_image))
+            self.draw_ocr_results()
             
             # 텍스트 결과 표시
             self.display_text_results()
-            
-            # 임시 파일 삭제
-            if os.path.exists("temp_ocr_result.jpg"):
-                os.remove("temp_ocr_result.jpg")
                 
         except Exception as e:
             print(f"이미지 로드 오류: {e}")
     
-    def draw_ocr_results(self, image):
-        """OCR 결과를 하얀색 배경에 검은색 글자로 덮어씌우기"""
-        draw = ImageDraw.Draw(image)
-        
-        for i, (bbox, text, confidence) in enumerate(self.ocr_results):
-            # 바운딩 박스의 중심점 계산
-            center_x = sum(point[0] for point in bbox) / len(bbox)
-            center_y = sum(point[1] for point in bbox) / len(bbox)
-            
-            # 바운딩 박스 크기 계산
-            bbox_width = max(point[0] for point in bbox) - min(point[0] for point in bbox)
-            bbox_height = max(point[1] for point in bbox) - min(point[1] for point in bbox)
-            
-            # 폰트 크기 결정 (바운딩 박스 크기에 비례)
-            font_size = max(12, min(bbox_height * 0.8, 48))
-            
-            try:
-                # 한글 지원 폰트 시도 (Windows)
-                font = ImageFont.truetype("C:/Windows/Fonts/malgun.ttf", int(font_size))  # 맑은 고딕
-            except:
-                try:
-                    font = ImageFont.truetype("C:/Windows/Fonts/gulim.ttc", int(font_size))  # 굴림
-                except:
-                    try:
-                        font = ImageFont.truetype("C:/Windows/Fonts/batang.ttc", int(font_size))  # 바탕
-                    except:
-                        try:
-                            font = ImageFont.truetype("C:/Windows/Fonts/arial.ttf", int(font_size))  # Arial
-                        except:
-                            # 기본 폰트 사용
-                            font = ImageFont.load_default()
-            
-            # 텍스트 크기 측정
-            bbox_text = draw.textbbox((0, 0), text, font=font)
-            text_width = bbox_text[2] - bbox_text[0]
-            text_height = bbox_text[3] - bbox_text[1]
-            
-            # 텍스트 위치 계산 (중심점 기준)
-            text_x = center_x - text_width / 2
-            text_y = center_y - text_height / 2
-            
-            # 하얀색 배경 사각형 그리기 (약간의 패딩 추가)
-            padding = 4
-            bg_x1 = text_x - padding
-            bg_y1 = text_y - padding
-            bg_x2 = text_x + text_width + padding
-            bg_y2 = text_y + text_height + padding
-            
-            # 반투명한 하얀색 배경
-            draw.rectangle([bg_x1, bg_y1, bg_x2, bg_y2], fill=(255, 255, 255, 200))
-            
-            # 검은색 텍스트 그리기
-            draw.text((text_x, text_y), text, fill=(0, 0, 0, 255), font=font)
+    def load_qimage(self):
+        """이미지 소스를 QImage로 변환 (캡처된 QImage는 그대로 사용)"""
+        if isinstance(self.image_source, QImage):
+            image = self.image_source
+        elif isinstance(self.image_source, (bytes, bytearray)):
+            image = QImage.fromData(bytes(self.image_source))
+        else:
+            image = QImage(str(self.image_source))
+        if image.isNull():
+            raise ValueError("이미지를 불러올 수 없습니다.")
+        return image
+    
+    def draw_ocr_results(self):
+        """OCR 결과를 하얀색 배경에 검은색 글자로 덮어씌우기 (모든 상자를 한 번에 배치 후 레이어로 그림)"""
+        self.image_canvas.set_items(layout_overlay(self.ocr_results))
     
     def display_text_results(self):
         """텍스트 결과를 텍스트 영역에 표시"""
         text_content = "=== OCR 인식 결과 ===\n\n"
         
-        for i, (bbox, text, confidence) in enumerate(self.ocr_results):
-            text_content += f"[{i+1}] {text}\n"
-            text_content += f"    신뢰도: {confidence:.2f}\n"
-            text_content += f"    위치: {bbox}\n\n"
+        for i, ocr_text in enumerate(self.ocr_results):
+            text_content += f"[{i+1}] {ocr_text.text}\n"
+            text_content += f"    신뢰도: {ocr_text.confidence:.2f}\n"
+            text_content += f"    위치: {ocr_text.bbox}\n\n"
         
         # 추출된 텍스트만 따로 표시
         text_content += "=== 추출된 텍스트 ===\n"
-        extracted_texts = [text for _, text, _ in self.ocr_results]
+        extracted_texts = [ocr_text.text for ocr_text in self.ocr_results]
         for text in extracted_texts:
             text_content += f"{text}\n"
         
@@ -202,10 +186,3 @@ class ImageViewer(QMainWindow):
             print("텍스트가 'ocr_result.txt' 파일로 저장되었습니다.")
         except Exception as e:
             print(f"텍스트 저장 오류: {e}")
-    
-    def closeEvent(self, event):
-        """창 닫기 이벤트"""
-        # 임시 파일 정리
-        if os.path.exists("temp_ocr_result.jpg"):
-            os.remove("temp_ocr_result.jpg")
-        event.accept()
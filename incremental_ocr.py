@@ -0,0 +1,177 @@
+import numpy as np
+
+from ocr_text import OCRResultSet
+
+
+def find_dirty_tiles(previous, current, tile_size=32, pixel_tolerance=24):
+    """
+    두 프레임(H, W, 3)을 타일 단위로 비교해 변경된 타일 마스크 반환
+
+    Returns:
+        np.ndarray: (타일 행 수, 타일 열 수) bool 배열
+    """
+    diff = np.abs(previous.astype(np.int16) - current.astype(np.int16)).max(axis=2) > pixel_tolerance
+
+    # 타일 크기의 배수가 되도록 패딩 후 타일별로 접기
+    height, width = diff.shape
+    rows = -(-height // tile_size)
+    cols = -(-width // tile_size)
+    padded = np.zeros((rows * tile_size, cols * tile_size), dtype=bool)
+    padded[:height, :width] = diff
+    return padded.reshape(rows, tile_size, cols, tile_size).any(axis=(1, 3))
+
+
+def tiles_to_rects(mask, tile_size, padding, frame_width, frame_height):
+    """변경된 타일을 연결 요소별 경계 사각형 (x1, y1, x2, y2)으로 병합"""
+    rows, cols = mask.shape
+    visited = np.zeros_like(mask)
+    rects = []
+
+    for row, col in zip(*np.nonzero(mask)):
+        if visited[row, col]:
+            continue
+        # 8방향 연결 요소 탐색
+        stack = [(row, col)]
+        visited[row, col] = True
+        min_r, max_r, min_c, max_c = row, row, col, col
+        while stack:
+            r, c = stack.pop()
+            min_r, max_r = min(min_r, r), max(max_r, r)
+            min_c, max_c = min(min_c, c), max(max_c, c)
+            for nr in range(max(r - 1, 0), min(r + 2, rows)):
+                for nc in range(max(c - 1, 0), min(c + 2, cols)):
+                    if mask[nr, nc] and not visited[nr, nc]:
+                        visited[nr, nc] = True
+                        stack.append((nr, nc))
+
+        rects.append(clip_rect((
+            min_c * tile_size - padding,
+            min_r * tile_size - padding,
+            (max_c + 1) * tile_size + padding,
+            (max_r + 1) * tile_size + padding
+        ), frame_width, frame_height))
+
+    return merge_rects(rects)
+
+
+def clip_rect(rect, frame_width, frame_height):
+    x1, y1, x2, y2 = rect
+    return (max(0, int(x1)), max(0, int(y1)), min(frame_width, int(x2)), min(frame_height, int(y2)))
+
+
+def rects_intersect(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def union_rect(a, b):
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def merge_rects(rects):
+    """겹치는 사각형들을 더 이상 겹치지 않을 때까지 합침"""
+    rects = list(rects)
+    merged = True
+    while merged:
+        merged = False
+        result = []
+        for rect in rects:
+            for i, other in enumerate(result):
+                if rects_intersect(rect, other):
+                    result[i] = union_rect(rect, other)
+                    merged = True
+                    break
+            else:
+                result.append(rect)
+        rects = result
+    return rects
+
+
+def bbox_rect(bbox):
+    """[[x, y], ...] 형태의 bbox를 (x1, y1, x2, y2)로 변환"""
+    xs = [point[0] for point in bbox]
+    ys = [point[1] for point in bbox]
+    return (min(xs), min(ys), max(xs) + 1, max(ys) + 1)
+
+
+class IncrementalOCR:
+    """이전 캡처와 비교해 변경된 영역만 다시 OCR하는 처리기"""
+
+    def __init__(self, tile_size=32, pixel_tolerance=24, padding=8, max_dirty_ratio=0.5):
+        self.tile_size = tile_size
+        self.pixel_tolerance = pixel_tolerance
+        self.padding = padding
+        self.max_dirty_ratio = max_dirty_ratio  # 변경 영역이 이 비율을 넘으면 전체 OCR
+
+    def process(self, ocr_worker, frame, image_bytes, previous_frame=None, previous_results=None,
+                language_list=None):
+        """
+        프레임의 텍스트 인식 (가능하면 변경된 영역만)
+
+        Args:
+            ocr_worker: process_frame/process_frames(..., raise_errors)를 제공하는 OCR 워커 (자른 영역은 워커의 인코더로 인코딩해 한 번에 요청)
+            frame (np.ndarray): 현재 프레임 (H, W, 3)
+            image_bytes (bytes): 전체 OCR 시 사용할 인코딩된 현재 프레임
+            previous_frame (np.ndarray): 이전에 OCR한 프레임
+            previous_results (OCRResultSet): 이전 프레임의 OCR 결과
+            language_list (list): 이번 요청의 언어 힌트
+
+        Returns:
+            tuple: (OCRResultSet, 처리 통계 딕셔너리)
+
+        Raises:
+            Exception: OCR 요청이 실패했을 때 (실패를 빈 결과로 바꾸면 다음 프레임의 기준이 잘못되므로 전달)
+        """
+        height, width = frame.shape[:2]
+        full_stats = {'mode': 'full', 'dirty_ratio': 1.0, 'uploaded_pixels': width * height}
+
+        if previous_frame is None or previous_results is None or previous_frame.shape != frame.shape:
+            return ocr_worker.process_frame(frame, image_bytes, language_list, raise_errors=True), full_stats
+
+        previous_results = OCRResultSet.from_objects(previous_results)
+        mask = find_dirty_tiles(previous_frame, frame, self.tile_size, self.pixel_tolerance)
+        if not mask.any():
+            return previous_results[:], {'mode': 'unchanged', 'dirty_ratio': 0.0, 'uploaded_pixels': 0}
+
+        rects = tiles_to_rects(mask, self.tile_size, self.padding, width, height)
+
+        # 변경 영역에 걸친 기존 텍스트 상자는 통째로 다시 인식하도록 영역 확장
+        previous_rects = [tuple(rect) for rect in previous_results.extents().tolist()]
+        rects = self._expand_to_boxes(rects, previous_rects, width, height)
+
+        dirty_pixels = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in rects)
+        dirty_ratio = dirty_pixels / float(width * height)
+        if dirty_ratio > self.max_dirty_ratio:
+            full_stats['dirty_ratio'] = dirty_ratio
+            return ocr_worker.process_frame(frame, image_bytes, language_list, raise_errors=True), full_stats
+
+        # 변경 영역과 겹치지 않는 기존 결과는 그대로 유지
+        parts = [previous_results[~previous_results.intersects_any(rects)]]
+
+        # 변경 영역만 잘라서 한 번의 요청으로 OCR 후 좌표를 프레임 기준으로 이동
+        crops = [np.ascontiguousarray(frame[y1:y2, x1:x2]) for x1, y1, x2, y2 in rects]
+        crop_results = ocr_worker.process_frames(crops, language_list, raise_errors=True)
+        for (x1, y1, _, _), result in zip(rects, crop_results):
+            parts.append(OCRResultSet.from_objects(result).offset(x1, y1))
+
+        # 읽기 순서(위→아래, 왼→오른쪽)로 정렬
+        results = OCRResultSet.concat(parts).reading_order()
+        return results, {'mode': 'incremental', 'dirty_ratio': dirty_ratio, 'uploaded_pixels': dirty_pixels}
+
+    def _expand_to_boxes(self, rects, box_rects, width, height):
+        """기존 텍스트 상자와 겹치는 변경 영역을 상자를 포함하도록 확장 (더 이상 변하지 않을 때까지)"""
+        changed = True
+        while changed:
+            changed = False
+            expanded = []
+            for rect in rects:
+                for box in box_rects:
+                    if rects_intersect(rect, box):
+                        grown = clip_rect(union_rect(rect, (box[0] - self.padding, box[1] - self.padding,
+                                                            box[2] + self.padding, box[3] + self.padding)),
+                                          width, height)
+                        if grown != rect:
+                            rect = grown
+                            changed = True
+                expanded.append(rect)
+            rects = merge_rects(expanded)
+        return rects
@@ -0,0 +1,89 @@
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+
+class FrameScheduler(QObject):
+    """
+    실시간 번역 모드의 캡처 스케줄러
+
+    파이프라인이 처리 중이면 프레임을 쌓지 않고 건너뛰며,
+    화면이 바뀌지 않으면 간격을 늘리고(backoff), 바뀌면 처리 지연에 맞춰 다시 줄입니다.
+    """
+
+    # 시그널 정의
+    frame_requested = Signal()          # 지금 캡처해서 파이프라인에 넣을 시점
+    interval_changed = Signal(int)      # 현재 캡처 간격 (ms)
+
+    def __init__(self, min_interval_ms=300, max_interval_ms=3000, backoff=1.5,
+                 latency_factor=1.2, busy_timeout_ms=15000, parent=None):
+        super().__init__(parent)
+        self.min_interval_ms = min_interval_ms
+        self.max_interval_ms = max_interval_ms
+        self.backoff = backoff                  # 변경이 없을 때 간격에 곱하는 배수
+        self.latency_factor = latency_factor    # 처리 지연 대비 최소 간격 배수
+        self.busy_timeout_ms = busy_timeout_ms  # 결과가 오지 않을 때 대기 해제 시간
+
+        self.interval_ms = min_interval_ms
+        self.frames_requested = 0
+        self.frames_dropped = 0
+
+        self._busy_since = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_tick)
+
+    def start(self):
+        """실시간 모드 시작 (즉시 첫 프레임 요청)"""
+        self.interval_ms = self.min_interval_ms
+        self._busy_since = None
+        self._timer.start(0)
+
+    def stop(self):
+        """실시간 모드 중지"""
+        self._timer.stop()
+        self._busy_since = None
+
+    def is_running(self):
+        return self._timer.isActive() or self._busy_since is not None
+
+    def frame_finished(self, latency_seconds, changed):
+        """
+        파이프라인이 요청한 프레임 처리를 마쳤을 때 호출
+
+        Args:
+            latency_seconds (float): 캡처부터 결과까지 걸린 시간
+            changed (bool): 이전 프레임 대비 화면이 바뀌었는지 여부
+        """
+        if self._busy_since is None:
+            return
+        self._busy_since = None
+
+        if changed:
+            # 변경 있음: 처리 지연이 허용하는 만큼 빠르게
+            interval = max(self.min_interval_ms, latency_seconds * 1000 * self.latency_factor)
+        else:
+            # 변경 없음: 점점 느리게
+            interval = self.interval_ms * self.backoff
+        self._set_interval(interval)
+
+        # 다음 프레임은 처리가 끝난 시점부터 새 간격 후에 요청
+        if self._timer.isActive():
+            self._timer.start(self.interval_ms)
+
+    def _on_tick(self):
+        now = time.monotonic()
+        if self._busy_since is not None and (now - self._busy_since) * 1000 < self.busy_timeout_ms:
+            # 이전 프레임이 아직 처리 중이면 큐에 쌓지 않고 이번 프레임은 버림
+            self.frames_dropped += 1
+        else:
+            self._busy_since = now
+            self.frames_requested += 1
+            self.frame_requested.emit()
+        self._timer.start(self.interval_ms)
+
+    def _set_interval(self, interval):
+        interval = int(min(self.max_interval_ms, max(self.min_interval_ms, interval)))
+        if interval != self.interval_ms:
+            self.interval_ms = interval
+            self.interval_changed.emit(interval)
@@ -1,19 +1,41 @@
+import time
+
+STARTED_AT = time.perf_counter()    # 시작 시간 측정 기준 (모듈 import 전)
+
+import os
 import sys
 import atexit
+import json
+import threading
+from dotenv import load_dotenv
 from PySide6.QtWidgets import QApplication
-from qt_material import apply_stylesheet
+from PySide6.QtCore import QEvent, QTimer, Signal
 from capture_frame import MainFrame
+from capture_regions import RegionFrame, load_regions
 from control_widget import ControlWidget
-from ocr_worker import OCRWorker
-from image_viewer import ImageViewer
-from translate_worker import TranslateWorker
+from image_encoders import encoded_size
+from live_scheduler import FrameScheduler
+from metrics import MetricsRegistry
+from translation_cache import TranslationCache
+# OCR 엔진, HTTP/번역, 이미지 뷰어 모듈은 첫 화면을 그린 뒤에 불러옴 (start_services, create_ocr_worker)
+
+IMPORTED_AT = time.perf_counter()
 
 
 class ScreenTranslatorApp(QApplication):
     """메인 애플리케이션 클래스"""
     
+    # 번역 서버 성능 저하 모드 변경 (HTTP 스레드에서 발생 → GUI 스레드로 전달)
+    translation_degraded = Signal(bool)
+    # 백그라운드 미리 준비 완료 (준비 스레드에서 발생 → GUI 스레드로 전달)
+    prewarm_finished = Signal()
+    
     def __init__(self, argv):
         super().__init__(argv)
+        # 시작 단계별 시간 (ms, 프로세스의 main.py 실행 시작 기준)
+        self.startup_timings = {'imports_ms': (IMPORTED_AT - STARTED_AT) * 1000.0}
+        self.startup_benchmark = os.getenv("STARTUP_BENCHMARK") == "1"
+        self.pipeline = None
         
         # 윈도우들 생성
         self.main_frame = MainFrame()
@@ -22,23 +44,127 @@ class ScreenTranslatorApp(QApplication):
         # control_widget에서 main_frame에 접근할 수 있도록 참조 설정
         self.control_widget.main_frame = self.main_frame
         
-        # OCR Worker 초기화 (기본 언어로 초기화, 나중에 동적으로 변경)
-        self.ocr_worker = None
+        # 다중 캡처 영역 (CAPTURE_REGIONS JSON이 있으면 빨간 프레임 대신 영역들을 한 번에 캡처)
+        self.region_frame = self.create_region_frame()
+        self.capture_frame = self.region_frame or self.main_frame
         
-        # 시그널 연결
-        self.control_widget.capture_requested.connect(self.handle_capture_request)
+        # 윈도우 사이 시그널 연결
         self.control_widget.toggle_interactive.connect(self.main_frame.set_interactive_state)
         self.control_widget.color_mod_request.connect(self.main_frame.set_frame_color)
         self.main_frame.deactivate_requested.connect(self.handle_deactivate_request)
-        # 윈도우들 표시
-        self.main_frame.show()
+        self.prewarm_finished.connect(self.on_prewarm_finished)
+        
+        # 윈도우들 표시 (나머지 서비스는 컨트롤 위젯이 처음 그려진 뒤 start_services에서 준비)
+        self.control_widget.installEventFilter(self)
+        if self.region_frame is not None:
+            self.main_frame.hide()
+            self.region_frame.show()
+        else:
+            self.main_frame.show()
         self.control_widget.show()
+        self.startup_timings['windows_ms'] = (time.perf_counter() - STARTED_AT) * 1000.0
+    
+    def eventFilter(self, watched, event):
+        """컨트롤 위젯의 첫 그리기를 감지해 서비스 준비 시작"""
+        if watched is self.control_widget and event.type() == QEvent.Type.Paint:
+            self.control_widget.removeEventFilter(self)
+            self.startup_timings['first_frame_ms'] = (time.perf_counter() - STARTED_AT) * 1000.0
+            # 이번 그리기가 화면에 반영된 뒤 실행
+            QTimer.singleShot(0, self.start_services)
+        return super().eventFilter(watched, event)
+    
+    def start_services(self):
+        """OCR/번역 파이프라인 준비 (첫 화면 이후 GUI 스레드에서 한 번 실행)"""
+        from async_translator import AsyncTranslationEngine
+        from connection_warmer import ConnectionWarmer
+        from frame_diff import FrameChangeDetector
+        from http_client import HttpClient, CircuitBreaker
+        from incremental_ocr import IncrementalOCR
+        from pipeline import CapturePipeline
+        from translate_worker import TranslateWorker
+        
+        # OCR/번역 백그라운드 파이프라인 (OCR Worker는 OCR 스레드에서 필요할 때 생성)
+        api_key = self.load_api_key()
+        self.translation_cache = self.create_translation_cache()
+        self.metrics = self.create_metrics()
+        change_detector = FrameChangeDetector(change_threshold=float(os.getenv("CHANGE_THRESHOLD", "0.0")))
+        self.ocr_backend = None
+        self.http_client = HttpClient(
+            pool_size=int(os.getenv("HTTP_POOL_SIZE", "10")),
+            timeout=(3.05, float(os.getenv("HTTP_TIMEOUT", "10"))),
+            max_retries=int(os.getenv("HTTP_MAX_RETRIES", "3")),
+            breaker=CircuitBreaker(on_state_change=self.translation_degraded.emit)
+        )
+        translate_worker = TranslateWorker(api_key, self.translation_cache, self.http_client)
+        self.translation_engine = AsyncTranslationEngine(
+            translate_worker,
+            max_in_flight=int(os.getenv("TRANSLATE_MAX_IN_FLIGHT", "4")),
+            requests_per_second=float(os.getenv("TRANSLATE_REQUESTS_PER_SECOND", "10")),
+            chars_per_minute=int(os.getenv("TRANSLATE_CHARS_PER_MINUTE", "0")) or None
+        )
+        self.pipeline = CapturePipeline(self.create_ocr_worker, translate_worker,
+                                        change_detector, IncrementalOCR(), self.translation_engine)
+        self.pipeline.ocr_finished.connect(self.on_ocr_finished)
+        self.pipeline.translation_progress.connect(self.on_translation_progress)
+        self.pipeline.translation_finished.connect(self.on_translation_finished)
+        self.pipeline.job_failed.connect(self.on_job_failed)
+        self.pipeline.job_finished.connect(self.on_job_finished)
+        
+        # 실시간 번역 모드 스케줄러
+        self.frame_scheduler = FrameScheduler(
+            min_interval_ms=int(os.getenv("LIVE_MIN_INTERVAL_MS", "300")),
+            max_interval_ms=int(os.getenv("LIVE_MAX_INTERVAL_MS", "3000"))
+        )
+        self.frame_scheduler.frame_requested.connect(self.capture_live_frame)
+        self.live_job = None
+        self.image_viewer = None
+        # 결과는 캡처 영역 위 오버레이로 표시 (SHOW_OCR_VIEWER=1이면 이미지 뷰어 창도 열기)
+        self.show_ocr_viewer = os.getenv("SHOW_OCR_VIEWER") == "1"
+        
+        # 시그널 연결
+        self.control_widget.capture_requested.connect(self.handle_capture_request)
+        self.control_widget.live_mode_toggled.connect(self.handle_live_mode_toggled)
+        self.translation_degraded.connect(self.control_widget.set_translation_degraded)
         
         # 앱 종료 시 임시 파일 정리 등록
         atexit.register(self.cleanup_on_exit)
+        self.startup_timings['services_ms'] = (time.perf_counter() - STARTED_AT) * 1000.0
+        
+        # 첫 캡처가 느리지 않도록 OCR/번역 연결과 오버레이 글꼴을 백그라운드에서 준비
+        # (오래 쉬었거나 네트워크가 바뀌면 연결을 다시 준비)
+        self.connection_warmer = ConnectionWarmer(
+            self.pipeline, translate_worker,
+            connections=self.translation_engine.max_in_flight,
+            idle_interval_ms=int(os.getenv("WARMUP_IDLE_INTERVAL_MS", "240000")),
+            keepalive_ms=int(os.getenv("WARMUP_KEEPALIVE_MS", "1800000"))
+        )
+        self.control_widget.languages_changed.connect(self.connection_warmer.set_languages)
+        self.connection_warmer.start(self.control_widget.get_selected_languages())
+        threading.Thread(target=self.prewarm, daemon=True).start()
+    
+    def prewarm(self):
+        """백그라운드 준비 (준비 스레드): OCR/번역 연결과 오버레이 글꼴을 준비하고 OCR 엔진 준비가 끝날 때까지 대기"""
+        from font_manager import get_font_manager
+        
+        # OCR 준비는 OCR 스레드에서 진행되고 그동안 이 스레드에서 번역 연결과 글꼴 준비
+        self.connection_warmer.warm(wait=True)
+        # 오버레이 글꼴은 시작할 때 한 번만 탐색
+        font_manager = get_font_manager()
+        print(f"오버레이 글꼴: {font_manager.latin_path}, 한중일: {font_manager.cjk_path}")
+        self.pipeline.ocr_pool.waitForDone()
+        self.startup_timings['warm_ms'] = (time.perf_counter() - STARTED_AT) * 1000.0
+        self.prewarm_finished.emit()
+    
+    def on_prewarm_finished(self):
+        """시작 시간 출력 (STARTUP_BENCHMARK=1이면 기계가 읽을 형식으로 출력하고 종료)"""
+        timings = {name: round(value, 1) for name, value in self.startup_timings.items()}
+        print("시작 시간 (ms): " + ", ".join(f"{name}={value}" for name, value in timings.items()))
+        if self.startup_benchmark:
+            print("STARTUP_TIMINGS " + json.dumps(timings), flush=True)
+            self.quit()
         
     def handle_capture_request(self, language_list):
-        """캡처 요청 처리"""
+        """캡처 요청 처리 (캡처만 GUI 스레드에서 수행하고 나머지는 파이프라인에 위임)"""
         print(f"선택된 언어: {language_list}")
         
         # 캡처 전에 컨트롤 위젯 숨기기
@@ -48,70 +174,198 @@ class ScreenTranslatorApp(QApplication):
         self.processEvents()
         
         # 캡처 실행
-        result = self.main_frame.capture_screen()
-        print(f"캡처 결과: {result}")
+        result = self.capture_frame.capture_screen()
+        print(f"캡처 결과: {result['message']}")
         
         # 캡처 후에 컨트롤 위젯 다시 보이기
         self.control_widget.show()
         
-        # 캡처된 이미지와 언어 리스트를 OCR 처리에 전달
+        # 캡처된 이미지와 언어 리스트를 파이프라인에 전달 (이전 대기 작업은 취소됨)
         if result and isinstance(result, dict) and result.get('success'):
-            print(f"OCR 처리 시작: 이미지={result['temp_file_path']}, 언어={language_list}")
-            ocr_objects = self.process_ocr(result['temp_file_path'], language_list)
-            translated_texts = self.process_translate(ocr_objects, language_list)
+            target_language = self.control_widget.get_target_language()
+            language_list = self.ocr_languages(language_list)
+            print(f"OCR 처리 시작: 이미지={encoded_size(result['image_bytes'])} bytes, 언어={language_list}, 번역={target_language}")
+            self.pipeline.submit(result, language_list, target_language)
     
-    def process_ocr(self, image_path, language_list):
-        """OCR 처리"""
-        try:
-            # 언어 리스트가 변경되었거나 OCR Worker가 없으면 새로 생성
-            if self.ocr_worker is None or self.ocr_worker.language_list != language_list:
-                print(f"OCR Worker 초기화 중... 언어: {language_list}")
-                self.ocr_worker = OCRWorker(language_list)
-            
-            # OCR 처리 실행
-            print("OCR 처리 중...")
-            result = self.ocr_worker.process_image(image_path)
-            
-            # 결과 출력
-            print("=== OCR 결과 ===")
-            for i, obj in enumerate(result):
-                print(f"{i+1}. 텍스트: '{obj.text}' (신뢰도: {obj.confidence:.2f})")
-                print(f"   위치: {obj.bbox}")
-                print()
+    def handle_live_mode_toggled(self, enabled):
+        """실시간 번역 모드 시작/중지"""
+        if enabled:
+            print("실시간 번역 시작")
+            self.frame_scheduler.start()
+        else:
+            self.frame_scheduler.stop()
+            self.live_job = None
+            self.capture_frame.translation_overlay.clear(fade=True)
+            print(f"실시간 번역 중지 (요청 {self.frame_scheduler.frames_requested}, "
+                  f"건너뜀 {self.frame_scheduler.frames_dropped})")
+    
+    def capture_live_frame(self):
+        """스케줄러가 요청한 실시간 프레임 캡처"""
+        # 컨트롤 위젯이 캡처 영역을 가릴 때만 숨김 (매 프레임 깜빡임 방지)
+        overlaps = (self.control_widget.isVisible()
+                    and self.control_widget.frameGeometry().intersects(self.capture_frame.geometry()))
+        if overlaps:
+            self.control_widget.hide()
+            self.processEvents()
+        
+        result = self.capture_frame.capture_screen()
+        
+        if overlaps:
+            self.control_widget.show()
+        
+        if not result.get('success'):
+            print(f"캡처 결과: {result['message']}")
+            self.frame_scheduler.frame_finished(0.0, changed=False)
+            return
+        
+        self.live_job = self.pipeline.submit(
+            result,
+            self.ocr_languages(self.control_widget.get_selected_languages()),
+            self.control_widget.get_target_language()
+        )
+    
+    def on_job_finished(self, job):
+        """작업 종료 시 단계별 기록을 집계하고 실시간 스케줄러에 처리 지연과 변경 여부 전달"""
+        self.metrics.record_trace(job.trace)
+        self.connection_warmer.touch()
+        self.control_widget.set_metrics_summary(job.trace.summary())
+        
+        if job is not self.live_job:
+            return
+        self.live_job = None
+        changed = not job.reused and (job.ocr_stats or {}).get('mode') != 'unchanged'
+        self.frame_scheduler.frame_finished(job.elapsed(), changed)
+    
+    def on_ocr_finished(self, job):
+        """OCR 결과 처리 (GUI 스레드)"""
+        result = job.ocr_results or []
+        
+        # 캡처 영역 위 오버레이 갱신 (바뀐 상자만 다시 그림, 재사용한 결과는 대부분 그대로 유지)
+        image = job.capture['image']
+        with job.trace.span('draw'):
+            self.capture_frame.show_translations(result, (image.width(), image.height()), live=job is self.live_job)
+        
+        # 결과 출력
+        if job.reused:
+            print(f"화면 변경 없음: 이전 결과 재사용 (작업 {job.job_id})")
+            return
+        
+        print(f"=== OCR 결과 (작업 {job.job_id}, {job.elapsed():.2f}초, {job.ocr_stats}) ===")
+        for i, obj in enumerate(result):
+            print(f"{i+1}. 텍스트: '{obj.text}' (신뢰도: {obj.confidence:.2f})")
+            print(f"   위치: {obj.bbox}")
+            print()
+        
+        # 추출된 텍스트만 따로 출력
+        extracted_texts = [obj.text for obj in result]
+        if extracted_texts:
+            print("=== 추출된 텍스트 ===")
+            for text in extracted_texts:
+                print(text)
             
-            # 추출된 텍스트만 따로 출력
-            extracted_texts = [obj.text for obj in result]
-            if extracted_texts:
-                print("=== 추출된 텍스트 ===")
-                for text in extracted_texts:
-                    print(text)
-                
-                # 이미지 뷰어 열기
-                self.open_image_viewer(image_path, result)
-            else:
-                print("텍스트를 찾을 수 없습니다.")
-            return result
-                
-        except Exception as e:
-            print(f"OCR 처리 중 오류 발생: {e}")
+            # 이미지 뷰어 열기 (설정한 경우에만)
+            if self.show_ocr_viewer:
+                with job.trace.span('draw'):
+                    self.open_image_viewer(image, result)
+        else:
+            print("텍스트를 찾을 수 없습니다.")
+    
+    def on_translation_progress(self, job, index):
+        """문단 하나의 번역 도착 (GUI 스레드)"""
+        obj = job.ocr_results[index]
+        print(f"[{index + 1}/{len(job.ocr_results)}] {obj.text} -> {obj.translated_text}")
+        with job.trace.span('draw'):
+            self.capture_frame.update_translations([obj])
     
-    def open_image_viewer(self, image_path, ocr_results):
-        """이미지 뷰어 창 열기"""
+    def on_translation_finished(self, job):
+        """번역 결과 처리 (GUI 스레드)"""
+        print(f"=== 번역 결과 (작업 {job.job_id}, {job.elapsed():.2f}초) ===")
+        for translation in job.translations or []:
+            print(translation)
+        
+        # 점진적 표시 없이 한 번에 번역된 경우에도 오버레이 반영 (이미 반영된 상자는 건너뜀)
+        if not job.reused:
+            with job.trace.span('draw'):
+                self.capture_frame.update_translations(job.ocr_results or [])
+    
+    def on_job_failed(self, job, message):
+        """파이프라인 오류 처리"""
+        print(f"캡처 작업 {job.job_id} 처리 중 오류 발생: {message}")
+    
+    def open_image_viewer(self, image, ocr_results):
+        """이미지 뷰어 창 열기 (이미 열려 있으면 내용만 갱신)"""
+        from image_viewer import ImageViewer
+        
         try:
-            self.image_viewer = ImageViewer(image_path, ocr_results)
+            if self.image_viewer is not None and self.image_viewer.isVisible():
+                self.image_viewer.set_results(image, ocr_results)
+                return
+            self.image_viewer = ImageViewer(image, ocr_results)
             self.image_viewer.show()
         except Exception as e:
             print(f"이미지 뷰어 열기 오류: {e}")
     
-    def process_translate(self, ocr_objects):
-        """번역 처리"""
+    def create_region_frame(self):
+        """CAPTURE_REGIONS(JSON 파일)에 정의된 캡처 영역 창 생성 (없으면 None)"""
+        path = os.getenv("CAPTURE_REGIONS")
+        if not path:
+            return None
         try:
-            self.translate_worker = TranslateWorker(self.api_key)
-            target_language = language_list[0]
-            translated_texts = self.translate_worker.translate_multiple(ocr_objects, language_list,)
-            return translated_texts
-        except Exception as e:
-            print(f"번역 처리 중 오류 발생: {e}")
+            regions = load_regions(path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"캡처 영역을 불러오지 못해 단일 프레임을 사용합니다: {e}")
+            return None
+        print(f"캡처 영역 {len(regions)}개: {', '.join(region.name for region in regions)}")
+        return RegionFrame(regions)
+    
+    def ocr_languages(self, language_list):
+        """OCR 언어 힌트 (다중 영역이면 영역별 언어 포함)"""
+        if self.region_frame is None:
+            return language_list
+        return self.region_frame.ocr_languages(language_list)
+    
+    def create_ocr_worker(self, language_list):
+        """OCR 워커 생성 (OCR 스레드에서 최초 한 번만 호출, 언어는 요청마다 전달)"""
+        # OCR 엔진과 이미지 전처리(OpenCV) 모듈은 무거우므로 OCR 스레드에서 불러옴
+        from ocr_backends import create_backend
+        from ocr_worker import OCRWorker
+        
+        self.ocr_backend = create_backend()
+        print(f"OCR 엔진: {self.ocr_backend.name}")
+        return OCRWorker(language_list, self.ocr_backend)
+    
+    def load_api_key(self):
+        """key.env에서 API 키 읽기"""
+        load_dotenv('key.env')
+        return os.getenv("CLOUD_LOCAL_KEY")
+    
+    def create_translation_cache(self):
+        """
+        번역 캐시 생성 (TRANSLATION_GLOSSARY가 지정되어 있으면 용어집으로 미리 채움)
+        
+        용어집에 목표 언어 열이 없으면 TRANSLATION_GLOSSARY_TARGET(없으면 현재 선택한 번역 언어)을 사용합니다.
+        """
+        cache = TranslationCache()
+        glossary_path = os.getenv("TRANSLATION_GLOSSARY")
+        if glossary_path and os.path.exists(glossary_path):
+            target_language = os.getenv("TRANSLATION_GLOSSARY_TARGET") or self.control_widget.get_target_language()
+            try:
+                count = cache.warm_from_glossary(glossary_path, target_language=target_language)
+                print(f"용어집에서 번역 {count}개를 캐시에 불러왔습니다. (목표 언어 기본값: {target_language})")
+            except ValueError as e:
+                print(f"용어집을 불러오지 못했습니다: {e}")
+        return cache
+    
+    def create_metrics(self):
+        """단계별 메트릭 집계기 생성 (METRICS_TRACE_FILE: JSONL 기록, METRICS_PORT: 로컬 엔드포인트)"""
+        metrics = MetricsRegistry(trace_path=os.getenv("METRICS_TRACE_FILE") or None)
+        port = os.getenv("METRICS_PORT")
+        if port:
+            try:
+                metrics.start_server(int(port))
+            except OSError as e:
+                print(f"메트릭 엔드포인트 시작 실패: {e}")
+        return metrics
     
     def handle_deactivate_request(self):
         """비활성화 요청 처리"""
@@ -127,6 +381,16 @@ class ScreenTranslatorApp(QApplication):
     def cleanup_on_exit(self):
         """앱 종료 시 임시 파일들 정리"""
         print("앱 종료 중... 임시 파일들을 정리합니다.")
+        self.frame_scheduler.stop()
+        self.connection_warmer.stop()
+        self.pipeline.shutdown()
+        if self.ocr_backend is not None:
+            self.ocr_backend.close()
+        self.translation_engine.close()
+        self.http_client.close()
+        print(f"번역 캐시 통계: {self.translation_cache.stats()}")
+        self.translation_cache.close()
+        self.metrics.close()
         if hasattr(self.main_frame, 'cleanup_temp_files'):
             self.main_frame.cleanup_temp_files()
 
@@ -0,0 +1,270 @@
+import bisect
+import contextlib
+import json
+import threading
+import time
+from collections import deque
+
+# 파이프라인 단계 이름 (표시 순서)
+STAGES = ('grab', 'convert', 'fingerprint', 'encode', 'ocr', 'parse', 'translate', 'draw')
+
+# 히스토그램 버킷 상한 (밀리초)
+DEFAULT_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+_active = threading.local()
+
+
+class CaptureTrace:
+    """
+    캡처 한 장이 파이프라인을 지나며 남기는 단계별 기록
+
+    같은 이름의 구간이 여러 번 기록되면(증분 OCR의 영역별 인코딩 등) 시간과 바이트 수를 합산합니다.
+    시간은 time.perf_counter() 기준 단조 시계로 측정합니다.
+    """
+
+    def __init__(self, capture_id=None):
+        self.capture_id = capture_id
+        self.started_at = time.perf_counter()
+        self.wall_time = time.time()
+        self.finished_at = None
+        self.spans = {}       # 이름 -> {'duration', 'count', 추가 속성...}
+        self.attributes = {}  # 캡처 전체 속성 (job_id, reused, 캐시 적중 등)
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, name, **attributes):
+        """with 블록의 실행 시간을 name 구간으로 기록"""
+        start = time.perf_counter()
+        try:
+            yield attributes
+        finally:
+            self.record(name, time.perf_counter() - start, **attributes)
+
+    def record(self, name, duration, **attributes):
+        """이미 측정한 구간 기록 (숫자 속성은 합산, 나머지는 덮어씀)"""
+        with self._lock:
+            span = self.spans.setdefault(name, {'duration': 0.0, 'count': 0})
+            span['duration'] += duration
+            span['count'] += 1
+            for key, value in attributes.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    span[key] = span.get(key, 0) + value
+                else:
+                    span[key] = value
+
+    def annotate(self, **attributes):
+        with self._lock:
+            self.attributes.update(attributes)
+
+    def finish(self):
+        if self.finished_at is None:
+            self.finished_at = time.perf_counter()
+
+    def total(self):
+        """캡처 시작부터 종료(또는 현재)까지 걸린 시간(초)"""
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'capture_id': self.capture_id,
+                'timestamp': self.wall_time,
+                'total_ms': self.total() * 1000.0,
+                'spans': {
+                    name: dict(span, duration_ms=span['duration'] * 1000.0)
+                    for name, span in self.spans.items()
+                },
+                **self.attributes
+            }
+
+    def summary(self):
+        """HUD 표시용 한 줄 요약 (예: '총 812ms · ocr 420 · translate 210')"""
+        parts = [f"총 {self.total() * 1000:.0f}ms"]
+        for name in STAGES:
+            span = self.spans.get(name)
+            if span:
+                parts.append(f"{name} {span['duration'] * 1000:.0f}")
+        return " · ".join(parts)
+
+
+@contextlib.contextmanager
+def activate(trace):
+    """현재 스레드에서 실행되는 코드의 span() 기록 대상을 trace로 지정"""
+    previous = getattr(_active, 'trace', None)
+    _active.trace = trace
+    try:
+        yield trace
+    finally:
+        _active.trace = previous
+
+
+def current_trace():
+    return getattr(_active, 'trace', None)
+
+
+@contextlib.contextmanager
+def span(name, **attributes):
+    """현재 스레드의 활성 trace에 구간 기록 (활성 trace가 없으면 아무것도 하지 않음)"""
+    trace = current_trace()
+    if trace is None:
+        yield attributes
+        return
+    with trace.span(name, **attributes) as span_attributes:
+        yield span_attributes
+
+
+class Histogram:
+    """고정 버킷 지연 시간 히스토그램 (밀리초)"""
+
+    def __init__(self, buckets_ms=DEFAULT_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)  # 마지막 칸은 +Inf
+        self.count = 0
+        self.sum_ms = 0.0
+
+    def observe(self, value_ms):
+        self.counts[bisect.bisect_left(self.buckets_ms, value_ms)] += 1
+        self.count += 1
+        self.sum_ms += value_ms
+
+    def percentile(self, q):
+        """버킷 상한 기준 근사 백분위수 (q: 0~100)"""
+        if not self.count:
+            return 0.0
+        rank = q / 100.0 * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return float(self.buckets_ms[i]) if i < len(self.buckets_ms) else float('inf')
+        return float('inf')
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum_ms': self.sum_ms,
+            'mean_ms': self.sum_ms / self.count if self.count else 0.0,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'buckets': dict(zip([str(b) for b in self.buckets_ms] + ['+Inf'], self.counts)),
+        }
+
+
+class MetricsRegistry:
+    """
+    완료된 CaptureTrace를 모아 단계별 히스토그램과 카운터로 집계
+
+    trace_path를 지정하면 캡처마다 JSONL 한 줄을 기록하고,
+    start_server()로 로컬 HTTP 엔드포인트(/metrics, /metrics.json)를 열 수 있습니다.
+    """
+
+    def __init__(self, trace_path=None, recent_size=100):
+        self.histograms = {}
+        self.counters = {}
+        self.recent = deque(maxlen=recent_size)
+        self.trace_path = trace_path
+        self._trace_file = open(trace_path, 'a', encoding='utf-8') if trace_path else None
+        self._server = None
+        self._lock = threading.Lock()
+
+    def record_trace(self, trace):
+        """완료된 캡처 기록을 집계에 반영"""
+        trace.finish()
+        data = trace.to_dict()
+        with self._lock:
+            self._observe('total', data['total_ms'])
+            for name, span_data in data['spans'].items():
+                self._observe(name, span_data['duration_ms'])
+                if 'bytes' in span_data:
+                    self._increment(f'{name}_bytes', span_data['bytes'])
+            self._increment('captures')
+            for key in ('reused', 'failed', 'cancelled'):
+                if data.get(key):
+                    self._increment(f'captures_{key}')
+            for key in ('cache_hits', 'cache_misses'):
+                if key in data:
+                    self._increment(f'translation_{key}', data[key])
+            self.recent.append(data)
+            if self._trace_file is not None:
+                self._trace_file.write(json.dumps(data, ensure_ascii=False) + '\n')
+                self._trace_file.flush()
+        return data
+
+    def _observe(self, name, value_ms):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = Histogram()
+        histogram.observe(value_ms)
+
+    def _increment(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self):
+        """현재 집계 상태 딕셔너리"""
+        with self._lock:
+            return {
+                'stages': {name: histogram.to_dict() for name, histogram in self.histograms.items()},
+                'counters': dict(self.counters),
+                'last': self.recent[-1] if self.recent else None,
+            }
+
+    def prometheus_text(self):
+        """Prometheus 텍스트 형식으로 변환"""
+        lines = []
+        with self._lock:
+            lines.append('# TYPE screen_translator_stage_ms histogram')
+            for name, histogram in self.histograms.items():
+                cumulative = 0
+                for bucket, bucket_count in zip([str(b) for b in histogram.buckets_ms] + ['+Inf'], histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(f'screen_translator_stage_ms_bucket{{stage="{name}",le="{bucket}"}} {cumulative}')
+                lines.append(f'screen_translator_stage_ms_sum{{stage="{name}"}} {histogram.sum_ms}')
+                lines.append(f'screen_translator_stage_ms_count{{stage="{name}"}} {histogram.count}')
+            for name, value in self.counters.items():
+                lines.append(f'# TYPE screen_translator_{name}_total counter')
+                lines.append(f'screen_translator_{name}_total {value}')
+        return '\n'.join(lines) + '\n'
+
+    def start_server(self, port, host='127.0.0.1'):
+        """로컬 메트릭 엔드포인트 시작 (백그라운드 스레드)"""
+        # 엔드포인트를 켤 때만 필요하므로 시작 시간에 포함되지 않도록 여기서 불러옴
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith('/metrics.json'):
+                    body = json.dumps(registry.snapshot(), ensure_ascii=False).encode('utf-8')
+                    content_type = 'application/json; charset=utf-8'
+                elif self.path.startswith('/metrics'):
+                    body = registry.prometheus_text().encode('utf-8')
+                    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        print(f"메트릭 엔드포인트: http://{host}:{self._server.server_port}/metrics")
+        return self._server.server_port
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        with self._lock:
+            if self._trace_file is not None:
+                self._trace_file.close()
+                self._trace_file = None
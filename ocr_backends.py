@@ -0,0 +1,372 @@
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from metrics import span
+from ocr_layout import DEFAULT_GRANULARITY, check_granularity, parse_text_annotation
+from ocr_text import OCRResultSet
+
+# 앱 내부 언어 코드 -> Vision API 언어 힌트
+VISION_LANGUAGE_CODES = {
+    'ch_sim': 'zh',
+}
+
+# Vision 인식 기능: text = TEXT_DETECTION (화면/짧은 글), document = DOCUMENT_TEXT_DETECTION (긴 문서)
+VISION_FEATURES = ('text', 'document')
+
+# EasyOCR에서 영어하고만 함께 쓸 수 있는 언어
+EASYOCR_EXCLUSIVE_LANGUAGES = ('ch_sim', 'ch_tra', 'ja', 'ko', 'th')
+
+
+class OCRBatchError(Exception):
+    """일괄 인식에서 일부 이미지가 실패 (성공한 이미지의 결과와 이미지별 오류를 함께 전달)"""
+
+    def __init__(self, results, errors):
+        self.results = results  # 이미지별 OCRResultSet (실패한 이미지는 빈 결과)
+        self.errors = errors    # 이미지별 오류 메시지 (성공한 이미지는 None)
+        failed = [error for error in errors if error]
+        super().__init__(f"이미지 {len(failed)}/{len(errors)}개 인식 실패: {failed[0] if failed else ''}")
+
+
+class OCRBackend:
+    """OCR 엔진 인터페이스: 인코딩된 이미지(또는 RGB 배열)를 OCRText 목록으로 변환"""
+
+    name = "base"
+
+    def recognize(self, image, language_list):
+        """
+        이미지에서 텍스트를 인식합니다.
+
+        Args:
+            image: 인코딩된 이미지 bytes (로컬 엔진은 (H, W, 3) RGB 배열도 허용)
+            language_list (list): 앱 내부 언어 코드 목록
+
+        Returns:
+            OCRResultSet: 인식 결과 (열 단위 저장)
+        """
+        raise NotImplementedError
+
+    def recognize_batch(self, images, language_list):
+        """
+        여러 이미지를 인식합니다 (기본 구현은 한 장씩 recognize 호출).
+
+        Returns:
+            list: images와 같은 순서의 OCRResultSet 목록
+
+        Raises:
+            OCRBatchError: 일부 이미지가 실패했을 때 (나머지 이미지의 결과 포함)
+        """
+        results = []
+        errors = []
+        for image in images:
+            try:
+                results.append(self.recognize(image, language_list))
+                errors.append(None)
+            except Exception as e:
+                results.append(OCRResultSet())
+                errors.append(str(e))
+        if any(errors):
+            raise OCRBatchError(results, errors)
+        return results
+
+    def warm(self, language_list):
+        """첫 요청 지연을 줄이기 위해 엔진을 미리 준비 (필요한 엔진만 구현)"""
+
+    def close(self):
+        """엔진 자원 정리"""
+
+
+class VisionClientPool:
+    """
+    여러 워커가 공유하는 Vision 클라이언트 풀
+
+    클라이언트(gRPC 채널)는 처음 필요할 때 한 번만 만들고 계속 재사용하므로
+    언어 변경이나 워커 생성 때 TLS 핸드셰이크가 다시 일어나지 않습니다.
+    """
+
+    def __init__(self, size=1, key_file='key.env', client_factory=None):
+        self.size = max(1, size)
+        self.key_file = key_file
+        self.client_factory = client_factory  # 테스트/벤치마크용 클라이언트 생성 함수
+        self._clients = []
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def get(self):
+        """풀에서 클라이언트 하나를 라운드 로빈으로 반환 (부족하면 생성)"""
+        with self._lock:
+            if len(self._clients) < self.size:
+                self._clients.append(self._create_client())
+                return self._clients[-1]
+            client = self._clients[self._next % len(self._clients)]
+            self._next += 1
+            return client
+
+    def warm(self, connect_timeout=5.0):
+        """
+        풀을 가득 채우고 모든 채널의 연결(DNS/TCP/TLS/HTTP2)을 미리 맺음
+
+        유휴 상태가 되었거나 네트워크 변경으로 끊긴 채널도 다시 연결합니다.
+        """
+        with self._lock:
+            while len(self._clients) < self.size:
+                self._clients.append(self._create_client())
+            clients = list(self._clients)
+        if not connect_timeout:
+            return
+
+        import grpc
+
+        for client in clients:
+            channel = getattr(getattr(client, 'transport', None), 'grpc_channel', None)
+            if channel is None:
+                continue
+            try:
+                grpc.channel_ready_future(channel).result(timeout=connect_timeout)
+            except grpc.FutureTimeoutError:
+                print(f"Vision 연결 준비 시간 초과 ({connect_timeout}초)")
+
+    def _create_client(self):
+        if self.client_factory is not None:
+            return self.client_factory()
+
+        from google.cloud import vision
+        from dotenv import load_dotenv
+
+        load_dotenv(self.key_file)
+        client = vision.ImageAnnotatorClient()
+        client.credentials = os.getenv("CLOUD_LOCAL_KEY")
+        return client
+
+
+_shared_vision_pool = None
+_shared_vision_pool_lock = threading.Lock()
+
+
+def get_shared_vision_pool():
+    """프로세스 전체에서 공유하는 Vision 클라이언트 풀 (VISION_CLIENT_POOL_SIZE로 크기 지정)"""
+    global _shared_vision_pool
+    with _shared_vision_pool_lock:
+        if _shared_vision_pool is None:
+            _shared_vision_pool = VisionClientPool(int(os.getenv("VISION_CLIENT_POOL_SIZE", "1")))
+        return _shared_vision_pool
+
+
+class GoogleVisionBackend(OCRBackend):
+    """
+    Google Cloud Vision batch_annotate_images 기반 OCR (공유 클라이언트 풀 사용)
+
+    granularity로 결과 단위(symbol/word/line/paragraph/block)를 고릅니다
+    (기본값: 환경 변수 OCR_GRANULARITY 또는 'paragraph').
+    feature로 인식 기능(text/document)을 고릅니다 (기본값: 환경 변수 OCR_VISION_FEATURE 또는 'text').
+    recognize_batch는 이미지 여러 장을 요청 하나(최대 MAX_BATCH_IMAGES장)에 담아 보냅니다.
+    """
+
+    name = "vision"
+    MAX_BATCH_IMAGES = 16                   # 동기 batch_annotate_images 한 요청의 최대 이미지 수
+    MAX_BATCH_BYTES = 8 * 1024 * 1024       # 한 요청의 이미지 합계 크기 제한 (요청 크기 제한 여유분)
+
+    def __init__(self, client_pool=None, granularity=None, feature=None):
+        from google.cloud import vision
+
+        self.vision = vision
+        self.client_pool = client_pool or get_shared_vision_pool()
+        self.granularity = check_granularity(granularity or os.getenv("OCR_GRANULARITY", DEFAULT_GRANULARITY))
+        feature = feature or os.getenv("OCR_VISION_FEATURE", "text")
+        if feature not in VISION_FEATURES:
+            raise ValueError(f"알 수 없는 Vision 기능: {feature} (사용 가능: {', '.join(VISION_FEATURES)})")
+        self.feature = vision.Feature(
+            type_=vision.Feature.Type.DOCUMENT_TEXT_DETECTION if feature == 'document'
+            else vision.Feature.Type.TEXT_DETECTION
+        )
+        self._warm_thread = None
+
+    def warm(self, language_list):
+        """
+        언어 힌트는 요청마다 전달되므로 채널만 미리 연결
+
+        연결 대기(최대 connect_timeout)가 OCR 스레드의 실제 캡처를 늦추지 않도록 별도 스레드에서 실행합니다.
+        """
+        if self._warm_thread is not None and self._warm_thread.is_alive():
+            return
+        self._warm_thread = threading.Thread(target=self._warm_channels, daemon=True)
+        self._warm_thread.start()
+
+    def _warm_channels(self):
+        try:
+            self.client_pool.warm()
+        except Exception as e:
+            print(f"Vision 연결 준비 중 오류 발생: {e}")
+
+    def _request(self, image, image_context):
+        if hasattr(image, 'shape'):
+            raise ValueError("Vision API에는 인코딩된 이미지만 보낼 수 있습니다 (raw 인코더는 로컬 엔진 전용)")
+        vision = self.vision
+        return vision.AnnotateImageRequest(image=vision.Image(content=bytes(image)),
+                                           features=[self.feature], image_context=image_context)
+
+    def _image_context(self, language_list):
+        return self.vision.ImageContext(
+            language_hints=[VISION_LANGUAGE_CODES.get(lang, lang) for lang in language_list]
+        )
+
+    def recognize(self, image, language_list):
+        request = self._request(image, self._image_context(language_list))
+        # 업로드와 서버 인식은 한 번의 RPC이므로 함께 측정
+        with span('ocr', bytes=len(request.image.content)):
+            response = self.client_pool.get().batch_annotate_images(requests=[request]).responses[0]
+        if response.error.message:
+            raise Exception(f'{response.error.message}')
+
+        with span('parse'):
+            return parse_text_annotation(response.full_text_annotation, self.granularity)
+
+    def make_batches(self, requests):
+        """요청 제한(이미지 수, 합계 크기)에 맞게 순서를 유지하며 분할"""
+        batches = []
+        batch = []
+        batch_bytes = 0
+        for request in requests:
+            size = len(request.image.content)
+            if batch and (len(batch) >= self.MAX_BATCH_IMAGES or batch_bytes + size > self.MAX_BATCH_BYTES):
+                batches.append(batch)
+                batch = []
+                batch_bytes = 0
+            batch.append(request)
+            batch_bytes += size
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def recognize_batch(self, images, language_list):
+        """
+        여러 이미지를 batch_annotate_images 요청으로 묶어 인식 (인증/RPC 비용을 이미지끼리 나눔)
+
+        이미지별 오류가 있으면 나머지 이미지를 모두 처리한 뒤 OCRBatchError로 알립니다.
+        """
+        image_context = self._image_context(language_list)
+        requests = [self._request(image, image_context) for image in images]
+        results = []
+        errors = []
+        for batch in self.make_batches(requests):
+            with span('ocr', bytes=sum(len(request.image.content) for request in batch), images=len(batch)):
+                responses = self.client_pool.get().batch_annotate_images(requests=batch).responses
+            with span('parse'):
+                for response in responses:
+                    if response.error.message:
+                        results.append(OCRResultSet())
+                        errors.append(response.error.message)
+                    else:
+                        results.append(parse_text_annotation(response.full_text_annotation, self.granularity))
+                        errors.append(None)
+        if any(errors):
+            raise OCRBatchError(results, errors)
+        return results
+
+
+def easyocr_language_set(language_list):
+    """EasyOCR이 함께 로드할 수 있는 언어 조합으로 정리 (CJK/태국어는 영어와만 조합 가능)"""
+    exclusive = [lang for lang in language_list if lang in EASYOCR_EXCLUSIVE_LANGUAGES]
+    if exclusive:
+        if len(exclusive) > 1:
+            print(f"EasyOCR은 {exclusive}를 함께 인식할 수 없어 '{exclusive[0]}'만 사용합니다.")
+        languages = [exclusive[0]] + (['en'] if 'en' in language_list else [])
+    else:
+        languages = list(language_list) or ['en']
+    return tuple(sorted(languages))
+
+
+# --- EasyOCR 워커 프로세스 측 상태 ---
+_easyocr_readers = OrderedDict()   # 언어 조합 -> easyocr.Reader
+_easyocr_max_readers = 3
+_easyocr_model_dir = None
+
+
+def _init_easyocr_process(model_dir, num_threads):
+    """워커 프로세스 초기화 (CPU 스레드 수 제한)"""
+    global _easyocr_model_dir
+    _easyocr_model_dir = model_dir
+    if num_threads:
+        import torch
+        torch.set_num_threads(num_threads)
+
+
+def _get_easyocr_reader(languages):
+    """언어 조합별 Reader를 재사용 (모델은 프로세스에서 한 번만 로드)"""
+    import easyocr
+
+    reader = _easyocr_readers.get(languages)
+    if reader is None:
+        reader = easyocr.Reader(list(languages), gpu=False, verbose=False,
+                                model_storage_directory=_easyocr_model_dir)
+        _easyocr_readers[languages] = reader
+        while len(_easyocr_readers) > _easyocr_max_readers:
+            _easyocr_readers.popitem(last=False)
+    _easyocr_readers.move_to_end(languages)
+    return reader
+
+
+def _easyocr_warm(languages):
+    _get_easyocr_reader(languages)
+    return True
+
+
+def _easyocr_recognize(image, languages):
+    """워커 프로세스에서 실행: (bbox, text, confidence) 튜플 목록 반환"""
+    reader = _get_easyocr_reader(languages)
+    return [
+        ([[int(x), int(y)] for x, y in bbox], text, float(confidence))
+        for bbox, text, confidence in reader.readtext(image)
+    ]
+
+
+class EasyOCRBackend(OCRBackend):
+    """EasyOCR 기반 로컬 CPU OCR (네트워크 없이 별도 워커 프로세스에서 실행)"""
+
+    name = "easyocr"
+
+    def __init__(self, model_dir=None, num_threads=None):
+        # Qt/torch와 fork 충돌을 피하기 위해 spawn으로 워커 프로세스 생성
+        self.executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_easyocr_process,
+            initargs=(model_dir, num_threads)
+        )
+
+    def warm(self, language_list):
+        """해당 언어 조합의 모델을 백그라운드로 미리 로드"""
+        self.executor.submit(_easyocr_warm, easyocr_language_set(language_list))
+
+    def recognize(self, image, language_list):
+        if isinstance(image, (bytearray, memoryview)):
+            image = bytes(image)
+        size = len(image) if isinstance(image, bytes) else getattr(image, 'nbytes', 0)
+        with span('ocr', bytes=size):
+            future = self.executor.submit(_easyocr_recognize, image, easyocr_language_set(language_list))
+            raw_results = future.result()
+        with span('parse'):
+            return OCRResultSet(
+                [bbox for bbox, _, _ in raw_results],
+                [text for _, text, _ in raw_results],
+                [confidence for _, _, confidence in raw_results]
+            )
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+OCR_BACKENDS = {
+    GoogleVisionBackend.name: GoogleVisionBackend,
+    EasyOCRBackend.name: EasyOCRBackend,
+}
+
+
+def create_backend(name=None, **kwargs):
+    """이름으로 OCR 엔진 생성 (기본값: 환경 변수 OCR_BACKEND 또는 'vision')"""
+    name = name or os.getenv("OCR_BACKEND", GoogleVisionBackend.name)
+    if name not in OCR_BACKENDS:
+        raise ValueError(f"알 수 없는 OCR 엔진: {name} (사용 가능: {', '.join(OCR_BACKENDS)})")
+    return OCR_BACKENDS[name](**kwargs)
@@ -1,8 +1,283 @@
+import struct
+
+import numpy as np
+
+
 class OCRText:
-    def __init__(self, text: str, bbox: list, confidence: float):
+    __slots__ = ('text', 'bbox', 'confidence', 'translated_text', 'language')
+
+    def __init__(self, text: str, bbox: list, confidence: float, language: str = None):
         self.text = text              # 인식된 텍스트
         self.bbox = bbox              # [[x1,y1], [x2,y2], [x3,y3], [x4,y4]] 형태
         self.confidence = confidence  # 신뢰도
-    
+        self.translated_text = None   # 번역된 텍스트 (번역 전에는 None)
+        self.language = language      # 감지된 언어 (모르면 None)
+
     def __repr__(self):
-        return f"OCRText(text='{self.text}', bbox={self.bbox}, confidence={self.confidence})"
\ No newline at end of file
+        return f"OCRText(text='{self.text}', bbox={self.bbox}, confidence={self.confidence}, translated_text={self.translated_text!r})"
+
+
+class OCRResultRow:
+    """OCRResultSet의 한 행 (OCRText와 같은 속성으로 열 데이터를 읽고 씀)"""
+
+    __slots__ = ('_results', '_index')
+
+    def __init__(self, results, index):
+        self._results = results
+        self._index = index
+
+    @property
+    def text(self):
+        return self._results.texts[self._index]
+
+    @property
+    def bbox(self):
+        return self._results.boxes[self._index].tolist()
+
+    @bbox.setter
+    def bbox(self, bbox):
+        self._results.boxes[self._index] = np.asarray(bbox, dtype=np.int32).reshape(4, 2)
+
+    @property
+    def confidence(self):
+        return float(self._results.confidences[self._index])
+
+    @property
+    def language(self):
+        return self._results.languages[self._index]
+
+    @property
+    def translated_text(self):
+        return self._results.translated_texts[self._index]
+
+    @translated_text.setter
+    def translated_text(self, text):
+        self._results.translated_texts[self._index] = text
+
+    def __repr__(self):
+        return f"OCRText(text='{self.text}', bbox={self.bbox}, confidence={self.confidence}, translated_text={self.translated_text!r})"
+
+
+def _quad(bbox):
+    """bbox를 4개 꼭짓점으로 통일 (꼭짓점 수가 다르면 외곽 사각형)"""
+    points = np.asarray(bbox, dtype=np.float64).reshape(-1, 2)
+    if len(points) == 4:
+        return points
+    if len(points) == 0:
+        return np.zeros((4, 2))
+    x1, y1 = points.min(axis=0)
+    x2, y2 = points.max(axis=0)
+    return np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]])
+
+
+class OCRResultSet:
+    """
+    OCR 결과를 열 단위로 저장하는 컨테이너
+
+    상자는 (N, 4, 2) int32 배열 하나에, 텍스트/신뢰도/언어/번역문은 각각 병렬 열에 저장합니다.
+    리스트처럼 len(), 인덱싱, 순회를 지원하며 각 행은 OCRText와 같은 속성을 가진
+    OCRResultRow로 반환됩니다 (translated_text, bbox 대입은 열에 그대로 반영).
+    중심점, 외곽 사각형, 넓이, 영역 질의는 배열 연산으로 한 번에 계산합니다.
+    """
+
+    _MAGIC = b'OCR1'
+    _NONE_LENGTH = 0xFFFFFFFF   # 직렬화 시 None 문자열 표시
+
+    def __init__(self, boxes=None, texts=None, confidences=None, languages=None, translated_texts=None):
+        self.texts = list(texts or [])
+        count = len(self.texts)
+        self.boxes = (np.zeros((0, 4, 2), dtype=np.int32) if boxes is None
+                      else np.asarray(boxes, dtype=np.int32).reshape(count, 4, 2))
+        self.confidences = (np.zeros(count, dtype=np.float32) if confidences is None
+                            else np.asarray(confidences, dtype=np.float32).reshape(count))
+        self.languages = list(languages) if languages is not None else [None] * count
+        self.translated_texts = list(translated_texts) if translated_texts is not None else [None] * count
+
+    @classmethod
+    def from_objects(cls, objects):
+        """OCRText(또는 같은 속성을 가진 객체) 목록에서 생성 (이미 OCRResultSet이면 그대로 반환)"""
+        if isinstance(objects, cls):
+            return objects
+        objects = list(objects)
+        results = cls(
+            boxes=np.array([np.rint(_quad(obj.bbox)) for obj in objects], dtype=np.int32).reshape(len(objects), 4, 2),
+            texts=[obj.text for obj in objects],
+            confidences=[obj.confidence for obj in objects],
+            languages=[getattr(obj, 'language', None) for obj in objects]
+        )
+        results.translated_texts = [obj.translated_text for obj in objects]
+        return results
+
+    @classmethod
+    def concat(cls, result_sets):
+        result_sets = [cls.from_objects(results) for results in result_sets]
+        if not result_sets:
+            return cls()
+        return cls(
+            boxes=np.concatenate([results.boxes for results in result_sets]),
+            texts=[text for results in result_sets for text in results.texts],
+            confidences=np.concatenate([results.confidences for results in result_sets]),
+            languages=[lang for results in result_sets for lang in results.languages],
+            translated_texts=[text for results in result_sets for text in results.translated_texts]
+        )
+
+    def append(self, text, bbox, confidence, language=None):
+        """결과 하나 추가 (많이 추가할 때는 열을 모아 한 번에 생성하는 편이 빠름)"""
+        self.boxes = np.concatenate([self.boxes, np.rint(_quad(bbox)).astype(np.int32)[None]])
+        self.texts.append(text)
+        self.confidences = np.append(self.confidences, np.float32(confidence))
+        self.languages.append(language)
+        self.translated_texts.append(None)
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __iter__(self):
+        return (OCRResultRow(self, i) for i in range(len(self.texts)))
+
+    def __getitem__(self, key):
+        """정수는 행, 슬라이스/불리언 마스크/인덱스 배열은 부분 OCRResultSet 반환"""
+        if isinstance(key, (int, np.integer)):
+            index = int(key)
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError('OCRResultSet index out of range')
+            return OCRResultRow(self, index)
+        if isinstance(key, slice):
+            # 슬라이스는 상자/신뢰도 배열을 복사하지 않고 뷰로 공유
+            return OCRResultSet(self.boxes[key], self.texts[key], self.confidences[key],
+                                self.languages[key], self.translated_texts[key])
+        key = np.asarray(key)
+        if key.dtype != bool:
+            # 빈 목록은 float64 배열이 되므로 정수 인덱스로 변환
+            key = key.astype(np.intp)
+        indices = np.arange(len(self))[key]
+        return self.take(indices)
+
+    def take(self, indices):
+        indices = np.asarray(indices, dtype=np.intp)
+        return OCRResultSet(
+            self.boxes[indices],
+            [self.texts[i] for i in indices],
+            self.confidences[indices],
+            [self.languages[i] for i in indices],
+            [self.translated_texts[i] for i in indices]
+        )
+
+    def __repr__(self):
+        return f"OCRResultSet({len(self)} texts)"
+
+    # --- 배열 연산 ---
+
+    def centroids(self):
+        """(N, 2) 상자 중심점"""
+        return self.boxes.mean(axis=1)
+
+    def extents(self):
+        """(N, 4) 외곽 사각형 (x1, y1, x2, y2) - x2, y2는 포함하지 않는 끝 좌표"""
+        if not len(self):
+            return np.zeros((0, 4), dtype=np.int32)
+        return np.concatenate([self.boxes.min(axis=1), self.boxes.max(axis=1) + 1], axis=1)
+
+    def areas(self):
+        """(N,) 사각형 넓이 (신발끈 공식, 기울어진 상자도 정확)"""
+        x = self.boxes[:, :, 0].astype(np.float64)
+        y = self.boxes[:, :, 1].astype(np.float64)
+        return 0.5 * np.abs((x * np.roll(y, -1, axis=1) - np.roll(x, -1, axis=1) * y).sum(axis=1))
+
+    def intersects(self, rect):
+        """(N,) 외곽 사각형이 rect (x1, y1, x2, y2)와 겹치는지 여부"""
+        extents = self.extents()
+        x1, y1, x2, y2 = rect
+        return ((extents[:, 0] < x2) & (x1 < extents[:, 2])
+                & (extents[:, 1] < y2) & (y1 < extents[:, 3]))
+
+    def intersects_any(self, rects):
+        """(N,) 여러 사각형 중 하나라도 겹치는지 여부"""
+        mask = np.zeros(len(self), dtype=bool)
+        for rect in rects:
+            mask |= self.intersects(rect)
+        return mask
+
+    def query(self, rect):
+        """rect와 겹치는 결과만 담은 OCRResultSet"""
+        return self[self.intersects(rect)]
+
+    def at(self, x, y):
+        """점 (x, y)를 포함하는 결과의 인덱스 목록"""
+        extents = self.extents()
+        mask = (extents[:, 0] <= x) & (x < extents[:, 2]) & (extents[:, 1] <= y) & (y < extents[:, 3])
+        return np.flatnonzero(mask).tolist()
+
+    def offset(self, dx, dy):
+        """모든 상자를 (dx, dy)만큼 이동한 새 OCRResultSet"""
+        moved = self[:]
+        moved.boxes = self.boxes + np.array([dx, dy], dtype=np.int32)
+        return moved
+
+    def reading_order(self):
+        """위→아래, 왼→오른쪽 순서로 정렬한 새 OCRResultSet"""
+        extents = self.extents()
+        return self.take(np.lexsort((extents[:, 0], extents[:, 1])))
+
+    # --- 직렬화 ---
+
+    def to_bytes(self):
+        """
+        간결한 이진 형식으로 직렬화
+
+        [매직][개수][상자 int32][신뢰도 float32][텍스트 길이 uint32 x 3N][UTF-8 텍스트]
+        """
+        encoded = [
+            None if value is None else value.encode('utf-8')
+            for column in (self.texts, self.languages, self.translated_texts)
+            for value in column
+        ]
+        lengths = np.array([self._NONE_LENGTH if value is None else len(value) for value in encoded], dtype='<u4')
+        return b''.join([
+            self._MAGIC,
+            struct.pack('<I', len(self)),
+            self.boxes.astype('<i4', copy=False).tobytes(),
+            self.confidences.astype('<f4', copy=False).tobytes(),
+            lengths.tobytes(),
+            b''.join(value for value in encoded if value)
+        ])
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:4] != cls._MAGIC:
+            raise ValueError('OCRResultSet 형식이 아닙니다.')
+        (count,) = struct.unpack_from('<I', data, 4)
+        offset = 8
+        boxes = np.frombuffer(data, dtype='<i4', count=count * 8, offset=offset).reshape(count, 4, 2)
+        offset += count * 32
+        confidences = np.frombuffer(data, dtype='<f4', count=count, offset=offset)
+        offset += count * 4
+        lengths = np.frombuffer(data, dtype='<u4', count=count * 3, offset=offset)
+        offset += count * 12
+
+        values = []
+        for length in lengths.tolist():
+            if length == cls._NONE_LENGTH:
+                values.append(None)
+                continue
+            values.append(data[offset:offset + length].decode('utf-8'))
+            offset += length
+        return cls(boxes.copy(), values[:count], confidences.copy(),
+                   values[count:count * 2], values[count * 2:])
+
+    def to_dict(self):
+        """JSON으로 저장하기 쉬운 열 단위 딕셔너리"""
+        return {
+            'boxes': self.boxes.tolist(),
+            'texts': list(self.texts),
+            'confidences': [round(float(c), 4) for c in self.confidences],
+            'languages': list(self.languages),
+            'translated_texts': list(self.translated_texts),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['boxes'], data['texts'], data['confidences'],
+                   data.get('languages'), data.get('translated_texts'))
@@ -1,66 +1,161 @@
 import io
 import os
-from google.cloud import vision
-from dotenv import load_dotenv
 
-from ocr_text import OCRText
+from frame_buffer import array_to_qimage
+from image_encoders import create_encoder, encoded_size
+from image_preprocess import create_preprocessor
+from metrics import span
+from ocr_backends import OCRBatchError, create_backend
+from ocr_layout import group_sentences
+from ocr_text import OCRResultSet
 
 class OCRWorker: 
-    def __init__(self, language_list):
+    def __init__(self, language_list, backend=None, sentence_grouping=None, preprocessor=None, encoder=None):
         self.language_list = language_list  # 언어 리스트 저장
-        load_dotenv('key.env')
-        self.key = os.getenv("CLOUD_LOCAL_KEY")
-        self.client = vision.ImageAnnotatorClient()
-        self.client.credentials = self.key
+        # OCR 엔진 (지정하지 않으면 OCR_BACKEND 환경 변수로 선택, 기본값 Google Vision)
+        self.backend = backend or create_backend()
+        # 줄 단위 결과를 문장 단위로 묶어 번역 (OCR_GROUP_SENTENCES=1, OCR_GRANULARITY=line과 함께 사용)
+        if sentence_grouping is None:
+            sentence_grouping = os.getenv("OCR_GROUP_SENTENCES", "0") == "1"
+        self.sentence_grouping = sentence_grouping
+        # OCR 전 이미지 전처리 (None이면 OCR_PREPROCESS 환경 변수로 생성, False면 사용 안 함)
+        if preprocessor is None:
+            preprocessor = create_preprocessor()
+        self.preprocessor = preprocessor or None
+        # 프레임을 직접 넘길 때 사용할 업로드 인코더 (지정하지 않으면 CAPTURE_ENCODER 환경 변수)
+        self.encoder = encoder or create_encoder()
 
     def change_language(self, language_list):
-        self.reader.setLanguageList(language_list)
+        self.language_list = language_list
+        self.backend.warm(language_list)
 
-    def process_image(self, image_path):
-        try:
-            # 로컬 파일을 읽어서 Vision API에 전달
-            with io.open(image_path, 'rb') as image_file:
-                content = image_file.read()
+    def process_image(self, image, language_list=None, raise_errors=False):
+        """
+        이미지(인코딩된 bytes, RGB 배열 또는 파일 경로)에서 텍스트 추출
 
-            image = vision.Image(content=content)
+        language_list를 주면 이번 요청에만 해당 언어 힌트를 사용합니다.
+        실패하면 빈 결과를 반환합니다 (raise_errors면 예외 전달).
+        """
+        language_list = language_list or self.language_list
+        try:
+            if isinstance(image, (str, os.PathLike)):
+                # 로컬 파일을 읽어서 OCR 엔진에 전달
+                with io.open(image, 'rb') as image_file:
+                    image = image_file.read()
 
             # 텍스트 감지 수행
-            print(self.language_list)
-            response = self.client.text_detection(
-                image=image,
-                image_context=vision.ImageContext(
-                    language_hints=self.language_list
-                )
-            )
-            texts = response.text_annotations
-
-            if response.error.message:
-                raise Exception(f'{response.error.message}')
-            results = []
-            for page in response.full_text_annotation.pages:
-                for block in page.blocks:
-                    for paragraph in block.paragraphs:
-                        paragraph_text = ""
-                        paragraph_bbox = [[v.x, v.y] for v in paragraph.bounding_box.vertices]
-
-                        for word in paragraph.words:
-                            word_text = "".join([s.text for s in word.symbols])
-                            paragraph_text += word_text + " "
-
-                        paragraph_text = paragraph_text.strip()
-                        confidence = 0.95  # Vision API는 paragraph 단위 confidence 제공 X
-
-                        if paragraph_text:
-                            results.append(OCRText(paragraph_text, paragraph_bbox, confidence))
+            print(language_list)
+            results = self.backend.recognize(image, language_list)
+            if self.sentence_grouping:
+                results = group_sentences(results)
             print(results)
             return results
             
         except Exception as e:
+            if raise_errors:
+                raise
+            print(f"OCR 처리 중 오류 발생: {e}")
+            return OCRResultSet()
+
+    def process_images(self, images, language_list=None, raise_errors=False):
+        """
+        여러 이미지(인코딩된 bytes 또는 파일 경로)를 한 번에 인식 (Vision은 batch_annotate_images 요청으로 묶음)
+
+        Returns:
+            list: images와 같은 순서의 OCRResultSet 목록 (실패한 이미지는 빈 결과)
+
+        Raises:
+            OCRBatchError: raise_errors이고 일부 이미지만 실패했을 때 (성공한 이미지의 결과 포함)
+            Exception: raise_errors이고 요청 전체가 실패했을 때
+        """
+        language_list = language_list or self.language_list
+        images = list(images)
+        batch_error = None
+        try:
+            contents = []
+            for image in images:
+                if isinstance(image, (str, os.PathLike)):
+                    with io.open(image, 'rb') as image_file:
+                        image = image_file.read()
+                contents.append(image)
+
+            try:
+                results = self.backend.recognize_batch(contents, language_list)
+            except OCRBatchError as e:
+                # 일부 이미지만 실패: 성공한 이미지의 결과는 그대로 사용
+                results, batch_error = e.results, e
+            if self.sentence_grouping:
+                results = [group_sentences(result) for result in results]
+
+        except Exception as e:
+            if raise_errors:
+                raise
             print(f"OCR 처리 중 오류 발생: {e}")
-            return []
+            return [OCRResultSet() for _ in images]
+
+        if batch_error is not None:
+            if raise_errors:
+                raise OCRBatchError(results, batch_error.errors)
+            print(f"OCR 처리 중 오류 발생: {batch_error}")
+        return results
+
+    def process_frames(self, frames, language_list=None, raise_errors=False):
+        """여러 RGB 프레임을 전처리/인코딩한 뒤 한 번에 인식 (process_frame의 일괄 버전)"""
+        if self.preprocessor is None:
+            with span('encode') as encode_span:
+                contents = [self.encoder.encode(array_to_qimage(frame)) for frame in frames]
+                encode_span['bytes'] = sum(encoded_size(content) for content in contents)
+            return self.process_images(contents, language_list, raise_errors)
+
+        with span('preprocess'):
+            prepared = [self.preprocessor.prepare(frame) for frame in frames]
+        # 텍스트 후보 영역이 없는 프레임은 요청에서 뺌
+        pending = [item for item in prepared if item is not None]
+        with span('encode') as encode_span:
+            contents = [item.encode(self.encoder) for item in pending]
+            encode_span['bytes'] = sum(encoded_size(content) for content in contents)
+        try:
+            recognized = self.process_images(contents, language_list, raise_errors) if contents else []
+        except OCRBatchError as e:
+            # 이미지별 결과/오류를 요청에서 뺀 프레임까지 포함한 프레임 순서로 되돌림
+            results = iter(e.results)
+            errors = iter(e.errors)
+            raise OCRBatchError(
+                [OCRResultSet() if item is None else item.transform.apply(next(results)) for item in prepared],
+                [None if item is None else next(errors) for item in prepared]
+            )
+        recognized = iter(recognized)
+        return [OCRResultSet() if item is None else item.transform.apply(next(recognized)) for item in prepared]
+
+    def process_frame(self, frame, image_bytes=None, language_list=None, raise_errors=False):
+        """
+        RGB 프레임 (H, W, 3)에서 텍스트 추출
+
+        전처리기가 있으면 전처리한 이미지를 인코딩해 보내고 결과 좌표를 원본 프레임 기준으로 되돌립니다.
+        없으면 image_bytes(없으면 프레임을 self.encoder로 인코딩)를 그대로 사용합니다.
+        """
+        if self.preprocessor is None:
+            if image_bytes is None:
+                with span('encode') as encode_span:
+                    image_bytes = self.encoder.encode(array_to_qimage(frame))
+                    encode_span['bytes'] = encoded_size(image_bytes)
+            return self.process_image(image_bytes, language_list, raise_errors)
+
+        with span('preprocess'):
+            prepared = self.preprocessor.prepare(frame)
+        if prepared is None:
+            # 텍스트 후보 영역이 없으면 OCR 요청을 보내지 않음
+            return OCRResultSet()
+        with span('encode') as encode_span:
+            prepared_bytes = prepared.encode(self.encoder)
+            encode_span['bytes'] = encoded_size(prepared_bytes)
+        return prepared.transform.apply(self.process_image(prepared_bytes, language_list, raise_errors))
+
+    def close(self):
+        self.backend.close()
 
 
 if __name__ == "__main__":
     worker = OCRWorker(['ko', 'en'])
     result = worker.process_image('example.jpg')
-    print(result)
\ No newline at end of file
+    print(result)
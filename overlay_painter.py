@@ -0,0 +1,63 @@
+from collections import OrderedDict
+
+from PySide6.QtCore import QPointF, QRectF
+from PySide6.QtGui import QColor, QImage
+
+from overlay_renderer import BACKGROUND_COLOR, text_mask
+
+_qt_mask_cache = OrderedDict()   # (글꼴, 텍스트) -> Alpha8 QImage
+_QT_MASK_CACHE_SIZE = 4096
+
+
+def qt_text_mask(font, text):
+    """PIL로 래스터화한 글자 마스크를 Alpha8 QImage로 변환해 캐시 (검은 글자로 그려짐)"""
+    key = (font, text)
+    entry = _qt_mask_cache.get(key)
+    if entry is None:
+        mask, left, top = text_mask(font, text)
+        width, height = mask.size
+        image = QImage(mask.tobytes(), width, height, width, QImage.Format.Format_Alpha8).copy()
+        entry = _qt_mask_cache[key] = (image, left, top)
+        if len(_qt_mask_cache) > _QT_MASK_CACHE_SIZE:
+            _qt_mask_cache.popitem(last=False)
+    else:
+        _qt_mask_cache.move_to_end(key)
+    return entry
+
+
+def paint_overlay(painter, items, scale=1.0):
+    """
+    QPainter로 오버레이 배치 결과(layout_overlay)를 그림
+
+    원본 이미지는 건드리지 않고 그 위에 반투명 배경과 글자 마스크만 얹습니다.
+    scale은 이미지 좌표 대비 표시 배율입니다.
+    """
+    background = QColor(*BACKGROUND_COLOR)
+    painter.save()
+    if scale != 1.0:
+        painter.scale(scale, scale)
+    for item in items:
+        _paint_background(painter, item, background)
+    for item in items:
+        _paint_text(painter, item)
+    painter.restore()
+
+
+def paint_item(painter, item, scale=1.0):
+    """상자 하나의 배경과 글자를 그림 (상자별로 투명도가 다른 오버레이용)"""
+    painter.save()
+    if scale != 1.0:
+        painter.scale(scale, scale)
+    _paint_background(painter, item, QColor(*BACKGROUND_COLOR))
+    _paint_text(painter, item)
+    painter.restore()
+
+
+def _paint_background(painter, item, color):
+    x1, y1, x2, y2 = item.background
+    painter.fillRect(QRectF(x1, y1, x2 - x1, y2 - y1), color)
+
+
+def _paint_text(painter, item):
+    mask, left, top = qt_text_mask(item.font, item.text)
+    painter.drawImage(QPointF(round(item.text_x + left), round(item.text_y + top)), mask)
@@ -0,0 +1,141 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from ocr_text import OCRResultSet
+
+# 글꼴 크기 = 상자 높이 * 비율 (FontManager가 허용 범위로 자름)
+FONT_SCALE = 0.8
+BACKGROUND_COLOR = (255, 255, 255, 200)
+TEXT_COLOR = (0, 0, 0, 255)
+
+# (글꼴, 텍스트) -> [텍스트 경계 상자, 래스터화된 글자 마스크(처음 그릴 때 생성)]
+# 글꼴 미리 준비 스레드와 그리기 스레드가 함께 쓰므로 잠금으로 보호 (LRU)
+_text_cache = OrderedDict()
+_text_cache_lock = threading.Lock()
+_TEXT_CACHE_SIZE = 4096
+
+
+class OverlayItem:
+    """상자 하나의 배치 결과 (배경 사각형, 텍스트 위치, 글꼴)"""
+
+    __slots__ = ('text', 'font', 'text_x', 'text_y', 'background')
+
+    def __init__(self, text, font, text_x, text_y, background):
+        self.text = text
+        self.font = font
+        self.text_x = text_x
+        self.text_y = text_y
+        self.background = background    # (x1, y1, x2, y2)
+
+
+def bbox_array(ocr_results):
+    """OCRText 목록의 bbox를 (N, 꼭짓점 수, 2) 배열로 변환 (꼭짓점 수가 다르면 외곽 사각형으로 통일)"""
+    if isinstance(ocr_results, OCRResultSet):
+        return ocr_results.boxes.astype(np.float32)
+    try:
+        return np.asarray([obj.bbox for obj in ocr_results], dtype=np.float32).reshape(len(ocr_results), -1, 2)
+    except ValueError:
+        corners = []
+        for obj in ocr_results:
+            points = np.asarray(obj.bbox, dtype=np.float32)
+            x1, y1 = points.min(axis=0)
+            x2, y2 = points.max(axis=0)
+            corners.append([[x1, y1], [x2, y1], [x2, y2], [x1, y2]])
+        return np.asarray(corners, dtype=np.float32).reshape(len(ocr_results), 4, 2)
+
+
+def _cached_text(font, text):
+    key = (font, text)
+    with _text_cache_lock:
+        entry = _text_cache.get(key)
+        if entry is not None:
+            _text_cache.move_to_end(key)
+            return entry
+
+    # 측정은 잠금 밖에서 (다른 스레드가 먼저 넣었으면 그 항목 사용)
+    entry = [font.getbbox(text), None]
+    with _text_cache_lock:
+        entry = _text_cache.setdefault(key, entry)
+        _text_cache.move_to_end(key)
+        while len(_text_cache) > _TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+    return entry
+
+
+def measure_text(font, text):
+    """텍스트 경계 상자 (글꼴과 텍스트별로 캐시)"""
+    return _cached_text(font, text)[0]
+
+
+def text_mask(font, text):
+    """
+    텍스트를 한 번만 래스터화한 'L' 마스크와 그리기 원점 기준 오프셋 반환
+
+    실시간 모드처럼 같은 문구가 반복되면 FreeType 렌더링 없이 마스크만 붙여 넣습니다.
+    """
+    from PIL import Image, ImageDraw
+
+    entry = _cached_text(font, text)
+    if entry[1] is None:
+        left, top, right, bottom = entry[0]
+        mask = Image.new('L', (max(1, right - left), max(1, bottom - top)), 0)
+        ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font)
+        entry[1] = mask
+    return entry[1], entry[0][0], entry[0][1]
+
+
+def layout_overlay(ocr_results, font_manager=None, padding=4, use_translation=False):
+    """
+    모든 상자의 글꼴, 텍스트 위치, 배경 사각형을 한 번에 계산
+
+    상자 중심, 높이, 글꼴 크기는 NumPy로 한꺼번에 구하고
+    텍스트 크기 측정만 상자별로 수행합니다 (측정 결과는 캐시).
+
+    Returns:
+        list: OverlayItem 목록 (ocr_results 순서)
+    """
+    if not ocr_results:
+        return []
+    if font_manager is None:
+        # 글꼴 관리자(PIL)는 첫 화면 이후 처음 필요할 때 불러옴
+        from font_manager import get_font_manager
+
+        font_manager = get_font_manager()
+
+    boxes = bbox_array(ocr_results)
+    centers = boxes.mean(axis=1)                                  # (N, 2)
+    heights = boxes[:, :, 1].max(axis=1) - boxes[:, :, 1].min(axis=1)
+    font_sizes = heights * FONT_SCALE
+
+    items = []
+    for obj, (center_x, center_y), font_size in zip(ocr_results, centers.tolist(), font_sizes.tolist()):
+        text = (obj.translated_text or obj.text) if use_translation else obj.text
+        font = font_manager.get_font(font_size, text)
+        left, top, right, bottom = measure_text(font, text)
+        text_width = right - left
+        text_height = bottom - top
+
+        # 텍스트 위치 (중심점 기준)
+        text_x = center_x - text_width / 2
+        text_y = center_y - text_height / 2
+        items.append(OverlayItem(text, font, text_x, text_y, (
+            text_x - padding, text_y - padding,
+            text_x + text_width + padding, text_y + text_height + padding
+        )))
+    return items
+
+
+def render_overlay(image, items):
+    """PIL 이미지에 배치 결과를 그림 (배경을 모두 그린 뒤 텍스트를 그려 글자가 가려지지 않음)"""
+    from PIL import ImageDraw
+
+    draw = ImageDraw.Draw(image)
+    for item in items:
+        draw.rectangle(item.background, fill=BACKGROUND_COLOR)
+    text_color = TEXT_COLOR[:len(image.getbands())]
+    for item in items:
+        mask, left, top = text_mask(item.font, item.text)
+        image.paste(text_color, (int(round(item.text_x + left)), int(round(item.text_y + top))), mask)
+    return image
@@ -0,0 +1,344 @@
+import threading
+import time
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+
+from frame_buffer import qimage_to_array
+from frame_diff import FrameChangeDetector
+from metrics import CaptureTrace, activate
+from translate_worker import choose_source_language
+
+
+def same_languages(a, b):
+    """언어 목록 비교 (순서 무관)"""
+    return sorted(a) == sorted(b)
+
+
+class CaptureJob:
+    """파이프라인을 통과하는 캡처 작업 단위"""
+
+    def __init__(self, job_id, capture, language_list, target_language):
+        self.job_id = job_id
+        self.capture = capture                  # capture_screen() 결과 딕셔너리
+        self.language_list = list(language_list)
+        self.target_language = target_language
+        self.fingerprint = capture.get('fingerprint')
+        self.ocr_results = None
+        self.ocr_stats = None                   # 증분 OCR 통계 (mode, dirty_ratio, uploaded_pixels)
+        self.translations = None
+        self.reused = False                     # 이전 결과를 재사용했는지 여부
+        self.finished = False                   # 최종 결과 전달(또는 실패) 여부
+        self.error = None
+        self.created_at = time.monotonic()
+        # 단계별 소요 시간 기록 (캡처 단계에서 만든 기록을 이어서 사용)
+        self.trace = capture.get('trace') or CaptureTrace()
+        self.trace.annotate(job_id=job_id)
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def elapsed(self):
+        """작업 생성 후 경과 시간(초)"""
+        return time.monotonic() - self.created_at
+
+    def succeeded(self):
+        """OCR과 모든 번역이 성공했는지 여부 (같은 화면에 결과를 재사용해도 되는지)"""
+        return (self.error is None and self.ocr_results is not None
+                and all(result is None or result.get('success') for result in self.translations or []))
+
+
+class _StageTask(QRunnable):
+    """하나의 스테이지 함수를 스레드 풀에서 실행하는 작업"""
+
+    def __init__(self, pipeline, stage_fn, job):
+        super().__init__()
+        self.setAutoDelete(True)
+        self.pipeline = pipeline
+        self.stage_fn = stage_fn
+        self.job = job
+
+    def run(self):
+        # 대기열에서 빠져나오는 시점에 취소 여부 확인
+        if not self.pipeline._start_stage(self.job):
+            self.pipeline._finish(self.job)
+            return
+        try:
+            # 스테이지 안에서 호출되는 OCR 엔진 등이 이 작업의 기록에 구간을 남기도록 지정
+            with activate(self.job.trace):
+                self.stage_fn(self.job)
+        except Exception as e:
+            self.job.error = str(e)
+            self.job.trace.annotate(failed=True)
+            self.pipeline.job_failed.emit(self.job, str(e))
+            self.pipeline._finish(self.job)
+
+
+class _WarmTask(QRunnable):
+    """OCR 스레드에서 엔진 준비 작업 실행"""
+
+    def __init__(self, pipeline, language_list):
+        super().__init__()
+        self.setAutoDelete(True)
+        self.pipeline = pipeline
+        self.language_list = list(language_list)
+
+    def run(self):
+        try:
+            self.pipeline._warm(self.language_list)
+        except Exception as e:
+            print(f"OCR 엔진 준비 중 오류 발생: {e}")
+
+
+class CapturePipeline(QObject):
+    """
+    캡처 → OCR → 번역 → 렌더링 단계별 백그라운드 파이프라인
+
+    캡처는 GUI 스레드에서, OCR과 번역은 각각 전용 스레드 풀(스테이지 큐)에서 실행되고
+    결과는 시그널로 GUI 스레드에 전달되어 렌더링됩니다.
+    새 캡처가 들어오면 아직 시작하지 않은 이전 작업은 취소되고,
+    더 최신 결과가 이미 전달된 작업의 결과는 버려집니다.
+    캡처 영역이 바뀌지 않았으면 OCR 없이 이전 결과를 재사용합니다.
+    """
+
+    # 시그널 정의 (GUI 스레드의 슬롯으로 큐잉되어 전달됨)
+    ocr_finished = Signal(object)              # CaptureJob
+    translation_finished = Signal(object)      # CaptureJob
+    translation_progress = Signal(object, int) # CaptureJob, 번역이 도착한 문단 인덱스
+    job_failed = Signal(object, str)           # CaptureJob, 오류 메시지
+    job_finished = Signal(object)              # CaptureJob (완료/재사용/실패/취소 모두 한 번씩)
+
+    def __init__(self, ocr_worker_factory, translate_worker, change_detector=None,
+                 incremental_ocr=None, translation_engine=None, parent=None):
+        super().__init__(parent)
+        self.ocr_worker_factory = ocr_worker_factory
+        self.ocr_worker = None
+        self.translate_worker = translate_worker
+        self.change_detector = change_detector or FrameChangeDetector()
+        self.incremental_ocr = incremental_ocr  # None이면 항상 전체 프레임 OCR
+        self.translation_engine = translation_engine  # None이면 순차 일괄 번역
+        self._last_ocr_job = None               # OCR 스레드 전용: 마지막으로 OCR에 성공한 작업
+
+        # 스테이지별 큐: 각 풀은 스레드 1개로 작업을 순서대로 처리
+        self.ocr_pool = QThreadPool(self)
+        self.ocr_pool.setMaxThreadCount(1)
+        self.translate_pool = QThreadPool(self)
+        self.translate_pool.setMaxThreadCount(1)
+
+        self._lock = threading.Lock()
+        self._next_job_id = 0
+        self._queued_jobs = set()       # 스테이지 큐에서 대기 중인 작업
+        self._last_delivered_id = -1    # 마지막으로 결과를 전달한 작업 ID
+        self._last_submitted_job = None
+        self._last_completed_job = None  # OCR/번역이 모두 성공한 마지막 작업 (재사용 기준)
+
+    def submit(self, capture, language_list, target_language=None):
+        """캡처 결과를 파이프라인에 투입하고 작업 객체 반환"""
+        with self._lock:
+            # 같은 화면을 처리 중인 작업이 있으면 새 작업을 만들지 않음
+            in_flight = self._last_submitted_job
+            if (in_flight is not None and not in_flight.finished
+                    and not in_flight.is_cancelled() and not self._is_stale(in_flight)
+                    and self._can_reuse(in_flight, capture, language_list, target_language)):
+                return in_flight
+
+            job = CaptureJob(self._next_job_id, capture, language_list, target_language)
+            self._next_job_id += 1
+            self._last_submitted_job = job
+
+            # 대기 중인 이전 작업은 더 이상 필요 없으므로 취소
+            for stale_job in self._queued_jobs:
+                stale_job.cancel()
+            self._queued_jobs = set()
+
+            # 화면이 바뀌지 않았으면 마지막 결과 재사용
+            previous = self._last_completed_job
+            reuse = previous is not None and self._can_reuse(previous, capture, language_list, target_language)
+            if reuse:
+                job.ocr_results = previous.ocr_results
+                job.translations = previous.translations
+                job.reused = True
+                job.finished = True
+                job.trace.annotate(reused=True)
+                self._last_delivered_id = job.job_id
+            else:
+                self._queued_jobs.add(job)
+
+        if reuse:
+            # 호출자가 반환된 작업을 기록한 뒤에 결과를 받도록 다음 이벤트 루프에서 전달
+            QTimer.singleShot(0, lambda: self._deliver_reused(job))
+        else:
+            self.ocr_pool.start(_StageTask(self, self._run_ocr, job))
+        return job
+
+    def _deliver_reused(self, job):
+        """재사용한 결과 전달 (submit 다음 이벤트 루프에서 GUI 스레드로)"""
+        self.ocr_finished.emit(job)
+        if job.translations is not None:
+            self.translation_finished.emit(job)
+        self.job_finished.emit(job)
+
+    def _can_reuse(self, previous, capture, language_list, target_language):
+        """이전 작업 결과를 이번 캡처에 그대로 쓸 수 있는지 여부"""
+        return (same_languages(previous.language_list, language_list)
+                and previous.target_language == target_language
+                and previous.capture.get('capture_rect') == capture.get('capture_rect')
+                and self.change_detector.is_unchanged(previous.fingerprint, capture.get('fingerprint')))
+
+    def warm_languages(self, language_list):
+        """언어 선택이 바뀌었을 때 OCR 엔진을 미리 준비 (OCR 스레드에서 실행)"""
+        self.ocr_pool.start(_WarmTask(self, language_list))
+
+    def _warm(self, language_list):
+        if self.ocr_worker is None:
+            self.ocr_worker = self.ocr_worker_factory(language_list)
+        self.ocr_worker.change_language(language_list)
+
+    def cancel_all(self):
+        """대기 중이거나 진행 중인 모든 작업 취소"""
+        with self._lock:
+            for job in self._queued_jobs:
+                job.cancel()
+            self._queued_jobs.clear()
+            self._last_delivered_id = self._next_job_id
+            self._last_completed_job = None
+            self._last_ocr_job = None
+        self.ocr_pool.clear()
+        self.translate_pool.clear()
+
+    def shutdown(self, timeout_ms=3000):
+        """파이프라인 종료 (진행 중인 작업 완료 대기)"""
+        self.cancel_all()
+        self.ocr_pool.waitForDone(timeout_ms)
+        self.translate_pool.waitForDone(timeout_ms)
+
+    def _start_stage(self, job):
+        """스테이지 시작 시 호출: 취소된 작업이면 False"""
+        with self._lock:
+            self._queued_jobs.discard(job)
+            return not job.is_cancelled() and not self._is_stale(job)
+
+    def _enqueue(self, pool, stage_fn, job):
+        with self._lock:
+            cancelled = job.is_cancelled()
+            if not cancelled:
+                self._queued_jobs.add(job)
+        if cancelled:
+            self._finish(job)
+            return
+        pool.start(_StageTask(self, stage_fn, job))
+
+    def _is_stale(self, job):
+        return job.job_id < self._last_delivered_id
+
+    def _deliver(self, signal, job, final):
+        """최신 결과만 GUI로 전달 (버려진 작업은 종료 처리)"""
+        with self._lock:
+            dropped = job.is_cancelled() or self._is_stale(job)
+            if not dropped and final:
+                self._last_delivered_id = job.job_id
+                # 번역이 하나라도 실패한 결과는 재사용하지 않음 (같은 화면이면 다시 시도)
+                if job.succeeded():
+                    self._last_completed_job = job
+        if dropped:
+            self._finish(job)
+            return False
+        signal.emit(job)
+        if final:
+            self._finish(job)
+        return True
+
+    def _finish(self, job):
+        """작업이 파이프라인을 떠날 때 한 번만 job_finished 전달"""
+        with self._lock:
+            if job.finished:
+                return
+            job.finished = True
+        if job.is_cancelled() or self._is_stale(job):
+            job.trace.annotate(cancelled=True)
+        self.job_finished.emit(job)
+
+    def _run_ocr(self, job):
+        """OCR 스테이지 (OCR 스레드에서 실행)"""
+        # OCR Worker는 처음 한 번만 생성 (언어는 요청마다 전달)
+        if self.ocr_worker is None:
+            print(f"OCR Worker 초기화 중... 언어: {job.language_list}")
+            self.ocr_worker = self.ocr_worker_factory(job.language_list)
+
+        if self.incremental_ocr is None:
+            # OCR 실패는 빈 결과가 아니라 작업 실패로 처리 (실패한 결과를 재사용하지 않도록)
+            job.ocr_results = self.ocr_worker.process_frame(
+                qimage_to_array(job.capture['image']), job.capture['image_bytes'], job.language_list,
+                raise_errors=True
+            )
+        else:
+            # 같은 영역의 이전 OCR 결과가 있으면 변경된 타일만 다시 인식
+            previous = self._last_ocr_job
+            if previous is not None and (not same_languages(previous.language_list, job.language_list)
+                                         or previous.capture.get('capture_rect') != job.capture.get('capture_rect')):
+                previous = None
+            job.ocr_results, job.ocr_stats = self.incremental_ocr.process(
+                self.ocr_worker,
+                qimage_to_array(job.capture['image']),
+                job.capture['image_bytes'],
+                qimage_to_array(previous.capture['image']) if previous else None,
+                previous.ocr_results if previous else None,
+                job.language_list
+            )
+        # OCR이 성공한 작업만 다음 증분 OCR의 기준이 됨 (실패하면 위에서 예외로 빠져나감)
+        self._last_ocr_job = job
+        if job.ocr_stats:
+            job.trace.annotate(ocr_mode=job.ocr_stats['mode'], dirty_ratio=job.ocr_stats['dirty_ratio'])
+
+        # 번역할 대상이 없으면 OCR 결과가 최종 결과 (다중 영역은 영역별 번역 언어도 확인)
+        layout = job.capture.get('regions')
+        targets = [job.target_language] + ([region.target_language for region in layout.regions] if layout else [])
+        needs_translation = bool(job.ocr_results) and any(targets)
+        if not self._deliver(self.ocr_finished, job, final=not needs_translation):
+            return
+        if needs_translation:
+            self._enqueue(self.translate_pool, self._run_translate, job)
+
+    def _run_translate(self, job):
+        """번역 스테이지 (번역 스레드에서 실행)"""
+        with job.trace.span('translate', segments=len(job.ocr_results)):
+            layout = job.capture.get('regions')
+            if layout is None:
+                groups = [(job.language_list, job.target_language, None)]
+            else:
+                # 다중 영역: 번역 언어가 같은 영역끼리 한 번에 번역 (행은 OCR 결과에 그대로 반영됨)
+                groups = [group for group in layout.translation_groups(job.ocr_results, job.language_list,
+                                                                        job.target_language) if group[1]]
+            batches = [
+                (job.ocr_results if rows is None else [job.ocr_results[row] for row in rows],
+                 target_language, choose_source_language(language_list, target_language))
+                for language_list, target_language, rows in groups
+            ]
+
+            if self.translation_engine is None:
+                batch_results = [
+                    self.translate_worker.translate_batch(ocr_models, target_language, source_language)
+                    for ocr_models, target_language, source_language in batches
+                ]
+            else:
+                # 배치를 동시에 요청하고 문단별 번역이 도착하는 대로 GUI에 알림
+                def on_result(batch_index, index, result):
+                    rows = groups[batch_index][2]
+                    if not job.is_cancelled() and not self._is_stale(job):
+                        self.translation_progress.emit(job, index if rows is None else rows[index])
+
+                batch_results = self.translation_engine.translate_captures(batches, on_result)
+
+            if layout is None:
+                job.translations = batch_results[0]
+            else:
+                job.translations = [None] * len(job.ocr_results)
+                for (_, _, rows), results in zip(groups, batch_results):
+                    for row, result in zip(rows, results):
+                        job.translations[row] = result
+        cache_hits = sum(1 for result in job.translations if result and result.get('cached'))
+        job.trace.annotate(cache_hits=cache_hits, cache_misses=len(job.translations) - cache_hits)
+        self._deliver(self.translation_finished, job, final=True)
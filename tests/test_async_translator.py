@@ -0,0 +1,106 @@
+import asyncio
+import time
+
+import pytest
+
+import async_translator
+from async_translator import AsyncTranslationEngine, RateLimiter
+from conftest import make_box
+from ocr_text import OCRText
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(async_translator.time, 'monotonic', clock.monotonic)
+    return clock
+
+
+def test_rate_limiter_reserves_in_order(clock):
+    limiter = RateLimiter(requests_per_second=2)
+    # 버킷(2개)을 다 쓰면 다음 요청부터 0.5초씩 더 기다림
+    assert [limiter.reserve(10) for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    clock.now += 1.0
+    assert limiter.reserve(10) == pytest.approx(0.5)
+
+
+def test_rate_limiter_limits_characters(clock):
+    limiter = RateLimiter(chars_per_minute=600)
+    assert limiter.reserve(600) == 0.0
+    # 버킷보다 큰 요청은 버킷이 가득 찰 때까지 기다림
+    assert limiter.reserve(6000) == pytest.approx(60.0)
+
+
+def test_rate_limiter_without_limits():
+    limiter = RateLimiter()
+    assert [limiter.reserve(1000) for _ in range(3)] == [0.0, 0.0, 0.0]
+
+
+def test_rate_limiter_works_across_event_loops():
+    limiter = RateLimiter(requests_per_second=100)
+
+    async def burst():
+        await asyncio.gather(*[limiter.acquire(1) for _ in range(110)])
+
+    # asyncio.run은 호출마다 새 이벤트 루프를 만듦 (제한에 걸려 기다리는 요청이 있는 상태로 두 번)
+    for _ in range(2):
+        asyncio.run(burst())
+
+
+class FakeTranslateWorker:
+    def __init__(self):
+        self.batches = []
+
+    def lookup_cached(self, texts, target_language, source_language=None):
+        pending = {}
+        for i, text in enumerate(texts):
+            pending.setdefault(text, []).append(i)
+        return [None] * len(texts), pending
+
+    def make_batches(self, texts, max_segments=None):
+        return [texts[i:i + max_segments] for i in range(0, len(texts), max_segments)]
+
+    def translate_segments(self, texts, target_language, source_language=None):
+        self.batches.append(list(texts))
+        return [{'success': True, 'translated_text': text.upper(), 'detected_language': 'en',
+                 'original_text': text} for text in texts]
+
+    def store_translations(self, translated, target_language, source_language=None):
+        pass
+
+
+def test_engine_translates_repeatedly_while_rate_limited():
+    worker = FakeTranslateWorker()
+    engine = AsyncTranslationEngine(worker, max_in_flight=2, batch_segments=1, requests_per_second=20)
+    try:
+        start = time.monotonic()
+        for run in range(3):
+            models = [OCRText(f'text {run} {i}', make_box(0, 0, 10, 10), 0.9) for i in range(15)]
+            results = engine.translate(models, 'ko')
+            assert [result['translated_text'] for result in results] == [f'TEXT {run} {i}' for i in range(15)]
+            assert models[0].translated_text == f'TEXT {run} 0'
+        # 45개 요청 중 처음 20개(버킷)를 뺀 나머지는 초당 20개로 제한
+        assert time.monotonic() - start >= 1.0
+    finally:
+        engine.close()
+
+
+def test_engine_reports_progress_per_segment():
+    worker = FakeTranslateWorker()
+    engine = AsyncTranslationEngine(worker, batch_segments=2, requests_per_second=None)
+    models = [OCRText(text, make_box(0, 0, 10, 10), 0.9) for text in ('a', 'b', 'a')]
+    seen = []
+    try:
+        engine.translate_captures([(models, 'ko', None)], lambda capture, index, result: seen.append(index))
+    finally:
+        engine.close()
+    assert sorted(seen) == [0, 1, 2]
+    assert worker.batches == [['a', 'b']]
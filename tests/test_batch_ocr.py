@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+import batch_ocr
+from ocr_backends import OCRBatchError
+from ocr_text import OCRResultSet
+
+
+class FakeOCRWorker:
+    """b'error'가 들어간 이미지는 이미지별 오류로 실패"""
+
+    preprocessor = None
+
+    def process_images(self, contents, language_list=None, raise_errors=False):
+        results = [OCRResultSet() for _ in contents]
+        errors = ['bad image' if b'error' in content else None for content in contents]
+        if any(errors):
+            raise OCRBatchError(results, errors)
+        return results
+
+
+@pytest.fixture
+def images(tmp_path):
+    paths = []
+    for name, content in (('a.png', b'ok'), ('b.png', b'error'), ('c.png', b'ok')):
+        path = tmp_path / name
+        path.write_bytes(content)
+        paths.append(str(path))
+    return paths
+
+
+@pytest.fixture
+def fake_workers(monkeypatch):
+    monkeypatch.setattr(batch_ocr, '_ocr_worker', FakeOCRWorker())
+    monkeypatch.setattr(batch_ocr, '_translate_worker', None)
+    monkeypatch.setattr(batch_ocr, '_settings', {'languages': ['en'], 'target': None})
+
+
+def test_per_image_errors_are_recorded_as_failures(images, fake_workers):
+    records = batch_ocr.process_paths(images)
+    assert [record['success'] for record in records] == [True, False, True]
+    assert records[1]['error'] == 'bad image'
+
+
+def test_failed_images_are_retried_from_checkpoint(images, fake_workers, tmp_path):
+    output = tmp_path / 'results.jsonl'
+    with open(output, 'w', encoding='utf-8') as f:
+        for record in batch_ocr.process_paths(images):
+            f.write(json.dumps(record) + '\n')
+    assert batch_ocr.load_checkpoint(str(output)) == {images[0], images[2]}
+
+
+def test_find_images(images, tmp_path):
+    (tmp_path / 'notes.txt').write_text('skip')
+    assert batch_ocr.find_images([str(tmp_path), images[0]]) == sorted(images)
@@ -0,0 +1,30 @@
+import cv2
+import numpy as np
+
+from image_preprocess import ImagePreprocessor, detect_text_regions, estimate_text_height
+
+
+def text_frame(lines, font_scale=2.4, thickness=5):
+    frame = np.full((400, 1200, 3), 255, np.uint8)
+    for i, line in enumerate(lines):
+        cv2.putText(frame, line, (40, 110 + i * 150), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (0, 0, 0), thickness)
+    return frame
+
+
+def test_text_height_ignores_dots_and_punctuation():
+    # i/j의 점과 구두점이 줄보다 많아도 줄 높이(약 55px)로 추정
+    frame = text_frame(['Initializing: i i i', 'Limit; ji'])
+    regions = detect_text_regions(cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY))
+    assert np.median(regions[:, 3] - regions[:, 1]) < 20
+    assert estimate_text_height(regions) > 45
+
+
+def test_downscale_hidpi_text():
+    prepared = ImagePreprocessor(['downscale'], target_text_height=32).prepare(text_frame(['Initializing: i i i']))
+    assert prepared.transform.scale < 0.7
+    assert prepared.array.shape[1] == round(1200 * prepared.transform.scale)
+
+
+def test_small_text_is_not_downscaled():
+    prepared = ImagePreprocessor(['downscale']).prepare(text_frame(['Open the file'], font_scale=0.6, thickness=1))
+    assert prepared.transform.scale == 1.0
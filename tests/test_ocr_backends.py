@@ -0,0 +1,202 @@
+import pytest
+
+import ocr_backends
+from conftest import make_box
+from ocr_backends import (EasyOCRBackend, OCRBackend, OCRBatchError, VisionClientPool, create_backend,
+                          easyocr_language_set)
+from ocr_text import OCRResultSet
+from ocr_worker import OCRWorker
+
+vision = pytest.importorskip('google.cloud.vision')
+
+
+class FakeVisionClient:
+    """batch_annotate_images만 흉내 내는 Vision 클라이언트 (b'error'로 끝나는 이미지는 실패)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def batch_annotate_images(self, requests):
+        self.calls.append(len(requests))
+        responses = []
+        for request in requests:
+            content = request.image.content
+            if content.endswith(b'error'):
+                responses.append(vision.AnnotateImageResponse(error={'message': 'bad image'}))
+            else:
+                responses.append(vision.AnnotateImageResponse(full_text_annotation=text_annotation(content.decode())))
+        return vision.BatchAnnotateImagesResponse(responses=responses)
+
+
+def text_annotation(word):
+    """단어 하나짜리 full_text_annotation"""
+    vertices = [{'x': 0, 'y': 0}, {'x': 40, 'y': 0}, {'x': 40, 'y': 10}, {'x': 0, 'y': 10}]
+    symbols = [{'text': char, 'bounding_box': {'vertices': vertices}} for char in word]
+    return {
+        'text': word,
+        'pages': [{'blocks': [{
+            'bounding_box': {'vertices': vertices},
+            'paragraphs': [{
+                'bounding_box': {'vertices': vertices},
+                'words': [{'bounding_box': {'vertices': vertices}, 'symbols': symbols}],
+            }],
+        }]}],
+    }
+
+
+@pytest.fixture
+def vision_client():
+    return FakeVisionClient()
+
+
+@pytest.fixture
+def vision_backend(vision_client):
+    return create_backend('vision', client_pool=VisionClientPool(client_factory=lambda: vision_client),
+                          granularity='paragraph', feature='text')
+
+
+class FakeExecutor:
+    """EasyOCR 워커 프로세스 대신 호출한 스레드에서 바로 실행"""
+
+    def __init__(self):
+        self.shutdown_called = False
+
+    def submit(self, fn, *args):
+        from concurrent.futures import Future
+
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shutdown_called = True
+
+
+class FakeReader:
+    def __init__(self, languages):
+        self.languages = languages
+
+    def readtext(self, image):
+        return [(make_box(0, 0, 20, 8), 'hello', 0.875)]
+
+
+@pytest.fixture
+def easyocr_backend(monkeypatch):
+    readers = []
+
+    def get_reader(languages):
+        readers.append(FakeReader(languages))
+        return readers[-1]
+
+    monkeypatch.setattr(ocr_backends, '_get_easyocr_reader', get_reader)
+    backend = create_backend('easyocr')
+    backend.executor.shutdown()
+    backend.executor = FakeExecutor()
+    backend.readers = readers
+    return backend
+
+
+def test_create_backend_by_name(vision_backend, easyocr_backend):
+    assert vision_backend.name == 'vision'
+    assert isinstance(easyocr_backend, EasyOCRBackend)
+
+
+def test_create_backend_from_env(monkeypatch, vision_client):
+    monkeypatch.setenv('OCR_BACKEND', 'vision')
+    backend = create_backend(client_pool=VisionClientPool(client_factory=lambda: vision_client))
+    assert backend.name == 'vision'
+
+
+def test_create_backend_rejects_unknown_name():
+    with pytest.raises(ValueError):
+        create_backend('tesseract')
+
+
+def test_base_backend_interface():
+    with pytest.raises(NotImplementedError):
+        OCRBackend().recognize(b'image', ['en'])
+
+
+def test_base_recognize_batch_reports_failed_images():
+    class HalfBackend(OCRBackend):
+        def recognize(self, image, language_list):
+            if image == b'bad':
+                raise RuntimeError('failed')
+            return OCRResultSet([make_box(0, 0, 1, 1)], [image.decode()], [1.0])
+
+    with pytest.raises(OCRBatchError) as info:
+        HalfBackend().recognize_batch([b'ok', b'bad'], ['en'])
+    assert info.value.errors == [None, 'failed']
+    assert info.value.results[0].texts == ['ok']
+    assert len(info.value.results[1]) == 0
+
+
+def test_vision_recognize(vision_backend):
+    results = vision_backend.recognize(b'Start', ['ja', 'ch_sim'])
+    assert results.texts == ['Start']
+
+
+def test_vision_recognize_raises_on_image_error(vision_backend):
+    with pytest.raises(Exception, match='bad image'):
+        vision_backend.recognize(b'error', ['en'])
+
+
+def test_vision_recognize_batch_reports_failed_images(vision_backend, vision_client):
+    with pytest.raises(OCRBatchError) as info:
+        vision_backend.recognize_batch([b'one', b'error', b'three'], ['en'])
+    assert vision_client.calls == [3]
+    assert info.value.errors == [None, 'bad image', None]
+    assert [results.texts for results in info.value.results] == [['one'], [], ['three']]
+
+
+def test_vision_make_batches_respects_limits(vision_backend):
+    requests = [vision_backend._request(b'x' * 10, None) for _ in range(40)]
+    batches = vision_backend.make_batches(requests)
+    assert [len(batch) for batch in batches] == [16, 16, 8]
+
+    vision_backend.MAX_BATCH_BYTES = 25
+    batches = vision_backend.make_batches(requests[:5])
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert sum(batches, []) == requests[:5]
+
+
+def test_vision_make_batches_keeps_oversized_image(vision_backend):
+    vision_backend.MAX_BATCH_BYTES = 5
+    requests = [vision_backend._request(b'x' * 10, None) for _ in range(2)]
+    assert [len(batch) for batch in vision_backend.make_batches(requests)] == [1, 1]
+
+
+def test_vision_rejects_raw_arrays(vision_backend):
+    import numpy as np
+
+    with pytest.raises(ValueError):
+        vision_backend.recognize(np.zeros((4, 4, 3), dtype=np.uint8), ['en'])
+
+
+def test_easyocr_recognize_without_network(easyocr_backend):
+    results = easyocr_backend.recognize(bytearray(b'png'), ['ja', 'en'])
+    assert results.texts == ['hello']
+    assert results[0].bbox == make_box(0, 0, 20, 8)
+    assert results[0].confidence == pytest.approx(0.875)
+    assert easyocr_backend.readers[-1].languages == ('en', 'ja')
+
+
+def test_easyocr_close(easyocr_backend):
+    easyocr_backend.close()
+    assert easyocr_backend.executor.shutdown_called
+
+
+def test_easyocr_language_set():
+    assert easyocr_language_set(['ko', 'ja', 'en']) == ('en', 'ko')
+    assert easyocr_language_set(['fr', 'de']) == ('de', 'fr')
+    assert easyocr_language_set([]) == ('en',)
+
+
+def test_worker_process_images_partial_failure(vision_backend):
+    worker = OCRWorker(['en'], backend=vision_backend, sentence_grouping=False, preprocessor=False)
+    results = worker.process_images([b'one', b'error'])
+    assert [result.texts for result in results] == [['one'], []]
+
+    with pytest.raises(OCRBatchError) as info:
+        worker.process_images([b'one', b'error'], raise_errors=True)
+    assert info.value.errors == [None, 'bad image']
@@ -0,0 +1,67 @@
+import pytest
+
+from conftest import make_box
+from ocr_layout import SOFT_HYPHEN, group_sentences, parse_text_annotation
+from ocr_text import OCRResultSet
+
+vision = pytest.importorskip('google.cloud.vision')
+
+SPACE, EOL_SURE_SPACE, HYPHEN = 1, 3, 4
+
+
+def word(text, x, y, break_type=SPACE):
+    """글자마다 10px 너비인 단어 (마지막 글자에 구분 정보)"""
+    box = make_box(x, y, x + 10 * len(text) - 1, y + 9)
+    symbols = [{'text': char, 'bounding_box': {'vertices': [{'x': px, 'y': py} for px, py in box]}}
+               for char in text]
+    symbols[-1]['property'] = {'detected_break': {'type_': break_type}}
+    return {'bounding_box': {'vertices': [{'x': px, 'y': py} for px, py in box]}, 'symbols': symbols,
+            'confidence': 0.9}
+
+
+def paragraph_annotation(words):
+    vertices = [{'x': 0, 'y': 0}, {'x': 100, 'y': 0}, {'x': 100, 'y': 30}, {'x': 0, 'y': 30}]
+    return vision.TextAnnotation({'pages': [{'blocks': [{
+        'bounding_box': {'vertices': vertices},
+        'paragraphs': [{'bounding_box': {'vertices': vertices}, 'words': words}],
+    }]}]})
+
+
+def hyphenated_annotation():
+    # "Hi the-" / "re ok" 두 줄 (첫 줄은 하이픈으로 끊김)
+    return paragraph_annotation([
+        word('Hi', 0, 0), word('the', 30, 0, HYPHEN),
+        word('re', 0, 15), word('ok', 30, 15, EOL_SURE_SPACE),
+    ])
+
+
+def test_parse_lines_marks_hyphen_breaks():
+    results = parse_text_annotation(hyphenated_annotation(), 'line')
+    assert results.texts == ['Hi the' + SOFT_HYPHEN, 're ok']
+    assert results[0].bbox == [[0, 0], [59, 0], [59, 9], [0, 9]]
+    assert results[0].confidence == pytest.approx(0.9)
+
+
+def test_parse_words_and_paragraphs():
+    annotation = hyphenated_annotation()
+    assert parse_text_annotation(annotation, 'word').texts == ['Hi', 'the', 're', 'ok']
+    assert parse_text_annotation(annotation, 'paragraph').texts == ['Hi there ok']
+
+
+def test_group_sentences_joins_hyphenated_lines():
+    grouped = group_sentences(parse_text_annotation(hyphenated_annotation(), 'line'))
+    assert grouped.texts == ['Hi there ok']
+
+
+def test_group_sentences_keeps_columns_and_sentence_ends():
+    results = OCRResultSet(
+        [make_box(0, 0, 50, 9), make_box(0, 14, 50, 23), make_box(0, 28, 50, 37), make_box(200, 0, 250, 9)],
+        ['Open the', 'file.', 'Next one', 'Side'],
+        [0.9, 0.8, 0.9, 0.9]
+    )
+    assert group_sentences(results).texts == ['Open the file.', 'Next one', 'Side']
+
+
+def test_group_sentences_joins_cjk_without_space():
+    results = OCRResultSet([make_box(0, 0, 50, 9), make_box(0, 14, 50, 23)], ['設定を', '保存'], [0.9, 0.9])
+    assert group_sentences(results).texts == ['設定を保存']
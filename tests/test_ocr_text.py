@@ -0,0 +1,64 @@
+import json
+
+import numpy as np
+import pytest
+
+from conftest import make_box
+from ocr_text import OCRResultSet, OCRText
+
+
+def sample_results():
+    results = OCRResultSet(
+        [make_box(0, 0, 40, 10), make_box(5, 20, 60, 32)],
+        ['Start', '設定\nメニュー'],
+        [0.9, 0.75],
+        ['en', None],
+        [None, '설정 메뉴']
+    )
+    return results
+
+
+def assert_same(a, b):
+    assert np.array_equal(a.boxes, b.boxes)
+    assert a.texts == b.texts
+    assert np.allclose(a.confidences, b.confidences, atol=1e-4)
+    assert a.languages == b.languages
+    assert a.translated_texts == b.translated_texts
+
+
+def test_bytes_round_trip():
+    results = sample_results()
+    assert_same(OCRResultSet.from_bytes(results.to_bytes()), results)
+
+
+def test_empty_round_trip():
+    assert len(OCRResultSet.from_bytes(OCRResultSet().to_bytes())) == 0
+    assert len(OCRResultSet.from_dict(OCRResultSet().to_dict())) == 0
+
+
+def test_dict_round_trip_through_json():
+    results = sample_results()
+    assert_same(OCRResultSet.from_dict(json.loads(json.dumps(results.to_dict()))), results)
+
+
+def test_from_objects_keeps_translations():
+    text = OCRText('Quit', make_box(1, 2, 30, 12), 0.5)
+    text.translated_text = '종료'
+    results = OCRResultSet.from_objects([text])
+    assert results[0].text == 'Quit'
+    assert results[0].bbox == make_box(1, 2, 30, 12)
+    assert results[0].translated_text == '종료'
+
+
+def test_from_bytes_rejects_other_data():
+    with pytest.raises(ValueError):
+        OCRResultSet.from_bytes(b'nope')
+
+
+def test_index_with_lists_and_masks():
+    results = sample_results()
+    assert len(results[[]]) == 0
+    assert len(results[np.zeros(2, dtype=bool)]) == 0
+    assert results[[1]].texts == ['設定\nメニュー']
+    assert results[np.array([True, False])].texts == ['Start']
+    assert results[np.array([1, 0])].texts == ['設定\nメニュー', 'Start']
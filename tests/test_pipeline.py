@@ -0,0 +1,182 @@
+import numpy as np
+import pytest
+from PySide6.QtGui import QImage
+
+from conftest import make_box
+from frame_diff import compute_fingerprint
+from incremental_ocr import IncrementalOCR
+from ocr_backends import OCRBackend
+from ocr_text import OCRResultSet
+from ocr_worker import OCRWorker
+from pipeline import CapturePipeline
+
+
+class FakeOCRWorker:
+    """outcomes 순서대로 성공(True)/실패(False)하는 OCR 워커"""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+        self.frame_batches = []
+
+    def process_frame(self, frame, image_bytes=None, language_list=None, raise_errors=False):
+        self.calls += 1
+        if not self.outcomes.pop(0):
+            if raise_errors:
+                raise RuntimeError('vision down')
+            return OCRResultSet()
+        return OCRResultSet([make_box(0, 0, 10, 10)], ['Start'], [0.9])
+
+    def process_frames(self, frames, language_list=None, raise_errors=False):
+        self.frame_batches.append(len(frames))
+        return [self.process_frame(frame, None, language_list, raise_errors) for frame in frames]
+
+    def change_language(self, language_list):
+        pass
+
+
+class FakeTranslateWorker:
+    """outcomes 순서대로 번역 성공/실패"""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def translate_batch(self, ocr_models, target_language, source_language=None):
+        self.calls += 1
+        success = self.outcomes.pop(0)
+        return [{'success': success, 'translated_text': '시작' if success else None,
+                 'original_text': ocr_model.text} for ocr_model in ocr_models]
+
+
+def make_capture(color=0xffffff):
+    image = QImage(40, 40, QImage.Format.Format_RGB888)
+    image.fill(color)
+    return {'image': image, 'image_bytes': b'jpeg', 'fingerprint': compute_fingerprint(image),
+            'capture_rect': (0, 0, 40, 40)}
+
+
+class Recorder:
+    def __init__(self, pipeline):
+        self.events = []
+        pipeline.ocr_finished.connect(lambda job: self.events.append(('ocr', job.job_id)))
+        pipeline.job_failed.connect(lambda job, message: self.events.append(('failed', job.job_id)))
+        pipeline.job_finished.connect(lambda job: self.events.append(('finished', job.job_id)))
+
+
+def run(qapp, pipeline, capture=None, target_language=None):
+    job = pipeline.submit(capture or make_capture(), ['en'], target_language)
+    pipeline.ocr_pool.waitForDone()
+    pipeline.translate_pool.waitForDone()
+    qapp.processEvents()
+    return job
+
+
+@pytest.fixture
+def make_pipeline(qapp):
+    pipelines = []
+
+    def factory(ocr_worker, translate_worker=None, incremental_ocr=None):
+        pipeline = CapturePipeline(lambda language_list: ocr_worker, translate_worker,
+                                   incremental_ocr=incremental_ocr)
+        pipelines.append(pipeline)
+        return pipeline
+
+    yield factory
+    for pipeline in pipelines:
+        pipeline.shutdown()
+
+
+def test_unchanged_screen_reuses_result(qapp, make_pipeline):
+    ocr_worker = FakeOCRWorker([True])
+    pipeline = make_pipeline(ocr_worker)
+    run(qapp, pipeline)
+    job = run(qapp, pipeline)
+    assert job.reused
+    assert ocr_worker.calls == 1
+    assert job.ocr_results.texts == ['Start']
+
+
+def test_reused_result_is_delivered_after_submit_returns(qapp, make_pipeline):
+    pipeline = make_pipeline(FakeOCRWorker([True]))
+    run(qapp, pipeline)
+
+    submitted = {}
+    seen = []
+    pipeline.job_finished.connect(lambda job: seen.append(job is submitted.get('job')))
+    submitted['job'] = pipeline.submit(make_capture(), ['en'])
+    assert seen == []
+    qapp.processEvents()
+    assert seen == [True]
+
+
+def test_failed_ocr_is_retried_on_unchanged_screen(qapp, make_pipeline):
+    ocr_worker = FakeOCRWorker([False, True])
+    pipeline = make_pipeline(ocr_worker)
+    recorder = Recorder(pipeline)
+    failed = run(qapp, pipeline)
+    retried = run(qapp, pipeline)
+    assert failed.error == 'vision down'
+    assert not retried.reused
+    assert ocr_worker.calls == 2
+    assert recorder.events == [('failed', 0), ('finished', 0), ('ocr', 1), ('finished', 1)]
+
+
+def test_failed_translation_is_retried_on_unchanged_screen(qapp, make_pipeline):
+    translate_worker = FakeTranslateWorker([False, True])
+    pipeline = make_pipeline(FakeOCRWorker([True, True]), translate_worker)
+    first = run(qapp, pipeline, target_language='ko')
+    second = run(qapp, pipeline, target_language='ko')
+    third = run(qapp, pipeline, target_language='ko')
+    assert not first.succeeded()
+    assert not second.reused and second.succeeded()
+    assert third.reused
+    assert translate_worker.calls == 2
+
+
+def test_ocr_worker_raise_errors():
+    class FailingBackend(OCRBackend):
+        def recognize(self, image, language_list):
+            raise RuntimeError('vision down')
+
+    worker = OCRWorker(['en'], backend=FailingBackend(), sentence_grouping=False, preprocessor=False)
+    assert len(worker.process_image(b'jpeg')) == 0
+    with pytest.raises(RuntimeError, match='vision down'):
+        worker.process_image(b'jpeg', raise_errors=True)
+
+
+def test_ocr_worker_preprocessor_can_be_disabled(monkeypatch):
+    monkeypatch.setenv('OCR_PREPROCESS', 'downscale')
+    backend = OCRBackend()
+    assert OCRWorker(['en'], backend=backend, sentence_grouping=False).preprocessor is not None
+    assert OCRWorker(['en'], backend=backend, sentence_grouping=False, preprocessor=False).preprocessor is None
+
+
+def test_failed_ocr_is_not_incremental_baseline(qapp, make_pipeline):
+    ocr_worker = FakeOCRWorker([True, False, True])
+    pipeline = make_pipeline(ocr_worker, incremental_ocr=IncrementalOCR())
+    baseline = run(qapp, pipeline, make_capture(0xffffff))
+    failed = run(qapp, pipeline, make_capture(0x000000))
+    assert failed.error == 'vision down'
+    assert pipeline._last_ocr_job is baseline
+
+    # 실패 뒤 같은 화면은 '변경 없음'으로 빈 결과를 재사용하지 않고 다시 인식
+    retried = run(qapp, pipeline, make_capture(0x000000))
+    assert retried.ocr_stats['mode'] == 'full'
+    assert retried.ocr_results.texts == ['Start']
+    assert ocr_worker.calls == 3
+
+
+def test_incremental_ocr_batches_dirty_crops():
+    previous = np.full((256, 256, 3), 255, np.uint8)
+    frame = previous.copy()
+    frame[10:20, 10:20] = 0
+    frame[200:210, 200:210] = 0
+    ocr_worker = FakeOCRWorker([True, True])
+    kept = OCRResultSet([make_box(100, 100, 140, 110)], ['Keep'], [0.9])
+    results, stats = IncrementalOCR().process(ocr_worker, frame, None, previous, kept)
+    assert stats['mode'] == 'incremental'
+    # 떨어진 두 변경 영역을 한 번의 요청으로 인식하고 좌표를 프레임 기준으로 이동
+    assert ocr_worker.frame_batches == [2]
+    assert results.texts == ['Start', 'Keep', 'Start']
+    assert results.extents()[:, :2].tolist() == [[0, 0], [100, 100], [184, 184]]
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+import translation_cache
+from translate_worker import TranslateWorker
+from translation_cache import TranslationCache
+
+
+@pytest.fixture
+def cache():
+    cache = TranslationCache(db_path=':memory:', memory_size=2, ttl_seconds=60)
+    yield cache
+    cache.close()
+
+
+def test_memory_lru_evicts_least_recently_used(cache):
+    cache.put('one', 'en', 'ko', '하나')
+    cache.put('two', 'en', 'ko', '둘')
+    assert cache.get('one', 'en', 'ko')['translated_text'] == '하나'
+    cache.put('three', 'en', 'ko', '셋')
+    assert [key[0] for key in cache._memory] == ['one', 'three']
+
+    # 메모리에서 빠진 항목은 디스크에서 다시 찾음
+    assert cache.get('two', 'en', 'ko')['translated_text'] == '둘'
+    assert cache.stats()['disk_hits'] == 1
+
+
+def test_entries_expire_after_ttl(cache, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(translation_cache.time, 'time', lambda: now[0])
+    cache.put('Start', 'en', 'ko', '시작')
+    now[0] += 59
+    assert cache.get('Start', 'en', 'ko') is not None
+    now[0] += 2
+    assert cache.get('Start', 'en', 'ko') is None
+    assert cache.stats()['misses'] == 1
+
+
+def test_keys_are_normalized(cache):
+    cache.put('Press  Start\n', None, 'ko', '시작 누르기')
+    assert cache.get('Press Start', 'auto', 'ko')['translated_text'] == '시작 누르기'
+    assert cache.get('Press Start', 'en', 'ko') is None
+
+
+def test_disk_is_trimmed_to_max_entries(cache):
+    cache.max_disk_entries = 3
+    cache.put_many([(f'text {i}', 'en', 'ko', f'번역 {i}', 'en') for i in range(5)])
+    cache.evict_expired()
+    assert cache._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0] == 3
+
+
+def test_glossary_without_target_uses_given_target(cache, tmp_path):
+    path = tmp_path / 'glossary.json'
+    path.write_text(json.dumps({'Start': '시작', 'Quit': '종료'}), encoding='utf-8')
+    assert cache.warm_from_glossary(str(path), target_language='ko') == 2
+    assert cache.get('Quit', None, 'ko')['translated_text'] == '종료'
+
+
+def test_glossary_without_any_target_is_rejected(cache, tmp_path):
+    path = tmp_path / 'glossary.csv'
+    path.write_text('source_text,translated_text\nStart,시작\n', encoding='utf-8')
+    with pytest.raises(ValueError):
+        cache.warm_from_glossary(str(path))
+
+
+def test_glossary_csv_target_column(cache, tmp_path):
+    path = tmp_path / 'glossary.csv'
+    path.write_text('source_text,translated_text,target_lang\nStart,시작,ko\nStart,開始,ja\n', encoding='utf-8')
+    assert cache.warm_from_glossary(str(path)) == 2
+    assert cache.get('Start', None, 'ja')['translated_text'] == '開始'
+
+
+def test_lookup_cached_sends_original_text(cache):
+    cache.put('Start', None, 'ko', '시작')
+    worker = TranslateWorker('key', cache)
+    results, pending = worker.lookup_cached(['Game\nOver', 'Start', 'Game Over'], 'ko')
+    assert results[0] is None and results[1]['cached']
+    # 정규화하면 같은 원문은 한 번만 보내되 줄바꿈은 그대로 유지
+    assert pending == {'Game\nOver': [0, 2]}
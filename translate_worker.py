@@ -2,80 +2,242 @@ import requests
 import json
 import os
 
+from http_client import HttpClient
+from translation_cache import normalize_text
+
+# 앱 내부 언어 코드 -> 번역 API 언어 코드
+LANGUAGE_CODE_MAP = {
+    'ch_sim': 'zh-CN',
+}
+
+
+def to_api_language(language):
+    """앱 내부 언어 코드를 번역 API 코드로 변환"""
+    if language is None:
+        return None
+    return LANGUAGE_CODE_MAP.get(language, language)
+
+
+def choose_source_language(source_languages, target_language):
+    """인식 언어가 하나일 때만 원본 언어로 지정 (여러 개거나 목표 언어와 같으면 자동 감지)"""
+    source_language = source_languages[0] if len(source_languages) == 1 else None
+    if source_language == target_language:
+        return None
+    return source_language
+
+
 class TranslateWorker:
     """Google Cloud 번역 API를 사용하는 번역 워커"""
     
-    def __init__(self, api_key):
+    # v2 API 요청당 제한 (q 개수, 전체 문자 수)
+    MAX_BATCH_SEGMENTS = 128
+    MAX_BATCH_CHARS = 5000
+
+    DEFAULT_BASE_URL = "https://translation.googleapis.com/language/translate/v2"
+
+    def __init__(self, api_key, cache=None, http_client=None, base_url=None):
         self.api_key = api_key
-        self.base_url = "https://translation.googleapis.com/language/translate/v2"
+        # 번역 API 주소 (벤치마크에서는 로컬 모의 서버 주소로 교체)
+        self.base_url = base_url or os.getenv("TRANSLATE_API_URL", self.DEFAULT_BASE_URL)
+        self.cache = cache  # TranslationCache (None이면 캐시 사용 안 함)
+        # 연결을 재사용하는 HTTP 클라이언트 (타임아웃, 재시도, 회로 차단기 포함)
+        self.http = http_client or HttpClient()
     
-    def translate_text(self, ocr_models, target_language, designated_language):
+    def warm(self, connections=1):
+        """번역 서버 연결을 미리 맺어 둠 (API 호출 없이 HEAD만 보내므로 할당량을 쓰지 않음)"""
+        return self.http.warm(self.base_url, connections)
+
+    def translate_text(self, text, target_language='ko', source_language=None):
         """
         텍스트를 번역합니다.
         
         Args:
             text (str): 번역할 텍스트
             target_language (str): 목표 언어 (기본값: 'ko' - 한국어)
-            source_language (str): 원본 언어 (기본값: 'auto' - 자동 감지)
+            source_language (str): 원본 언어 (기본값: None - 자동 감지)
         
         Returns:
             dict: 번역 결과
         """
+        return self.translate_texts([text], target_language, source_language)[0]
+
+    def translate_texts(self, texts, target_language, source_language=None):
+        """
+        여러 텍스트를 최소한의 요청으로 묶어서 번역합니다.
+
+        Args:
+            texts (list): 번역할 텍스트 목록
+            target_language (str): 목표 언어
+            source_language (str): 원본 언어 (None이면 자동 감지)
+
+        Returns:
+            list: 입력 순서와 같은 순서의 번역 결과 딕셔너리 목록
+        """
+        results, pending = self.lookup_cached(texts, target_language, source_language)
+
+        pending_texts = list(pending)
+        translated = []
+        for batch in self.make_batches(pending_texts):
+            translated.extend(self._translate_batch(batch, target_language, source_language))
+
+        for text, result in zip(pending_texts, translated):
+            for i in pending[text]:
+                results[i] = dict(result, original_text=texts[i])
+
+        self.store_translations(translated, target_language, source_language)
+        return results
+
+    def lookup_cached(self, texts, target_language, source_language=None):
+        """
+        캐시 적중은 바로 결과로 채우고, 나머지 원문은 중복 없이 모읍니다.
+
+        Returns:
+            tuple: (결과 목록(미적중은 None), {보낼 원문: 결과를 채울 인덱스 목록})
+            정규화하면 같은 원문은 처음 나온 원문 하나만 보냅니다 (줄바꿈 등 원문 형태는 그대로 유지).
+        """
+        results = [None] * len(texts)
+        pending = {}
+        first_texts = {}  # 정규화된 원문 -> 처음 나온 원문
+        for i, text in enumerate(texts):
+            cached = self.cache.get(text, source_language, target_language) if self.cache else None
+            if cached is not None:
+                results[i] = {
+                    'success': True,
+                    'translated_text': cached['translated_text'],
+                    'detected_language': cached['detected_language'],
+                    'original_text': text,
+                    'cached': True
+                }
+            else:
+                pending.setdefault(first_texts.setdefault(normalize_text(text), text), []).append(i)
+        return results, pending
+
+    def store_translations(self, translated, target_language, source_language=None):
+        """성공한 번역만 캐시에 저장"""
+        if self.cache:
+            self.cache.put_many([
+                (result['original_text'], source_language, target_language,
+                 result['translated_text'], result['detected_language'])
+                for result in translated if result['success']
+            ])
+
+    def translate_batch(self, ocr_models, target_language, source_language=None):
+        """
+        캡처 한 장의 OCRText 목록을 일괄 번역하고 각 객체에 번역문을 기록합니다.
+
+        Args:
+            ocr_models (list): OCRText 목록
+            target_language (str): 목표 언어
+            source_language (str): 원본 언어 (None이면 자동 감지)
+
+        Returns:
+            list: ocr_models와 같은 순서의 번역 결과 딕셔너리 목록
+        """
+        texts = [ocr_model.text for ocr_model in ocr_models]
+        results = self.translate_texts(texts, target_language, source_language)
+
+        for ocr_model, result in zip(ocr_models, results):
+            if result['success']:
+                ocr_model.translated_text = result['translated_text']
+        return results
+
+    def translate_multiple(self, ocr_models, source_languages, designated_language='en'):
+        """OCR 결과 전체를 목표 언어로 번역 (원본 언어가 하나일 때만 지정, 아니면 자동 감지)"""
+        source_language = choose_source_language(source_languages, designated_language)
+        return self.translate_batch(ocr_models, designated_language, source_language)
+
+    def make_batches(self, texts, max_segments=None, max_chars=None):
+        """텍스트 목록을 요청 제한(세그먼트 수, 문자 수)에 맞게 순서를 유지하며 분할"""
+        max_segments = min(max_segments or self.MAX_BATCH_SEGMENTS, self.MAX_BATCH_SEGMENTS)
+        max_chars = min(max_chars or self.MAX_BATCH_CHARS, self.MAX_BATCH_CHARS)
+        batches = []
+        batch = []
+        batch_chars = 0
+
+        for text in texts:
+            if batch and (len(batch) >= max_segments
+                          or batch_chars + len(text) > max_chars):
+                batches.append(batch)
+                batch = []
+                batch_chars = 0
+            batch.append(text)
+            batch_chars += len(text)
+
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def translate_segments(self, texts, target_language, source_language=None):
+        """캐시를 거치지 않고 한 번의 요청으로 번역 (호출자가 make_batches로 나눈 배치)"""
+        return self._translate_batch(texts, target_language, source_language)
+
+    def _translate_batch(self, texts, target_language, source_language):
+        """한 번의 HTTP 요청으로 여러 q를 번역 (요청이 너무 크면 반으로 나눠 재시도)"""
         try:
-            # API 요청 파라미터
+            # API 요청 파라미터 (q를 여러 개 전달)
             params = {
                 'key': self.api_key,
-                'q': text,
-                'target': target_language,
-                'source': source_language,
+                'q': texts,
+                'target': to_api_language(target_language),
                 'format': 'text'
             }
+            if source_language:
+                params['source'] = to_api_language(source_language)
             
             # API 요청
-            response = requests.post(self.base_url, data=params)
+            response = self.http.post(self.base_url, data=params)
+
+            # 요청 크기/세그먼트 초과 시 분할 재시도
+            if self._is_oversize(response) and len(texts) > 1:
+                middle = len(texts) // 2
+                return (self._translate_batch(texts[:middle], target_language, source_language)
+                        + self._translate_batch(texts[middle:], target_language, source_language))
             response.raise_for_status()
             
             # 응답 파싱
             result = response.json()
             
-            if 'data' in result and 'translations' in result['data']:
-                translation = result['data']['translations'][0]
-                return {
+            translations = result.get('data', {}).get('translations', [])
+            if len(translations) != len(texts):
+                return self._failures(texts, '번역 결과를 찾을 수 없습니다.')
+
+            return [
+                {
                     'success': True,
                     'translated_text': translation['translatedText'],
                     'detected_language': translation.get('detectedSourceLanguage', source_language),
                     'original_text': text
                 }
-            else:
-                return {
-                    'success': False,
-                    'error': '번역 결과를 찾을 수 없습니다.',
-                    'original_text': text
-                }
+                for text, translation in zip(texts, translations)
+            ]
                 
         except requests.exceptions.RequestException as e:
-            return {
-                'success': False,
-                'error': f'API 요청 오류: {str(e)}',
-                'original_text': text
-            }
+            return self._failures(texts, f'API 요청 오류: {str(e)}')
         except json.JSONDecodeError as e:
-            return {
-                'success': False,
-                'error': f'JSON 파싱 오류: {str(e)}',
-                'original_text': text
-            }
+            return self._failures(texts, f'JSON 파싱 오류: {str(e)}')
         except Exception as e:
-            return {
+            return self._failures(texts, f'예상치 못한 오류: {str(e)}')
+
+    def _is_oversize(self, response):
+        """요청이 너무 커서 거부되었는지 확인 (413 또는 세그먼트/크기 초과 400)"""
+        if response.status_code == 413:
+            return True
+        if response.status_code != 400:
+            return False
+        message = response.text.lower()
+        return 'too many text segments' in message or 'too large' in message
+
+    def _failures(self, texts, error):
+        """배치 전체에 대한 실패 결과 생성"""
+        return [
+            {
                 'success': False,
-                'error': f'예상치 못한 오류: {str(e)}',
+                'error': error,
                 'original_text': text
             }
-    
-    def translate_multiple(self, ocr_models, source_languages, designated_language='en'):
-        results = self.preprocess_text(self, ocr_models, source_languages, designated_language)
-        return results
-    
+            for text in texts
+        ]
+
     def get_supported_languages(self):
         """
         지원되는 언어 목록을 가져옵니다.
@@ -84,10 +246,10 @@ class TranslateWorker:
             dict: 언어 목록
         """
         try:
-            url = f"https://translation.googleapis.com/language/translate/v2/languages"
+            url = f"{self.base_url}/languages"
             params = {'key': self.api_key}
             
-            response = requests.get(url, params=params)
+            response = self.http.get(url, params=params)
             response.raise_for_status()
             
             result = response.json()
@@ -117,6 +279,10 @@ if __name__ == "__main__":
         result = worker.translate_text("Hello, world!", target_language='ko')
         print("번역 결과:", result)
         
+        # 여러 문장 일괄 번역
+        results = worker.translate_texts(["Start", "Options", "Quit"], target_language='ko')
+        print("일괄 번역 결과:", results)
+
         # 지원 언어 확인
         languages = worker.get_supported_languages()
         print("지원 언어:", languages)
@@ -0,0 +1,252 @@
+import csv
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".screen_translator", "translation_cache.sqlite3")
+
+# 원본 언어를 지정하지 않은(자동 감지) 번역의 키
+AUTO_LANGUAGE = 'auto'
+
+
+def normalize_text(text):
+    """캐시 키용 텍스트 정규화 (유니코드 NFC, 연속 공백 하나로)"""
+    return unicodedata.normalize('NFC', ' '.join(text.split()))
+
+
+class TranslationCache:
+    """
+    2단계 번역 메모리: 프로세스 내 LRU + SQLite 디스크 저장소
+
+    키는 (정규화된 원문, 원본 언어, 목표 언어)이며,
+    메모리는 개수 기준 LRU, 디스크는 TTL과 최대 항목 수로 정리됩니다.
+    """
+
+    def __init__(self, db_path=DEFAULT_CACHE_PATH, memory_size=4096,
+                 max_disk_entries=200000, ttl_seconds=30 * 24 * 3600):
+        self.db_path = db_path
+        self.memory_size = memory_size
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._memory = OrderedDict()  # key -> (translated_text, detected_language, created_at)
+        self._lock = threading.Lock()
+        self._puts_since_trim = 0
+
+        # 적중/실패 카운터
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._conn = None
+        if db_path:
+            if db_path != ':memory:':
+                os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS translations (
+                    source_text TEXT NOT NULL,
+                    source_lang TEXT NOT NULL,
+                    target_lang TEXT NOT NULL,
+                    translated_text TEXT NOT NULL,
+                    detected_language TEXT,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL,
+                    PRIMARY KEY (source_text, source_lang, target_lang)
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations (last_used_at)"
+            )
+            self._conn.commit()
+
+    def make_key(self, text, source_language, target_language):
+        """캐시 키 생성"""
+        return (normalize_text(text), source_language or AUTO_LANGUAGE, target_language)
+
+    def get(self, text, source_language, target_language):
+        """
+        캐시된 번역 조회
+
+        Returns:
+            dict: {'translated_text', 'detected_language'} 또는 None
+        """
+        key = self.make_key(text, source_language, target_language)
+        now = time.time()
+
+        with self._lock:
+            # 1단계: 메모리 LRU
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._is_expired(entry[2], now):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return {'translated_text': entry[0], 'detected_language': entry[1]}
+                del self._memory[key]
+
+            # 2단계: 디스크 저장소
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT translated_text, detected_language, created_at FROM translations "
+                    "WHERE source_text = ? AND source_lang = ? AND target_lang = ?",
+                    key
+                ).fetchone()
+                if row is not None and not self._is_expired(row[2], now):
+                    self._conn.execute(
+                        "UPDATE translations SET last_used_at = ? "
+                        "WHERE source_text = ? AND source_lang = ? AND target_lang = ?",
+                        (now,) + key
+                    )
+                    self._conn.commit()
+                    self._remember(key, row[0], row[1], row[2])
+                    self.disk_hits += 1
+                    return {'translated_text': row[0], 'detected_language': row[1]}
+
+            self.misses += 1
+            return None
+
+    def put(self, text, source_language, target_language, translated_text, detected_language=None):
+        """번역 결과 저장"""
+        self.put_many([(text, source_language, target_language, translated_text, detected_language)])
+
+    def put_many(self, entries):
+        """
+        여러 번역 결과를 한 번의 트랜잭션으로 저장
+
+        Args:
+            entries (list): (원문, 원본 언어, 목표 언어, 번역문, 감지된 언어) 튜플 목록
+        """
+        now = time.time()
+        rows = []
+        with self._lock:
+            for text, source_language, target_language, translated_text, detected_language in entries:
+                key = self.make_key(text, source_language, target_language)
+                if not key[0]:
+                    continue
+                self._remember(key, translated_text, detected_language, now)
+                rows.append(key + (translated_text, detected_language, now, now))
+
+            if self._conn is not None and rows:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO translations "
+                    "(source_text, source_lang, target_lang, translated_text, detected_language, created_at, last_used_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.commit()
+
+                # 일정 횟수마다 디스크 크기/TTL 정리
+                self._puts_since_trim += len(rows)
+                if self._puts_since_trim >= 1000:
+                    self._trim_disk(now)
+
+    def warm_from_glossary(self, path, source_language=None, target_language=None):
+        """
+        내보낸 용어집으로 캐시 미리 채우기
+
+        CSV/TSV: source_text, translated_text[, source_lang, target_lang] 열 (헤더 필요)
+        JSON: 위 키를 가진 객체 목록 또는 {원문: 번역문} 딕셔너리
+        target_lang이 없는 항목은 target_language를 목표 언어로 사용합니다.
+
+        Returns:
+            int: 추가된 항목 수
+
+        Raises:
+            ValueError: 목표 언어를 알 수 없는 항목이 있을 때 (target_lang 열도 target_language도 없음)
+        """
+        entries = []
+        missing_target = 0
+        for row in self._read_glossary(path):
+            source_text = row.get('source_text')
+            translated_text = row.get('translated_text')
+            row_source = row.get('source_lang') or source_language
+            row_target = row.get('target_lang') or target_language
+            if not source_text or not translated_text:
+                continue
+            if not row_target:
+                missing_target += 1
+                continue
+            entries.append((source_text, row_source, row_target, translated_text, row_source))
+
+        if missing_target:
+            raise ValueError(f"용어집 {path}의 {missing_target}개 항목에 목표 언어가 없습니다 "
+                             f"(target_lang 열을 추가하거나 목표 언어를 지정하세요)")
+
+        self.put_many(entries)
+        return len(entries)
+
+    def _read_glossary(self, path):
+        extension = os.path.splitext(path)[1].lower()
+        with open(path, encoding='utf-8', newline='') as f:
+            if extension == '.json':
+                data = json.load(f)
+                if isinstance(data, dict):
+                    return [{'source_text': k, 'translated_text': v} for k, v in data.items()]
+                return data
+            delimiter = '\t' if extension == '.tsv' else ','
+            return list(csv.DictReader(f, delimiter=delimiter))
+
+    def evict_expired(self):
+        """TTL이 지난 항목과 최대 개수를 넘는 오래된 항목 정리"""
+        with self._lock:
+            now = time.time()
+            for key in [k for k, v in self._memory.items() if self._is_expired(v[2], now)]:
+                del self._memory[key]
+            if self._conn is not None:
+                self._trim_disk(now)
+
+    def clear(self):
+        """캐시 전체 삭제"""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM translations")
+                self._conn.commit()
+
+    def stats(self):
+        """적중/실패 통계 반환"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            hits = self.memory_hits + self.disk_hits
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': hits / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+            }
+
+    def close(self):
+        """디스크 연결 종료"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _remember(self, key, translated_text, detected_language, created_at):
+        """메모리 LRU에 저장 (가장 오래 사용하지 않은 항목부터 제거)"""
+        self._memory[key] = (translated_text, detected_language, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _is_expired(self, created_at, now):
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _trim_disk(self, now):
+        self._puts_since_trim = 0
+        if self.ttl_seconds is not None:
+            self._conn.execute("DELETE FROM translations WHERE created_at < ?", (now - self.ttl_seconds,))
+        count = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        if count > self.max_disk_entries:
+            self._conn.execute(
+                "DELETE FROM translations WHERE rowid IN ("
+                "SELECT rowid FROM translations ORDER BY last_used_at LIMIT ?)",
+                (count - self.max_disk_entries,)
+            )
+        self._conn.commit()
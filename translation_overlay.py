@@ -0,0 +1,162 @@
+from PySide6.QtCore import QRectF, Qt, QTimer
+from PySide6.QtGui import QPainter
+from PySide6.QtWidgets import QWidget
+
+from incremental_ocr import bbox_rect
+from overlay_painter import paint_item
+from overlay_renderer import layout_overlay
+
+# 같은 상자로 볼 위치 오차 (이미지 픽셀): 실시간 모드에서 인식 위치가 조금 흔들려도 같은 상자로 유지
+BOX_KEY_GRID = 8
+PENDING_OPACITY = 0.6   # 번역이 아직 도착하지 않아 원문을 보여주는 상자
+
+
+def box_key(bbox):
+    """bbox를 격자에 맞춰 양자화한 상자 식별자"""
+    x1, y1, x2, y2 = bbox_rect(bbox)
+    return (round(x1 / BOX_KEY_GRID), round(y1 / BOX_KEY_GRID),
+            round(x2 / BOX_KEY_GRID), round(y2 / BOX_KEY_GRID))
+
+
+class _OverlayBox:
+    """오버레이에 유지되는 상자 하나"""
+
+    __slots__ = ('source_text', 'item', 'rect', 'pending', 'opacity', 'fading')
+
+    def __init__(self, source_text, item, rect, pending):
+        self.source_text = source_text
+        self.item = item          # OverlayItem (이미지 좌표)
+        self.rect = rect          # 위젯 좌표의 다시 그릴 영역
+        self.pending = pending    # 번역 대기 중 (원문 표시)
+        self.opacity = 1.0
+        self.fading = False
+
+
+class TranslationOverlay(QWidget):
+    """
+    캡처 영역 위에 번역문을 원래 위치에 그리는 유지형(retained) 오버레이
+
+    상자를 위치별로 기억해 두고 글자가 바뀐 상자 영역만 update(rect)로 다시 그립니다.
+    실시간 모드에서 사라진 상자는 fade_ms 동안 서서히 지우고,
+    같은 원문이 다시 인식되면 새 번역이 올 때까지 이전 번역을 그대로 보여줍니다.
+    """
+
+    def __init__(self, parent=None, fade_ms=400, font_manager=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground)
+        self.fade_ms = fade_ms
+        self.font_manager = font_manager
+        self.boxes = {}           # 상자 식별자 -> _OverlayBox
+        self.image_size = None    # 결과가 속한 캡처 이미지 크기 (width, height)
+        self.scale = 1.0          # 이미지 픽셀 -> 위젯 좌표 배율
+
+        self.fade_timer = QTimer(self)
+        self.fade_timer.setInterval(33)
+        self.fade_timer.timeout.connect(self._advance_fade)
+
+    def set_results(self, ocr_results, image_size, fade=False):
+        """
+        새 캡처의 OCR 결과로 오버레이 갱신
+
+        Args:
+            ocr_results (list): OCRText 목록 (번역이 도착하면 translated_text 사용)
+            image_size (tuple): 캡처 이미지 (width, height)
+            fade (bool): 사라진 상자를 서서히 지울지 여부 (실시간 모드)
+        """
+        if image_size != self.image_size:
+            # 캡처 크기가 바뀌면 기존 상자 좌표는 의미가 없음
+            self.clear()
+            self.image_size = image_size
+            self.scale = self.width() / image_size[0] if image_size[0] else 1.0
+
+        seen = self.update_results(ocr_results)
+        for key, box in list(self.boxes.items()):
+            if key in seen or box.fading:
+                continue
+            if fade and self.fade_ms > 0:
+                box.fading = True
+            else:
+                del self.boxes[key]
+                self.update(box.rect)
+        if any(box.fading for box in self.boxes.values()):
+            self.fade_timer.start()
+
+    def update_results(self, ocr_results):
+        """
+        주어진 상자만 갱신 (번역 도착 등) - 글자가 바뀐 상자만 다시 배치하고 그 영역만 다시 그림
+
+        Returns:
+            set: 갱신한 상자 식별자
+        """
+        seen = set()
+        changed = []
+        for obj in ocr_results:
+            key = box_key(obj.bbox)
+            seen.add(key)
+            box = self.boxes.get(key)
+            if box is not None and box.source_text == obj.text:
+                if box.fading:
+                    # 다시 인식된 상자는 지우지 않음
+                    box.fading = False
+                    box.opacity = 1.0
+                    self.update(box.rect)
+                # 같은 원문: 새 번역이 왔고 내용이 다를 때만 다시 그림
+                if obj.translated_text is None or (not box.pending and obj.translated_text == box.item.text):
+                    continue
+            changed.append((key, obj))
+
+        if changed:
+            # 바뀐 상자들만 한 번에 배치
+            items = layout_overlay([obj for _, obj in changed], self.font_manager, use_translation=True)
+            for (key, obj), item in zip(changed, items):
+                rect = self._widget_rect(item)
+                old = self.boxes.get(key)
+                self.boxes[key] = _OverlayBox(obj.text, item, rect, pending=obj.translated_text is None)
+                self.update(rect.united(old.rect) if old is not None else rect)
+        return seen
+
+    def clear(self, fade=False):
+        """모든 상자 제거 (fade=True면 서서히 지움)"""
+        if fade and self.fade_ms > 0 and self.boxes:
+            for box in self.boxes.values():
+                box.fading = True
+            self.fade_timer.start()
+            return
+        self.fade_timer.stop()
+        for box in self.boxes.values():
+            self.update(box.rect)
+        self.boxes = {}
+
+    def resizeEvent(self, event):
+        # 캡처 영역 크기가 바뀌면 이전 결과 위치가 맞지 않으므로 제거
+        self.clear()
+        self.image_size = None
+        super().resizeEvent(event)
+
+    def _widget_rect(self, item):
+        x1, y1, x2, y2 = item.background
+        rect = QRectF(x1 * self.scale, y1 * self.scale, (x2 - x1) * self.scale, (y2 - y1) * self.scale)
+        return rect.toAlignedRect().adjusted(-1, -1, 1, 1)
+
+    def _advance_fade(self):
+        step = self.fade_timer.interval() / float(self.fade_ms)
+        for key, box in list(self.boxes.items()):
+            if not box.fading:
+                continue
+            box.opacity -= step
+            if box.opacity <= 0:
+                del self.boxes[key]
+            self.update(box.rect)
+        if not any(box.fading for box in self.boxes.values()):
+            self.fade_timer.stop()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        region = event.rect()
+        for box in self.boxes.values():
+            if not box.rect.intersects(region):
+                continue
+            painter.setOpacity(box.opacity * (PENDING_OPACITY if box.pending else 1.0))
+            paint_item(painter, box.item, self.scale)
+        painter.end()